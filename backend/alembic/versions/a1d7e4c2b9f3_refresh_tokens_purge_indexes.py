@@ -0,0 +1,62 @@
+"""partial index on revoked refresh tokens for the stale-token purge
+
+Revision ID: a1d7e4c2b9f3
+Revises: f3c8d1e6b7a2
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a1d7e4c2b9f3"
+down_revision: Union[str, Sequence[str], None] = "f3c8d1e6b7a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Пачка purge_stale: expires_at < :cutoff OR revoked_at < :cutoff — BitmapOr
+    # двух индексов вместо seq scan под FOR UPDATE SKIP LOCKED. Полный индекс на
+    # revoked_at почти целиком из NULL (активные сессии) — заменяем частичным.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_refresh_tokens_expires_at",
+            "refresh_tokens",
+            ["expires_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_refresh_tokens_revoked_at_not_null",
+            "refresh_tokens",
+            ["revoked_at"],
+            postgresql_where=sa.text("revoked_at IS NOT NULL"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_refresh_tokens_revoked_at",
+            table_name="refresh_tokens",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_refresh_tokens_revoked_at",
+            "refresh_tokens",
+            ["revoked_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_refresh_tokens_revoked_at_not_null",
+            table_name="refresh_tokens",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
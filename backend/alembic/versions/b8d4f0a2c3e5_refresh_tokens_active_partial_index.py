@@ -0,0 +1,32 @@
+"""partial index on active refresh tokens (user_id, jti)
+
+Revision ID: b8d4f0a2c3e5
+Revises: a7c3e9f1b2d4
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b8d4f0a2c3e5"
+down_revision: Union[str, Sequence[str], None] = "a7c3e9f1b2d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Только активные (не отозванные) токены: индекс остаётся маленьким,
+    # хотя таблица копит отозванные строки до очистки.
+    op.create_index(
+        "ix_refresh_tokens_active_user_jti",
+        "refresh_tokens",
+        ["user_id", "jti"],
+        postgresql_where=sa.text("revoked_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_tokens_active_user_jti", table_name="refresh_tokens")
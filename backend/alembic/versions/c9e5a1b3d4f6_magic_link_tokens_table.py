@@ -0,0 +1,62 @@
+"""move magic link tokens to magic_link_tokens table
+
+Revision ID: c9e5a1b3d4f6
+Revises: b8d4f0a2c3e5
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c9e5a1b3d4f6"
+down_revision: Union[str, Sequence[str], None] = "b8d4f0a2c3e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "magic_link_tokens",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("token_hash", sa.String(length=64), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("token_hash"),
+    )
+    op.create_index("ix_magic_link_tokens_user_id", "magic_link_tokens", ["user_id"])
+    op.create_index("ix_magic_link_tokens_expires_at", "magic_link_tokens", ["expires_at"])
+
+    # Ещё действующие ссылки переносим, чтобы уже отправленные письма работали.
+    op.execute(
+        """
+        INSERT INTO magic_link_tokens (user_id, token_hash, expires_at)
+        SELECT id, magic_link_token, magic_link_expires_at
+        FROM users
+        WHERE magic_link_token IS NOT NULL AND magic_link_expires_at > now()
+        """
+    )
+
+    op.drop_column("users", "magic_link_expires_at")
+    op.drop_column("users", "magic_link_token")
+
+
+def downgrade() -> None:
+    op.add_column("users", sa.Column("magic_link_token", sa.String(length=255), nullable=True))
+    op.add_column(
+        "users",
+        sa.Column("magic_link_expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.drop_index("ix_magic_link_tokens_expires_at", table_name="magic_link_tokens")
+    op.drop_index("ix_magic_link_tokens_user_id", table_name="magic_link_tokens")
+    op.drop_table("magic_link_tokens")
@@ -0,0 +1,79 @@
+"""hot-path composite, partial and functional indexes
+
+Revision ID: e7b1c5d2a9f0
+Revises: c9e5a1b3d4f6
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e7b1c5d2a9f0"
+down_revision: Union[str, Sequence[str], None] = "c9e5a1b3d4f6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns, extra create_index kwargs)
+INDEXES = [
+    # Занятость слотов (get_confirmed_pending_counts_by_slot_ids): slot_id IN (...)
+    # + status; reserved_until в INCLUDE — ответ целиком из индекса.
+    (
+        "ix_bookings_slot_status",
+        "bookings",
+        ["slot_id", "status"],
+        {"postgresql_include": ["reserved_until"]},
+    ),
+    # Активные pending-холды слота: маленький индекс, только status = 'pending'.
+    (
+        "ix_bookings_pending_hold",
+        "bookings",
+        ["slot_id", "reserved_until"],
+        {"postgresql_where": sa.text("status = 'pending'")},
+    ),
+    # «Мои бронирования»: user_id = ... OR guest_email = ... (BitmapOr двух индексов).
+    ("ix_bookings_guest_email", "bookings", ["guest_email"], {}),
+    # Расписание студии по времени.
+    ("ix_slots_studio_start", "slots", ["studio_id", "start_time"], {}),
+    # list_by_service_active: service_id + status + is_active, ORDER BY start_time.
+    (
+        "ix_slots_service_status_active_start",
+        "slots",
+        ["service_id", "status", "is_active", "start_time"],
+        {},
+    ),
+    # Активные услуги студий (list_active_by_studio_ids, поиск) с фильтром по категории.
+    (
+        "ix_services_studio_active_category",
+        "services",
+        ["studio_id", "is_active", "category"],
+        {},
+    ),
+    # Фильтр студий по городу: func.lower(Studio.city) == ...
+    ("ix_studios_lower_city", "studios", [sa.text("lower(city)")], {}),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY не блокирует запись, но не работает внутри
+    # транзакции. IF NOT EXISTS — повторный запуск после сбоя не падает
+    # (невалидный индекс от прерванной сборки нужно удалить вручную).
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns, _kwargs in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,87 @@
+"""archive tables for past slots and their bookings
+
+Revision ID: f3c8d1e6b7a2
+Revises: e7b1c5d2a9f0
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f3c8d1e6b7a2"
+down_revision: Union[str, Sequence[str], None] = "e7b1c5d2a9f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Копия колонок slots / bookings без FK: прошедшие занятия переносит
+    # фоновая задача архивации (app.services.archive), горячие таблицы
+    # остаются маленькими.
+    op.create_table(
+        "slots_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("studio_id", sa.Integer(), nullable=True),
+        sa.Column("service_id", sa.Integer(), nullable=True),
+        sa.Column("schedule_id", sa.Integer(), nullable=True),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("end_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("title", sa.String(length=200), nullable=True),
+        sa.Column("description", sa.String(length=1000), nullable=True),
+        sa.Column("max_capacity", sa.Integer(), nullable=True),
+        sa.Column("price_cents", sa.Integer(), nullable=True),
+        sa.Column("course_price_cents", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_slots_archive_studio_start", "slots_archive", ["studio_id", "start_time"]
+    )
+
+    op.create_table(
+        "bookings_archive",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("slot_id", sa.Integer(), nullable=True),
+        sa.Column("booking_type", sa.String(length=20), nullable=True),
+        sa.Column("service_id", sa.Integer(), nullable=True),
+        sa.Column("order_id", sa.Integer(), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("guest_session_id", sa.String(length=255), nullable=True),
+        sa.Column("guest_name", sa.String(length=100), nullable=True),
+        sa.Column("guest_email", sa.String(length=255), nullable=True),
+        sa.Column("guest_phone", sa.String(length=20), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("reserved_until", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("checkout_session_id", sa.String(length=255), nullable=True),
+        sa.Column("payment_intent_id", sa.String(length=255), nullable=True),
+        sa.Column("payment_status", sa.String(length=50), nullable=True),
+        sa.Column("unit_price_cents", sa.Integer(), nullable=True),
+        sa.Column("cancelled_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "archived_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index("ix_bookings_archive_slot_id", "bookings_archive", ["slot_id"])
+    op.create_index("ix_bookings_archive_user_id", "bookings_archive", ["user_id"])
+    op.create_index("ix_bookings_archive_guest_email", "bookings_archive", ["guest_email"])
+
+
+def downgrade() -> None:
+    op.drop_table("bookings_archive")
+    op.drop_table("slots_archive")
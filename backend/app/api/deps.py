@@ -13,12 +13,18 @@ from fastapi import Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from starlette.requests import Request
 
-from app.core.database import async_session_maker, get_db
+from app.core.config import settings
+from app.core.database import async_session_maker, get_db, get_read_session_maker
 from app.core.exceptions import UnauthorizedError
 from app.core.middleware.logging_middleware import USER_ID_STATE_KEY
 from app.core.uow import UnitOfWork, create_uow
 from app.models.user import User
-from app.services.auth import get_current_user_from_token
+from app.services.auth import (
+    get_current_principal_from_token,
+    get_current_user_from_token,
+    get_principal_from_token_claims,
+)
+from app.services.user import UserPrincipal
 
 security = HTTPBearer(auto_error=False)
 
@@ -29,6 +35,10 @@ async def get_uow() -> AsyncGenerator[UnitOfWork]:
 
     Creates AsyncSession, wraps UnitOfWork with repositories, commits on success
     and rolls back on error.
+
+    Cheap when unused: AsyncSession checks out a pool connection only on the
+    first query, and `uow.commit()` is a no-op when nothing was written, so
+    anonymous or cache-served requests never touch the pool.
     """
     async with async_session_maker() as session:
         uow = create_uow(session)
@@ -40,6 +50,20 @@ async def get_uow() -> AsyncGenerator[UnitOfWork]:
             raise
 
 
+async def get_read_uow() -> AsyncGenerator[UnitOfWork]:
+    """
+    Unit of Work for read-only endpoints (GET).
+
+    The transaction is opened as READ ONLY, on the read replica when one is
+    configured and healthy (see `ReplicaMonitor`), otherwise on the primary.
+    Nothing is committed; any write attempt fails in Postgres.
+    Replica reads may lag behind the primary by up to
+    DATABASE_REPLICA_MAX_LAG_SECONDS.
+    """
+    async with get_read_session_maker()() as session:
+        yield create_uow(session)
+
+
 async def get_current_user(
     request: Request,
     credentials: HTTPAuthorizationCredentials | None = Depends(security),
@@ -72,4 +96,68 @@ async def get_current_user_required(
     return user
 
 
-__all__ = ["get_db", "get_current_user", "get_current_user_required", "get_uow"]
+async def get_current_principal(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    uow: UnitOfWork = Depends(get_uow),
+) -> UserPrincipal | None:
+    """
+    Resolve current user principal from Bearer token.
+
+    Same as `get_current_user`, but served from the user cache (app.services.user):
+    endpoints that only need `user.id` / `user.email` skip the users lookup.
+    """
+    if credentials is None:
+        return None
+    principal = await get_current_principal_from_token(uow, credentials.credentials)
+    if principal is not None:
+        setattr(request.state, USER_ID_STATE_KEY, str(principal.id))
+    return principal
+
+
+async def get_current_principal_required(
+    principal: UserPrincipal | None = Depends(get_current_principal),
+) -> UserPrincipal:
+    """
+    Require authenticated user principal.
+
+    Raises 401 if not authenticated.
+    """
+    if principal is None:
+        raise UnauthorizedError("Authentication required")
+    return principal
+
+
+async def get_read_principal_required(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials | None = Depends(security),
+    uow: UnitOfWork = Depends(get_uow),
+) -> UserPrincipal:
+    """
+    Principal for read-only owner endpoints.
+
+    With AUTH_TRUST_TOKEN_CLAIMS_FOR_READS the principal is built from the
+    verified JWT claims alone; otherwise behaves like `get_current_principal_required`.
+    """
+    principal: UserPrincipal | None = None
+    if credentials is not None:
+        if settings.AUTH_TRUST_TOKEN_CLAIMS_FOR_READS:
+            principal = get_principal_from_token_claims(credentials.credentials)
+        else:
+            principal = await get_current_principal_from_token(uow, credentials.credentials)
+    if principal is None:
+        raise UnauthorizedError("Authentication required")
+    setattr(request.state, USER_ID_STATE_KEY, str(principal.id))
+    return principal
+
+
+__all__ = [
+    "get_current_principal",
+    "get_current_principal_required",
+    "get_current_user",
+    "get_current_user_required",
+    "get_db",
+    "get_read_principal_required",
+    "get_read_uow",
+    "get_uow",
+]
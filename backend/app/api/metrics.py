@@ -0,0 +1,31 @@
+"""
+Prometheus scrape endpoint (GET /metrics).
+
+Не под /api/v1: его вызывает Prometheus, а не фронтенд; в OpenAPI не попадает.
+Ответ собирается из in-process метрик (app.core.metrics) без обращений к БД —
+scrape дешёвый и не зависит от состояния базы.
+
+Если задан METRICS_TOKEN, нужен заголовок `Authorization: Bearer <token>`.
+"""
+
+import secrets
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.exceptions import UnauthorizedError
+from app.core.metrics import render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request) -> PlainTextResponse:
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not secrets.compare_digest(request.headers.get("Authorization", ""), expected):
+            raise UnauthorizedError("Invalid metrics token")
+    return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -9,10 +9,11 @@ Magic link flow (strict cookie mode):
 
 from fastapi import APIRouter, Depends, Query, Request, Response
 
-from app.api.deps import get_current_user_required, get_uow
+from app.api.deps import get_current_principal_required, get_current_user_required, get_uow
 from app.core.config import settings
 from app.core.exceptions import ForbiddenError
 from app.core.rate_limit import limiter
+from app.core.tracing import TracedRoute
 from app.core.uow import UnitOfWork
 from app.models.user import User
 from app.schemas.auth import (
@@ -27,8 +28,9 @@ from app.services.auth import (
     request_magic_link,
     verify_magic_link,
 )
+from app.services.user import UserPrincipal, invalidate_user_principal
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=TracedRoute)
 
 REFRESH_TOKEN_COOKIE_NAME = "refresh_token"
 CSRF_COOKIE_NAME = "csrf_token"
@@ -117,6 +119,9 @@ async def magic_link_verify(
     from the query string and calls this endpoint.
     """
     user, access_token, refresh_token, csrf_token = await verify_magic_link(uow, token)
+    # Invalidate only after commit: a concurrent request could otherwise re-cache the old row.
+    await uow.commit()
+    invalidate_user_principal(user.id)
     _set_refresh_cookie(response, refresh_token)
     _set_csrf_cookie(response, csrf_token)
     return {
@@ -156,17 +161,20 @@ async def logout(
     request: Request,
     response: Response,
     uow: UnitOfWork = Depends(get_uow),
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
 ) -> None:
     """
     Sign out of the current session.
 
     Revokes the refresh session from the cookie and clears the cookie.
+    Drops the cached principal after commit so the next request re-reads the user.
     """
     refresh_token = request.cookies.get(REFRESH_TOKEN_COOKIE_NAME)
     _clear_refresh_cookie(response)
     if refresh_token:
         await logout_current_session(uow, user, refresh_token)
+        await uow.commit()
+    invalidate_user_principal(user.id)
 
 
 @router.get("/me", response_model=UserResponse)
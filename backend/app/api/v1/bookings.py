@@ -4,16 +4,19 @@ API роутер для бронирований.
 Операции:
 - POST /bookings — создать (гостевой режим)
 - GET /bookings — список с фильтрами
+- GET /bookings/my — кабинет: бронирования текущего пользователя
+- GET /bookings/history — кабинет: архивные бронирования прошедших занятий
 - GET /bookings/{id} — одно бронирование
 - PATCH /bookings/{id}/cancel — отменить
 """
 
-from fastapi import APIRouter, Depends, Query, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 
-from app.api.deps import get_current_user_required, get_uow
+from app.api.deps import get_read_principal_required, get_read_uow, get_uow
 from app.core.rate_limit import limiter
+from app.core.responses import typed_json_response
+from app.core.tracing import TracedRoute
 from app.core.uow import UnitOfWork
-from app.models.user import User
 from app.schemas import (
     BookingCreate,
     BookingListItem,
@@ -21,6 +24,7 @@ from app.schemas import (
     CourseBookingCreate,
     CourseBookingResponse,
 )
+from app.services.archive import get_my_booking_history
 from app.services.booking import (
     cancel_booking,
     create_booking,
@@ -30,8 +34,9 @@ from app.services.booking import (
     get_my_bookings,
 )
 from app.services.service import create_course_booking
+from app.services.user import UserPrincipal
 
-router = APIRouter(prefix="/bookings", tags=["bookings"])
+router = APIRouter(prefix="/bookings", tags=["bookings"], route_class=TracedRoute)
 
 
 @router.post("", response_model=BookingResponse | CourseBookingResponse, status_code=201)
@@ -57,14 +62,14 @@ async def create_booking_endpoint(
 
 @router.get("", response_model=list[BookingResponse])
 async def list_bookings(
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
     skip: int = Query(0, ge=0, description="Пропустить N записей"),
     limit: int = Query(20, ge=1, le=100, description="Максимум записей"),
     slot_id: int | None = Query(None, description="Фильтр по слоту"),
     user_id: int | None = Query(None, description="Фильтр по пользователю"),
     guest_email: str | None = Query(None, description="Фильтр по email гостя"),
     status: str | None = Query(None, description="Фильтр по статусу"),
-) -> list[BookingResponse]:
+) -> Response:
     """Список бронирований с фильтрами."""
     bookings = await get_bookings(
         uow,
@@ -75,20 +80,20 @@ async def list_bookings(
         guest_email=guest_email,
         status=status,
     )
-    return bookings
+    return typed_json_response(list[BookingResponse], bookings)
 
 
 @router.get("/my", response_model=list[BookingListItem])
 async def list_my_bookings(
-    uow: UnitOfWork = Depends(get_uow),
-    user: User = Depends(get_current_user_required),
+    uow: UnitOfWork = Depends(get_read_uow),
+    user: UserPrincipal = Depends(get_read_principal_required),
     skip: int = Query(0, ge=0, description="Пропустить N записей"),
     limit: int = Query(50, ge=1, le=100, description="Максимум записей"),
     include_guest_email: bool = Query(
         True,
         description="Включать гостевые бронирования по совпадению guest_email с email пользователя",
     ),
-) -> list[BookingListItem]:
+) -> Response:
     """
     Кабинетный список бронирований текущего пользователя (без N+1).
 
@@ -101,21 +106,40 @@ async def list_my_bookings(
         limit=limit,
         include_guest_email=include_guest_email,
     )
-    # Map ORM -> response with explicit studio field.
-    return [
-        BookingListItem(
-            **BookingResponse.model_validate(b).model_dump(),
-            slot=b.slot,
-            studio=b.slot.studio,
-        )
-        for b in bookings
-        if getattr(b, "slot", None) is not None and getattr(b.slot, "studio", None) is not None
-    ]
+    # Строки уже содержат row.slot / row.studio — валидируются напрямую.
+    return typed_json_response(list[BookingListItem], bookings)
+
+
+@router.get("/history", response_model=list[BookingListItem])
+async def list_my_booking_history(
+    uow: UnitOfWork = Depends(get_read_uow),
+    user: UserPrincipal = Depends(get_read_principal_required),
+    skip: int = Query(0, ge=0, description="Пропустить N записей"),
+    limit: int = Query(50, ge=1, le=100, description="Максимум записей"),
+    include_guest_email: bool = Query(
+        True,
+        description="Включать гостевые бронирования по совпадению guest_email с email пользователя",
+    ),
+) -> Response:
+    """
+    Архив бронирований текущего пользователя: занятия, перенесённые в архив.
+
+    /my показывает текущие данные; занятия старше ARCHIVE_AFTER_DAYS — только здесь.
+    """
+    bookings = await get_my_booking_history(
+        uow,
+        user=user,
+        skip=skip,
+        limit=limit,
+        include_guest_email=include_guest_email,
+    )
+    # Строки уже содержат row.slot / row.studio — валидируются напрямую.
+    return typed_json_response(list[BookingListItem], bookings)
 
 
 @router.get("/count")
 async def count_bookings(
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
     slot_id: int | None = Query(None, description="Фильтр по слоту"),
     user_id: int | None = Query(None, description="Фильтр по пользователю"),
     guest_email: str | None = Query(None, description="Фильтр по email гостя"),
@@ -135,7 +159,7 @@ async def count_bookings(
 @router.get("/{booking_id}", response_model=BookingResponse)
 async def get_booking_by_id(
     booking_id: int,
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
 ) -> BookingResponse:
     """Получить бронирование по ID."""
     return await get_booking_or_raise(uow, booking_id)
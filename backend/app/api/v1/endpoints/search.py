@@ -6,21 +6,24 @@ MVP‑поиск с фильтрами по категории, городу, з
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy import and_, func, or_, select, text
 
-from app.api.deps import get_uow
+from app.api.deps import get_read_uow
+from app.core.repositories.columns import STUDIO_COLUMNS
+from app.core.responses import typed_json_response
+from app.core.tracing import TracedRoute
 from app.core.uow import UnitOfWork
 from app.models.service import Service, ServiceCategory
 from app.models.studio import Studio
-from app.schemas import SearchResult, ServiceResponse, StudioResponse
+from app.schemas import SearchResult
 
-router = APIRouter(prefix="/search", tags=["search"])
+router = APIRouter(prefix="/search", tags=["search"], route_class=TracedRoute)
 
 
 @router.get("", response_model=list[SearchResult])
 async def search_endpoint(
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
     query: str | None = Query(None, description="Поисковый запрос по названию/описанию"),
     category: ServiceCategory | None = Query(None, description="Категория услуги"),
     city: str | None = Query(None, description="Город"),
@@ -28,12 +31,13 @@ async def search_endpoint(
     lng: float | None = Query(None, description="Долгота для гео-поиска"),
     radius_km: int | None = Query(10, ge=0, description="Радиус в км"),
     amenities: list[str] | None = Query(None, description="Удобства (можно передать несколько)"),
-) -> list[SearchResult]:
+) -> Response:
     """
     Поиск студий и услуг по комбинированным фильтрам.
 
     Базовый запрос строится от Studio с join на Service и distinct по студии,
-    чтобы одна студия не дублировалась в выдаче.
+    чтобы одна студия не дублировалась в выдаче. Студии и услуги читаются
+    строками STUDIO_COLUMNS/SERVICE_COLUMNS, без ORM-объектов.
     """
     conditions = [
         Studio.is_active.is_(True),
@@ -80,7 +84,7 @@ async def search_endpoint(
 
     # Базовый запрос: получаем уникальные студии, удовлетворяющие условиям
     studios_stmt = (
-        select(Studio)
+        select(*STUDIO_COLUMNS)
         .join(Service, Service.studio_id == Studio.id)
         .where(*conditions)
         .distinct(Studio.id)
@@ -91,42 +95,25 @@ async def search_endpoint(
             category_filter=category.value
         )
     studios_result = await uow.session.execute(studios_stmt)
-    studios: list[Studio] = list(studios_result.scalars().all())
+    studios = list(studios_result.all())
 
     if not studios:
-        return []
-
-    studio_ids = [s.id for s in studios]
+        return typed_json_response(list[SearchResult], [])
 
     # Для matched_services:
     # - если указана category: берём только услуги этой категории
     # - если category не указана: берём все активные услуги студии
-    service_conditions = [
-        Service.studio_id.in_(studio_ids),
-        Service.is_active.is_(True),
-    ]
-
-    services_stmt = select(Service).where(*service_conditions)
-    if category is not None:
-        services_stmt = services_stmt.where(text("services.category = :category_filter")).params(
-            category_filter=category.value
-        )
-    services_result = await uow.session.execute(services_stmt)
-    services: list[Service] = list(services_result.scalars().all())
-
-    services_by_studio: dict[int, list[Service]] = {}
+    services = await uow.services.list_active_rows_by_studio_ids(
+        [s.id for s in studios],
+        category=category.value if category is not None else None,
+    )
+    services_by_studio: dict[int, list] = {}
     for service in services:
         services_by_studio.setdefault(service.studio_id, []).append(service)
 
-    results: list[SearchResult] = []
-    for studio in studios:
-        matched_services = services_by_studio.get(studio.id, [])
-
-        results.append(
-            SearchResult(
-                studio=StudioResponse.model_validate(studio),
-                matched_services=[ServiceResponse.model_validate(s) for s in matched_services],
-            )
-        )
-
-    return results
+    # Строки студий и услуг валидируются в SearchResult один раз — при сериализации.
+    results = [
+        {"studio": studio, "matched_services": services_by_studio.get(studio.id, [])}
+        for studio in studios
+    ]
+    return typed_json_response(list[SearchResult], results)
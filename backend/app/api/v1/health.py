@@ -1,7 +1,7 @@
 """Health endpoints.
 
 `/health` is a lightweight health check (DB connectivity is required by rules).
-`/health/ready` is a readiness check (DB + optional Stripe/Resend).
+`/health/ready` is a readiness check (startup warm-up, DB + optional Stripe/Resend).
 """
 
 import asyncio
@@ -11,7 +11,9 @@ import structlog
 from fastapi import APIRouter, Response
 
 from app.core.config import settings
-from app.core.database import engine
+from app.core.database import engine, replica_monitor
+from app.core.metrics import cache_stats, counter_values
+from app.core.warmup import warmup
 
 router = APIRouter(tags=["health"])
 
@@ -62,8 +64,7 @@ def _check_stripe_sync() -> bool:
 
 async def _check_stripe() -> bool:
     """Async wrapper for the synchronous Stripe SDK."""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, _check_stripe_sync)
+    return await asyncio.to_thread(_check_stripe_sync)
 
 
 def _check_resend_configured() -> bool:
@@ -77,11 +78,22 @@ async def readiness(response: Response) -> dict[str, Any]:
     Readiness: whether the service is ready to accept traffic.
 
     Checks:
+    - Warm-up: 503 `warming_up` while the startup warm-up runs (`WARMUP_ENABLED`);
+      afterwards its outcome (`ok`, `timeout`, `failed`), which does not fail readiness.
     - DB: required; return 503 when it fails.
     - Stripe: when `STRIPE_SECRET_KEY` is set, do one lightweight request.
     - Resend: only validate whether the API key is configured.
+    - Replica: last result of the background lag check (reads fall back to primary).
+
+    Also reports in-process cache hit rates (`caches`) and counters
+    (`counters`, e.g. purged rows) for monitoring.
     """
+    if warmup.pending:
+        response.status_code = 503
+        return {"status": "warming_up", "checks": {"warmup": "pending"}}
+
     checks: dict[str, str] = {}
+    checks["warmup"] = warmup.outcome or "skip"
 
     db_ok = await _check_database()
     checks["database"] = "ok" if db_ok else "fail"
@@ -95,6 +107,12 @@ async def readiness(response: Response) -> dict[str, Any]:
     else:
         checks["stripe"] = "skip"
 
+    if replica_monitor.configured:
+        # Reads fall back to the primary, so a bad replica never fails readiness.
+        checks["replica"] = "ok" if replica_monitor.healthy else "fallback"
+    else:
+        checks["replica"] = "skip"
+
     if settings.RESEND_API_KEY:
         checks["resend"] = "configured"
     else:
@@ -104,4 +122,6 @@ async def readiness(response: Response) -> dict[str, Any]:
     return {
         "status": "ready",
         "checks": checks,
+        "caches": cache_stats(),
+        "counters": counter_values(),
     }
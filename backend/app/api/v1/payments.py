@@ -9,6 +9,7 @@ from fastapi import APIRouter, Depends, Request
 
 from app.api.deps import get_uow
 from app.core.rate_limit import limiter
+from app.core.tracing import TracedRoute
 from app.core.uow import UnitOfWork
 from app.schemas.payment import (
     CheckoutSessionCreate,
@@ -20,7 +21,7 @@ from app.services.payment import (
     create_order_checkout_session,
 )
 
-router = APIRouter(prefix="/payments", tags=["payments"])
+router = APIRouter(prefix="/payments", tags=["payments"], route_class=TracedRoute)
 
 
 @router.post("/checkout-session", response_model=CheckoutSessionResponse, status_code=201)
@@ -10,9 +10,9 @@ from datetime import date
 
 from fastapi import APIRouter, Depends, Query
 
-from app.api.deps import get_current_user_required, get_uow
+from app.api.deps import get_current_principal_required, get_read_uow, get_uow
+from app.core.tracing import TracedRoute
 from app.core.uow import UnitOfWork
-from app.models.user import User
 from app.schemas import (
     ScheduleBase,
     ScheduleCreate,
@@ -34,14 +34,15 @@ from app.services.service import (
     update_service,
 )
 from app.services.studio import ensure_studio_owner, get_studio_or_raise
+from app.services.user import UserPrincipal
 
-router = APIRouter(prefix="/services", tags=["services"])
+router = APIRouter(prefix="/services", tags=["services"], route_class=TracedRoute)
 
 
 @router.post("", response_model=ServiceResponse, status_code=201)
 async def create_service_endpoint(
     schema: ServiceCreate,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> ServiceResponse:
     """
@@ -60,7 +61,7 @@ async def create_service_endpoint(
 @router.get("/{service_id}", response_model=ServiceResponse)
 async def get_service_endpoint(
     service_id: int,
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
 ) -> ServiceResponse:
     """Получить услугу по ID (публично)."""
     service = await get_service_or_raise(uow, service_id)
@@ -74,7 +75,7 @@ async def get_service_availability_endpoint(
         None,
         description="Опциональная дата, с которой считать доступность (по умолчанию сегодня)",
     ),
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
 ) -> ServiceAvailabilityResponse:
     """
     Получить подробную информацию о доступности курса.
@@ -89,7 +90,7 @@ async def get_service_availability_endpoint(
 async def update_service_endpoint(
     service_id: int,
     schema: ServiceUpdate,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> ServiceResponse:
     """Обновить услугу (только владелец студии)."""
@@ -103,7 +104,7 @@ async def update_service_endpoint(
 @router.delete("/{service_id}", response_model=ServiceResponse)
 async def deactivate_service_endpoint(
     service_id: int,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> ServiceResponse:
     """
@@ -124,7 +125,7 @@ async def deactivate_service_endpoint(
 )
 async def list_service_schedules_endpoint(
     service_id: int,
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
 ) -> list[ScheduleResponse]:
     """Список шаблонов расписания для услуги."""
     await get_service_or_raise(uow, service_id)
@@ -140,7 +141,7 @@ async def list_service_schedules_endpoint(
 async def create_service_schedule_endpoint(
     service_id: int,
     schema: ScheduleBase,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> ScheduleResponse:
     """
@@ -161,7 +162,7 @@ async def create_service_schedule_endpoint(
 @router.delete("/schedules/{schedule_id}", status_code=204)
 async def delete_schedule_endpoint(
     schedule_id: int,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> None:
     """Удалить шаблон расписания (только владелец студии услуги)."""
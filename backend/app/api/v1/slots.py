@@ -14,11 +14,12 @@ CRUD операции:
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
-from app.api.deps import get_current_user_required, get_uow
+from app.api.deps import get_current_principal_required, get_read_uow, get_uow
+from app.core.responses import typed_json_response
+from app.core.tracing import TracedRoute
 from app.core.uow import UnitOfWork
-from app.models.user import User
 from app.schemas.booking import BookingResponse
 from app.schemas.slot import SlotCreate, SlotResponse, SlotUpdate
 from app.services.booking import get_bookings
@@ -31,20 +32,21 @@ from app.services.slot import (
     update_slot,
 )
 from app.services.studio import ensure_studio_owner, get_studio_or_raise
+from app.services.user import UserPrincipal
 
-router = APIRouter(prefix="/slots", tags=["slots"])
+router = APIRouter(prefix="/slots", tags=["slots"], route_class=TracedRoute)
 
 
 @router.get("", response_model=list[SlotResponse])
 async def list_slots(
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
     skip: int = Query(0, ge=0, description="Пропустить N записей"),
     limit: int = Query(20, ge=1, le=100, description="Максимум записей"),
     studio_id: int | None = Query(None, description="Фильтр по студии"),
     start_from: datetime | None = Query(None, description="Начало диапазона дат"),
     start_to: datetime | None = Query(None, description="Конец диапазона дат"),
     is_active: bool | None = Query(None, description="Фильтр по статусу"),
-) -> list[SlotResponse]:
+) -> Response:
     """
     Список слотов с фильтрами.
 
@@ -59,12 +61,12 @@ async def list_slots(
         start_to=start_to,
         is_active=is_active,
     )
-    return slots
+    return typed_json_response(list[SlotResponse], slots)
 
 
 @router.get("/count")
 async def count_slots(
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
     studio_id: int | None = Query(None, description="Фильтр по студии"),
     start_from: datetime | None = Query(None, description="Начало диапазона дат"),
     start_to: datetime | None = Query(None, description="Конец диапазона дат"),
@@ -84,20 +86,21 @@ async def count_slots(
 @router.get("/{slot_id}/bookings", response_model=list[BookingResponse])
 async def list_slot_bookings(
     slot_id: int,
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     status: str | None = Query(None, description="Фильтр по статусу"),
-) -> list[BookingResponse]:
+) -> Response:
     """Бронирования слота."""
     await get_slot_or_raise(uow, slot_id)
-    return await get_bookings(uow, skip=skip, limit=limit, slot_id=slot_id, status=status)
+    bookings = await get_bookings(uow, skip=skip, limit=limit, slot_id=slot_id, status=status)
+    return typed_json_response(list[BookingResponse], bookings)
 
 
 @router.get("/{slot_id}", response_model=SlotResponse)
 async def get_slot_by_id(
     slot_id: int,
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
 ) -> SlotResponse:
     """Получить слот по ID."""
     return await get_slot_or_raise(uow, slot_id)
@@ -106,7 +109,7 @@ async def get_slot_by_id(
 @router.post("", response_model=SlotResponse, status_code=201)
 async def create_slot_endpoint(
     schema: SlotCreate,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> SlotResponse:
     """
@@ -121,7 +124,7 @@ async def create_slot_endpoint(
 async def update_slot_endpoint(
     slot_id: int,
     schema: SlotUpdate,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> SlotResponse:
     """Обновить слот (только владелец студии)."""
@@ -134,7 +137,7 @@ async def update_slot_endpoint(
 @router.delete("/{slot_id}", status_code=204)
 async def delete_slot_endpoint(
     slot_id: int,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> None:
     """Удалить слот (только владелец студии). Удалятся и связанные бронирования."""
@@ -4,6 +4,7 @@ API роутер для студий.
 CRUD операции:
 - GET /studios — список с пагинацией
 - GET /studios/{id} — одна студия
+- GET /studios/{id}/slots/history — архив прошедших слотов
 - POST /studios — создать
 - PATCH /studios/{id} — обновить
 - DELETE /studios/{id} — удалить
@@ -15,22 +16,24 @@ CRUD операции:
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 
-from app.api.deps import get_current_user_required, get_uow
+from app.api.deps import get_current_principal_required, get_read_uow, get_uow
 from app.core.exceptions import ValidationError
+from app.core.responses import typed_json_response
+from app.core.tracing import TracedRoute
 from app.core.uow import UnitOfWork
 from app.models.service import ServiceCategory
-from app.models.user import User
 from app.schemas import (
     SearchResult,
-    ServiceResponse,
     SlotResponse,
     StudioCreate,
+    StudioListItem,
     StudioPublicResponse,
     StudioResponse,
     StudioUpdate,
 )
+from app.services.archive import get_studio_slot_history
 from app.services.service import (
     get_studio_public,
     occurrence_generator,
@@ -45,13 +48,14 @@ from app.services.studio import (
     get_studios_count,
     update_studio,
 )
+from app.services.user import UserPrincipal
 
-router = APIRouter(prefix="/studios", tags=["studios"])
+router = APIRouter(prefix="/studios", tags=["studios"], route_class=TracedRoute)
 
 
-@router.get("")
+@router.get("", response_model=list[StudioListItem] | list[SearchResult])
 async def list_studios(
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
     skip: int = Query(0, ge=0, description="Пропустить N записей"),
     limit: int = Query(20, ge=1, le=100, description="Максимум записей"),
     owner_id: int | None = Query(None, description="Фильтр по владельцу (для панели owner)"),
@@ -63,10 +67,10 @@ async def list_studios(
     include_services: bool = Query(
         False, description="Вернуть услуги для карточек (цена, категория)"
     ),
-):
+) -> Response:
     """
     Список студий с пагинацией и опциональными фильтрами для Explore.
-    При include_services=true возвращает list[SearchResult] (студия + услуги), иначе list[StudioResponse].
+    При include_services=true возвращает list[SearchResult] (студия + услуги), иначе list[StudioListItem].
     """
     studios = await get_studios(
         uow,
@@ -80,29 +84,25 @@ async def list_studios(
         amenities=amenities,
     )
     if not include_services:
-        return [StudioResponse.model_validate(s) for s in studios]
+        return typed_json_response(list[StudioListItem], studios)
 
     studio_ids = [s.id for s in studios]
-    services = await uow.services.list_active_by_studio_ids(
+    services = await uow.services.list_active_rows_by_studio_ids(
         studio_ids,
         category=category.value if category is not None else None,
     )
     by_studio: dict[int, list] = {}
     for svc in services:
-        by_studio.setdefault(svc.studio_id, []).append(ServiceResponse.model_validate(svc))
+        by_studio.setdefault(svc.studio_id, []).append(svc)
 
-    return [
-        SearchResult(
-            studio=StudioResponse.model_validate(s),
-            matched_services=by_studio.get(s.id, []),
-        )
-        for s in studios
-    ]
+    # Строки студий и услуг валидируются в SearchResult один раз — при сериализации.
+    results = [{"studio": s, "matched_services": by_studio.get(s.id, [])} for s in studios]
+    return typed_json_response(list[SearchResult], results)
 
 
 @router.get("/count")
 async def count_studios(
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
     owner_id: int | None = Query(None, description="Фильтр по владельцу"),
     is_active: bool | None = Query(None, description="Фильтр по статусу"),
     city: str | None = Query(None, description="Город (Explore)"),
@@ -126,13 +126,13 @@ async def count_studios(
 @router.get("/{studio_id}/slots", response_model=list[SlotResponse])
 async def list_studio_slots(
     studio_id: int,
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
     skip: int = Query(0, ge=0, description="Пропустить N записей"),
     limit: int = Query(20, ge=1, le=100, description="Максимум записей"),
     start_from: datetime | None = Query(None, description="Начало диапазона дат"),
     start_to: datetime | None = Query(None, description="Конец диапазона дат"),
     is_active: bool | None = Query(None, description="Фильтр по статусу"),
-) -> list[SlotResponse]:
+) -> Response:
     """
     Расписание студии: слоты с фильтрами по датам.
     """
@@ -145,13 +145,36 @@ async def list_studio_slots(
         start_to=start_to,
         is_active=is_active,
     )
-    return slots
+    return typed_json_response(list[SlotResponse], slots)
+
+
+@router.get("/{studio_id}/slots/history", response_model=list[SlotResponse])
+async def list_studio_slot_history(
+    studio_id: int,
+    uow: UnitOfWork = Depends(get_read_uow),
+    skip: int = Query(0, ge=0, description="Пропустить N записей"),
+    limit: int = Query(20, ge=1, le=100, description="Максимум записей"),
+    start_from: datetime | None = Query(None, description="Начало диапазона дат"),
+    start_to: datetime | None = Query(None, description="Конец диапазона дат"),
+) -> Response:
+    """
+    Архив расписания студии: слоты, перенесённые в архив (новые первыми).
+    """
+    slots = await get_studio_slot_history(
+        uow,
+        studio_id,
+        skip=skip,
+        limit=limit,
+        start_from=start_from,
+        start_to=start_to,
+    )
+    return typed_json_response(list[SlotResponse], slots)
 
 
 @router.get("/{studio_id}", response_model=StudioResponse)
 async def get_studio_by_id(
     studio_id: int,
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
 ) -> StudioResponse:
     """Получить студию по ID."""
     return await get_studio_or_raise(uow, studio_id)
@@ -160,7 +183,7 @@ async def get_studio_by_id(
 @router.get("/slug/{slug}/public", response_model=StudioPublicResponse)
 async def get_studio_public_endpoint(
     slug: str,
-    uow: UnitOfWork = Depends(get_uow),
+    uow: UnitOfWork = Depends(get_read_uow),
 ) -> StudioPublicResponse:
     """
     Публичное представление студии по slug.
@@ -174,7 +197,7 @@ async def get_studio_public_endpoint(
 async def generate_studio_schedule_endpoint(
     studio_id: int,
     payload: dict,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> list[SlotResponse]:
     """
@@ -229,7 +252,7 @@ async def generate_studio_schedule_endpoint(
 @router.post("", response_model=StudioResponse, status_code=201)
 async def create_studio_endpoint(
     schema: StudioCreate,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> StudioResponse:
     """
@@ -245,7 +268,7 @@ async def create_studio_endpoint(
 async def update_studio_endpoint(
     studio_id: int,
     schema: StudioUpdate,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> StudioResponse:
     """Обновить студию (только владелец)."""
@@ -257,7 +280,7 @@ async def update_studio_endpoint(
 @router.delete("/{studio_id}", status_code=204)
 async def delete_studio_endpoint(
     studio_id: int,
-    user: User = Depends(get_current_user_required),
+    user: UserPrincipal = Depends(get_current_principal_required),
     uow: UnitOfWork = Depends(get_uow),
 ) -> None:
     """Удалить студию (только владелец). Удалятся и связанные слоты."""
@@ -8,17 +8,17 @@ Stripe webhook требует raw body для проверки подписи.
 Бизнес-логика подтверждения оплаты — в сервисе payment.
 """
 
-import stripe
 import structlog
 from fastapi import APIRouter, Request, Response
 
 from app.core.config import settings
 from app.core.database import async_session_maker
 from app.core.middleware.logging_middleware import REQUEST_ID_STATE_KEY
+from app.core.tracing import TracedRoute
 from app.core.uow import create_uow
 from app.services.payment import confirm_booking_after_payment, confirm_order_after_payment
 
-router = APIRouter(prefix="/webhooks", tags=["webhooks"])
+router = APIRouter(prefix="/webhooks", tags=["webhooks"], route_class=TracedRoute)
 
 
 def _parse_checkout_session_metadata(session: object) -> tuple[str | None, str | None]:
@@ -59,6 +59,9 @@ async def stripe_webhook(request: Request) -> Response:
     if not settings.STRIPE_WEBHOOK_SECRET:
         return Response(status_code=500, content="Webhook secret not configured")
 
+    # Stripe SDK не нужен на старте: импорт при первом webhook (холодный старт).
+    import stripe
+
     payload = await request.body()
     sig_header = request.headers.get("Stripe-Signature", "")
 
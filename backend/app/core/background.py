@@ -0,0 +1,111 @@
+"""
+Фоновые периодические задачи внутри процесса API.
+
+Запускаются и останавливаются в lifespan (main.py). Ошибка одного прогона
+логируется и не останавливает задачу — следующий прогон через `interval`.
+
+run_in_batches — общий цикл для чисток (DELETE ... LIMIT): одна пачка —
+одна короткая транзакция, чтобы не держать блокировки и не раздувать WAL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.uow import UnitOfWork, create_uow
+
+
+class PeriodicTask:
+    """
+    Периодически вызывает `job` в отдельной asyncio-задаче.
+
+    Если job вернул True (есть ещё работа, например полная пачка), следующий
+    прогон идёт сразу, иначе — пауза `interval` секунд.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        job: Callable[[], Awaitable[bool | None]],
+        *,
+        interval: float,
+    ) -> None:
+        self.name = name
+        self._job = job
+        self.interval = interval
+        self._task: asyncio.Task[None] | None = None
+        self._stopping = asyncio.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Дождаться окончания текущего прогона (не дольше timeout), затем отменить."""
+        if self._task is None:
+            return
+        self._stopping.set()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except TimeoutError:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        logger = structlog.get_logger(__name__)
+        while not self._stopping.is_set():
+            more = False
+            try:
+                more = bool(await self._job())
+            except Exception as e:
+                logger.exception(
+                    "background_task_failed", task=self.name, error_type=type(e).__name__
+                )
+            if more:
+                await asyncio.sleep(0)
+                continue
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+
+
+async def run_in_batches(
+    session_factory: Callable[[], AsyncSession],
+    batch: Callable[[UnitOfWork, int], Awaitable[int]],
+    *,
+    batch_size: int,
+    max_batches: int,
+) -> int:
+    """
+    Вызывать `batch(uow, batch_size)` в отдельных транзакциях, пока пачка полная.
+
+    Не больше `max_batches` пачек за вызов (остаток — в следующий прогон).
+    Возвращает суммарное число обработанных строк.
+    """
+    total = 0
+    for _ in range(max(1, max_batches)):
+        async with session_factory() as session:
+            uow = create_uow(session)
+            try:
+                processed = await batch(uow, batch_size)
+                await uow.commit()
+            except Exception:
+                await uow.rollback()
+                raise
+        total += processed
+        if processed < batch_size:
+            break
+        await asyncio.sleep(0)
+    return total
@@ -0,0 +1,582 @@
+"""
+Кэш приложения с тегами сущностей и инвалидацией по тегам.
+
+Записи помечаются тегами сущностей, из которых собраны: "user:5", "studio:42".
+`invalidate_tags(["studio:42"])` делает устаревшими все записи с этим тегом во
+всех кэшах процесса и в общем хранилище. Кто и когда вызывает инвалидацию —
+app.core.cache_invalidation: после commit сессии UoW и по NOTIFY от других
+воркеров.
+
+Уровни:
+- in-process: TTLCache (TTL + LRU) в каждом `TagCache`;
+- общий (опционально, CACHE_SHARED_URI=sqlite:///<path>): файл SQLite на хосте,
+  общий для воркеров — промах in-process уровня не идёт в БД, если соседний
+  воркер уже загрузил значение. Значения хранятся в JSON (TypeAdapter типа
+  значения, `value_type=`): содержимое файла не исполняется при чтении, а
+  невалидные записи считаются промахом.
+
+Гонка "чтение до commit, запись в кэш после инвалидации": перед загрузкой
+берётся отметка (`invalidation_stamp()`), и запись, чьи теги инвалидированы
+после неё, в кэш не попадает. `TagCache.get_or_load` делает это сам.
+
+Тег "user:5" неявно зависит от тега типа "user": массовый UPDATE/DELETE по
+таблице (без известных id) инвалидирует тег типа — и все записи этого типа.
+
+Каждый TagCache объявляет сущности своих тегов (`entities=`). Теги остальных
+сущностей никому не нужны: их инвалидация и NOTIFY пропускаются (cached_tags).
+
+Не потокобезопасно — рассчитано на event loop (один поток).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import time
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from dataclasses import dataclass
+from functools import cache
+from typing import Any, Protocol
+from urllib.parse import urlparse
+
+import structlog
+from pydantic import TypeAdapter
+
+from app.core.metrics import register_cache
+from app.core.ttl_cache import CacheStats, TTLCache
+
+
+@cache
+def entity_name(model: type | str) -> str:
+    """Имя сущности для тегов: класс модели в snake_case (MagicLinkToken -> magic_link_token)."""
+    if isinstance(model, str):
+        return model
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", model.__name__).lower()
+
+
+def entity_tag(model: type | str, entity_id: Any) -> str:
+    """Тег одной сущности: entity_tag(Studio, 42) == "studio:42"."""
+    return f"{entity_name(model)}:{entity_id}"
+
+
+def _with_type_tags(tags: Iterable[str]) -> tuple[str, ...]:
+    """Теги записи + теги типа ("studio:42" -> ещё и "studio")."""
+    expanded = dict.fromkeys(tags)
+    for tag in list(expanded):
+        expanded.setdefault(tag.partition(":")[0])
+    return tuple(expanded)
+
+
+@dataclass(frozen=True, slots=True)
+class Stamp:
+    """Момент начала загрузки: номер инвалидации процесса и время (для общего уровня)."""
+
+    seq: int
+    wall: float
+
+
+class _InvalidationLog:
+    """
+    Последняя инвалидация каждого тега (номер по порядку в процессе).
+
+    Запись устарела, если какой-то её тег инвалидирован позже её отметки.
+    Отметки старше максимального TTL кэшей удаляются: записи того времени уже
+    истекли. Запись, загрузка которой началась до удалённой отметки, не кэшируется.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._marks: dict[str, tuple[int, float]] = {}
+        self._seq = 0
+        self._pruned_seq = 0
+        self._prune_at = 4096
+        self.max_ttl_seconds = 0.0
+
+    def stamp(self) -> int:
+        return self._seq
+
+    def mark(self, tags: Iterable[str]) -> None:
+        self._seq += 1
+        now = self._clock()
+        for tag in tags:
+            self._marks[tag] = (self._seq, now)
+        if len(self._marks) > self._prune_at:
+            self._prune(now)
+            self._prune_at = max(4096, 2 * len(self._marks))
+
+    def stale(self, tags: Iterable[str], since: int) -> bool:
+        if since < self._pruned_seq:
+            return True
+        marks = self._marks
+        return any(marks.get(tag, (0, 0.0))[0] > since for tag in tags)
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.max_ttl_seconds
+        old = [tag for tag, (_, at) in self._marks.items() if at <= cutoff]
+        for tag in old:
+            self._pruned_seq = max(self._pruned_seq, self._marks.pop(tag)[0])
+
+    def clear(self) -> None:
+        self._marks.clear()
+        self._pruned_seq = self._seq
+
+
+_log = _InvalidationLog()
+_caches: dict[str, TagCache[Any, Any]] = {}
+_shared: CacheBackend | None = None
+
+
+def cached_tags(tags: Iterable[str]) -> list[str]:
+    """Теги сущностей, объявленных зарегистрированными кэшами (остальные можно не рассылать)."""
+    entities = {e for tag_cache in _caches.values() for e in tag_cache.entities}
+    return [tag for tag in tags if tag.partition(":")[0] in entities]
+
+
+def invalidation_stamp() -> Stamp:
+    """Отметка перед загрузкой из БД (передаётся в TagCache.set)."""
+    return Stamp(_log.stamp(), time.time())
+
+
+def invalidate_tags(tags: Iterable[str]) -> None:
+    """Сделать устаревшими записи с этими тегами: во всех кэшах процесса и в общем уровне."""
+    tags = tuple(dict.fromkeys(tags))
+    if not tags:
+        return
+    _log.mark(tags)
+    if _shared is not None:
+        try:
+            _shared.invalidate(tags)
+        except Exception as e:
+            # Общий уровень недоступен — его записи доживут максимум до TTL.
+            structlog.get_logger(__name__).warning(
+                "cache_shared_invalidate_failed", error_type=type(e).__name__
+            )
+
+
+def clear_caches() -> None:
+    """Сбросить все кэши (например, пропущены инвалидации от других воркеров)."""
+    _log.clear()
+    for tag_cache in _caches.values():
+        tag_cache.clear()
+    if _shared is not None:
+        try:
+            _shared.clear()
+        except Exception as e:
+            structlog.get_logger(__name__).warning(
+                "cache_shared_clear_failed", error_type=type(e).__name__
+            )
+
+
+@dataclass(slots=True)
+class _Entry[V]:
+    value: V
+    tags: tuple[str, ...]
+    stamp: int
+
+
+class TagCache[K: Hashable, V]:
+    """
+    Кэш с TTL и LRU, чьи записи помечены тегами сущностей.
+
+    entities — модели (или имена сущностей), тегами которых помечаются записи;
+    теги других сущностей в set — ошибка: их изменения не рассылаются.
+    shared=True — промахи и записи идут ещё и в общий уровень (если он настроен);
+    значения хранятся там в JSON по value_type (обязателен при shared=True).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_size: int,
+        ttl_seconds: float,
+        entities: Iterable[type | str] = (),
+        shared: bool = False,
+        value_type: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if shared and value_type is None:
+            raise ValueError(f"{name}: shared=True needs value_type for JSON serialization")
+        self.name = name
+        self.entities = frozenset(entity_name(e) for e in entities)
+        self.shared = shared
+        self._codec: TypeAdapter[V] | None = TypeAdapter(value_type) if shared else None
+        self._local: TTLCache[K, _Entry[V]] = TTLCache(
+            max_size=max_size, ttl_seconds=ttl_seconds, clock=clock
+        )
+        self._hits = 0
+        self._misses = 0
+        _log.max_ttl_seconds = max(_log.max_ttl_seconds, ttl_seconds)
+        _caches[name] = self
+        register_cache(name, self)
+
+    @property
+    def stats(self) -> CacheStats:
+        """Попадания и промахи с учётом инвалидации; вытеснения — из LRU."""
+        return CacheStats(self._hits, self._misses, self._local.stats.evictions)
+
+    @property
+    def enabled(self) -> bool:
+        return self._local.max_size > 0 and self._local.ttl_seconds > 0
+
+    def __len__(self) -> int:
+        return len(self._local)
+
+    def get(self, key: K) -> V | None:
+        """Значение по ключу или None (нет, истекло, инвалидировано)."""
+        entry = self._local.get(key)
+        if entry is not None and _log.stale(entry.tags, entry.stamp):
+            self._local.pop(key)
+            entry = None
+        if entry is None and self._codec is not None and _shared is not None and self.enabled:
+            entry = self._get_shared(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        self._hits += 1
+        return entry.value
+
+    def set(
+        self,
+        key: K,
+        value: V,
+        *,
+        tags: Iterable[str] = (),
+        since: Stamp | None = None,
+    ) -> None:
+        """
+        Положить значение с тегами.
+
+        since — отметка invalidation_stamp(), взятая до загрузки значения:
+        если его теги с тех пор инвалидированы, значение уже могло устареть
+        и не кэшируется.
+        """
+        if not self.enabled:
+            return
+        since = since or invalidation_stamp()
+        entry = _Entry(value, _with_type_tags(tags), since.seq)
+        undeclared = {tag.partition(":")[0] for tag in entry.tags} - self.entities
+        if undeclared:
+            raise ValueError(f"{self.name}: tags of undeclared entities {sorted(undeclared)}")
+        if _log.stale(entry.tags, entry.stamp):
+            return
+        self._local.set(key, entry)
+        if self._codec is not None and _shared is not None:
+            try:
+                _shared.set(
+                    self._shared_key(key),
+                    self._codec.dump_json(value),
+                    tags=entry.tags,
+                    ttl_seconds=self._local.ttl_seconds,
+                    since=since.wall,
+                )
+            except Exception as e:
+                structlog.get_logger(__name__).warning(
+                    "cache_shared_set_failed", cache=self.name, error_type=type(e).__name__
+                )
+
+    async def get_or_load(
+        self,
+        key: K,
+        load: Callable[[], Awaitable[V | None]],
+        *,
+        tags: Iterable[str] = (),
+    ) -> V | None:
+        """Значение из кэша; при промахе — load() и запись в кэш (None не кэшируется)."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        since = invalidation_stamp()
+        value = await load()
+        if value is not None:
+            self.set(key, value, tags=tags, since=since)
+        return value
+
+    def pop(self, key: K) -> None:
+        """Инвалидировать ключ в этом процессе (нет ключа — no-op)."""
+        self._local.pop(key)
+
+    def clear(self) -> None:
+        self._local.clear()
+
+    def reset_stats(self) -> None:
+        self._hits = self._misses = 0
+        self._local.reset_stats()
+
+    def _shared_key(self, key: K) -> str:
+        return f"{self.name}:{key}"
+
+    def _get_shared(self, key: K) -> _Entry[V] | None:
+        assert _shared is not None and self._codec is not None
+        since = invalidation_stamp()
+        try:
+            found = _shared.get(self._shared_key(key))
+            if found is None:
+                return None
+            data, tags = found
+            value = self._codec.validate_json(data)
+        except Exception as e:
+            structlog.get_logger(__name__).warning(
+                "cache_shared_get_failed", cache=self.name, error_type=type(e).__name__
+            )
+            return None
+        entry = _Entry(value, tags, since.seq)
+        self._local.set(key, entry)
+        return entry
+
+
+# === Общий уровень ===
+
+
+class CacheBackend(Protocol):
+    """Общий для воркеров уровень кэша: значения — байты, инвалидация — по тегам."""
+
+    def get(self, key: str) -> tuple[bytes, tuple[str, ...]] | None:
+        """Значение и его теги или None."""
+        ...
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        *,
+        tags: tuple[str, ...],
+        ttl_seconds: float,
+        since: float,
+    ) -> None:
+        """Сохранить, если ни один тег не инвалидирован начиная с since (time.time())."""
+        ...
+
+    def invalidate(self, tags: tuple[str, ...]) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS cache_entries (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        tags TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cache_entry_tags (
+        tag TEXT NOT NULL,
+        key TEXT NOT NULL,
+        PRIMARY KEY (tag, key)
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS cache_invalidations (
+        tag TEXT PRIMARY KEY,
+        at REAL NOT NULL
+    ) WITHOUT ROWID
+    """,
+)
+
+_TAGS = "SELECT value FROM json_each(:tags)"
+
+
+def _busy(error: sqlite3.Error) -> bool:
+    """Файл занят записью другого воркера (истёк busy_timeout)."""
+    return getattr(error, "sqlite_errorcode", None) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+
+
+class SQLiteCacheBackend:
+    """
+    Общий уровень в файле SQLite (CACHE_SHARED_URI=sqlite:///<path>) — один на хост.
+
+    Как и хранилище rate limit (app.core.rate_limit_storage): вызовы синхронные,
+    локальный файл в WAL — десятки микросекунд. Инвалидация удаляет записи тега
+    и запоминает время, чтобы не принять запись, загруженную до неё.
+    Просроченные записи и старые отметки удаляются раз в `purge_every` записей.
+
+    Вызовы идут из event loop, поэтому запись другого воркера ждём не дольше
+    busy_timeout_ms (единицы мс): занятый файл — промах для get и пропуск для
+    set. Неудавшаяся инвалидация не теряется: её теги ждут следующей попытки
+    (при любом вызове), а до тех пор записи с ними не читаются и не пишутся.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        *,
+        busy_timeout_ms: int = 5,
+        purge_every: int = 1000,
+        max_ttl_seconds: float = 3600.0,
+    ) -> None:
+        path = urlparse(uri).path
+        if not path:
+            raise ValueError("SQLite cache backend requires a path: sqlite:///<path>")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # autocommit; пишущие операции — в явных BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self.purge_every = purge_every
+        self.max_ttl_seconds = max_ttl_seconds
+        self._sets = 0
+        # Инвалидации, не записанные из-за занятого файла, и время последней из них.
+        self._pending: set[str] = set()
+        self._pending_at = 0.0
+
+    def _retry_pending(self) -> bool:
+        """Дописать отложенные инвалидации; True — отложенных не осталось."""
+        if self._pending:
+            self.invalidate(())
+        return not self._pending
+
+    def get(self, key: str) -> tuple[bytes, tuple[str, ...]] | None:
+        self._retry_pending()
+        try:
+            row = self._conn.execute(
+                "SELECT value, tags FROM cache_entries WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        except sqlite3.OperationalError as e:
+            if _busy(e):
+                return None
+            raise
+        if row is None:
+            return None
+        tags = tuple(json.loads(row[1]))
+        if not self._pending.isdisjoint(tags):
+            return None
+        return row[0], tags
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        *,
+        tags: tuple[str, ...],
+        ttl_seconds: float,
+        since: float,
+    ) -> None:
+        if not self._retry_pending() and not self._pending.isdisjoint(tags):
+            return
+        params = {"key": key, "tags": json.dumps(tags), "since": since}
+        conn = self._conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            if _busy(e):
+                return
+            raise
+        try:
+            invalidated = conn.execute(
+                f"SELECT 1 FROM cache_invalidations WHERE tag IN ({_TAGS}) AND at >= :since",
+                params,
+            ).fetchone()
+            if invalidated is None:
+                now = time.time()
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, tags, expires_at) "
+                    "VALUES (:key, :value, :tags, :expires_at)",
+                    {**params, "value": value, "expires_at": now + ttl_seconds},
+                )
+                conn.execute("DELETE FROM cache_entry_tags WHERE key = :key", params)
+                conn.execute(
+                    f"INSERT INTO cache_entry_tags (tag, key) SELECT value, :key FROM ({_TAGS})",
+                    params,
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._sets += 1
+        if self.purge_every > 0 and self._sets % self.purge_every == 0:
+            self.purge()
+
+    def invalidate(self, tags: tuple[str, ...]) -> None:
+        if tags:
+            self._pending_at = time.time()
+        tags = (*self._pending, *tags)
+        if not tags:
+            return
+        params = {"tags": json.dumps(tags), "now": self._pending_at}
+        conn = self._conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            if _busy(e):
+                self._pending.update(tags)
+                return
+            raise
+        try:
+            conn.execute(
+                "INSERT INTO cache_invalidations (tag, at) SELECT value, :now "
+                f"FROM ({_TAGS}) WHERE true ON CONFLICT (tag) DO UPDATE SET at = excluded.at",
+                params,
+            )
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS _stale (key TEXT PRIMARY KEY) WITHOUT ROWID"
+            )
+            conn.execute(
+                f"INSERT OR IGNORE INTO _stale SELECT key FROM cache_entry_tags "
+                f"WHERE tag IN ({_TAGS})",
+                params,
+            )
+            conn.execute("DELETE FROM cache_entries WHERE key IN (SELECT key FROM _stale)")
+            conn.execute("DELETE FROM cache_entry_tags WHERE key IN (SELECT key FROM _stale)")
+            conn.execute("DELETE FROM _stale")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._pending.clear()
+
+    def purge(self) -> None:
+        """Удалить просроченные записи и отметки старше максимального TTL (занято — позже)."""
+        now = time.time()
+        conn = self._conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+        except sqlite3.OperationalError as e:
+            if _busy(e):
+                return
+            raise
+        try:
+            conn.execute(
+                "DELETE FROM cache_entry_tags WHERE key IN "
+                "(SELECT key FROM cache_entries WHERE expires_at <= ?)",
+                (now,),
+            )
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "DELETE FROM cache_invalidations WHERE at < ?", (now - self.max_ttl_seconds,)
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def clear(self) -> None:
+        for table in ("cache_entries", "cache_entry_tags", "cache_invalidations"):
+            self._conn.execute(f"DELETE FROM {table}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def configure_shared_backend(uri: str) -> CacheBackend | None:
+    """Включить общий уровень по URI ("" — только in-process); возвращает backend."""
+    global _shared
+    if not uri:
+        _shared = None
+    elif uri.startswith("sqlite:"):
+        _shared = SQLiteCacheBackend(uri, max_ttl_seconds=max(_log.max_ttl_seconds, 1.0))
+    else:
+        raise ValueError(f"Unsupported CACHE_SHARED_URI scheme: {uri!r} (expected sqlite:///)")
+    return _shared
@@ -0,0 +1,232 @@
+"""
+Инвалидация кэша приложения (app.core.cache) после commit и между воркерами.
+
+Сессия UoW (create_uow -> track_cache_tags) собирает теги изменённых сущностей:
+- after_flush: new/dirty/deleted объекты -> "<сущность>:<pk>" и сущности, на
+  которые они ссылаются внешним ключом с info={"cache_parent_tag": True}
+  (новый слот студии 42 -> "studio:42"); при смене внешнего ключа — и прежнее
+  значение. Остальные внешние ключи родителя не затрагивают: новое
+  бронирование не инвалидирует "user:<id>";
+- do_orm_execute: массовые UPDATE/DELETE/INSERT по модели -> тег типа ("slot").
+  text() и Core-выражения над таблицами (без модели) не отслеживаются — код,
+  который их выполняет, добавляет теги сам через add_cache_tags.
+
+Теги сущностей, которые не объявил ни один TagCache, отбрасываются (cached_tags):
+запись без таких тегов не шлёт NOTIFY.
+
+before_commit: теги уходят в pg_notify в той же транзакции — Postgres доставит
+NOTIFY только при успешном commit (CACHE_NOTIFY_ENABLED). after_commit: теги
+инвалидируются в процессе. Не раньше: читатель, загрузивший старые данные
+между инвалидацией и commit, положил бы их в кэш уже после инвалидации.
+Откат корневой транзакции сбрасывает собранные теги.
+
+CacheInvalidationListener (lifespan) держит отдельное соединение asyncpg с
+LISTEN на канал и применяет теги из NOTIFY других процессов. Пока соединения
+нет, уведомления теряются, поэтому при обрыве и переподключении все кэши
+сбрасываются.
+"""
+
+from __future__ import annotations
+
+import os
+import uuid
+from collections.abc import Iterable, Iterator
+from functools import cache
+from typing import Any
+
+import asyncpg
+import structlog
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Mapper, ORMExecuteState, Session, SessionTransaction
+
+from app.core.cache import cached_tags, clear_caches, entity_name, entity_tag, invalidate_tags
+from app.core.config import settings
+from app.core.metrics import counter
+
+notifications_received = counter(
+    "cache_invalidation_notifications_total",
+    "Cache invalidation NOTIFY messages received from other processes",
+)
+
+_TAGS_KEY = "cache_tags"
+_TRACKED_KEY = "cache_tags_tracked"
+# Column.info: внешний ключ, изменение по которому инвалидирует и родителя.
+_PARENT_TAG_KEY = "cache_parent_tag"
+# Отправитель в начале payload: свои уведомления уже применены в after_commit.
+_SENDER = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+# Лимит payload NOTIFY — 8000 байт.
+_MAX_PAYLOAD = 7900
+
+
+@cache
+def _foreign_keys(mapper: Mapper[Any]) -> tuple[tuple[str, str], ...]:
+    """(атрибут, сущность-родитель) для внешних ключей с info["cache_parent_tag"]."""
+    entities = {m.local_table.name: entity_name(m.class_) for m in mapper.registry.mappers}
+    found = []
+    for column in mapper.local_table.columns:
+        if not column.info.get(_PARENT_TAG_KEY):
+            continue
+        for fk in column.foreign_keys:
+            parent = entities.get(fk.column.table.name)
+            if parent is not None and mapper.columns.contains_column(column):
+                found.append((mapper.get_property_by_column(column).key, parent))
+    return tuple(found)
+
+
+def _object_tags(obj: object) -> Iterator[str]:
+    state = inspect(obj)
+    mapper = state.mapper
+    name = entity_name(mapper.class_)
+    # identity — у загруженных и удаляемых; у новых pk уже выставлен INSERT-ом
+    pk = state.identity or mapper.primary_key_from_instance(obj)
+    if all(v is not None for v in pk):
+        yield entity_tag(name, ",".join(map(str, pk)))
+    for key, parent in _foreign_keys(mapper):
+        history = state.attrs[key].history
+        for value in (*history.added, *history.unchanged, *history.deleted):
+            if value is not None:
+                yield entity_tag(parent, value)
+
+
+def _pending(session: Session | AsyncSession) -> set[str]:
+    return session.info.setdefault(_TAGS_KEY, set())
+
+
+def add_cache_tags(session: Session | AsyncSession, tags: Iterable[str]) -> None:
+    """Добавить теги к инвалидации после commit (для Core-выражений и text())."""
+    _pending(session).update(tags)
+
+
+def _collect_flushed(session: Session, flush_context: object) -> None:
+    tags = _pending(session)
+    for obj in (*session.new, *session.deleted):
+        tags.update(_object_tags(obj))
+    for obj in session.dirty:
+        if session.is_modified(obj, include_collections=False):
+            tags.update(_object_tags(obj))
+
+
+def _collect_bulk(state: ORMExecuteState) -> None:
+    if (state.is_update or state.is_delete or state.is_insert) and state.bind_mapper:
+        _pending(state.session).add(entity_name(state.bind_mapper.class_))
+
+
+def _payloads(tags: Iterable[str]) -> Iterator[str]:
+    chunk = _SENDER
+    for tag in tags:
+        if len(chunk) + len(tag) + 1 > _MAX_PAYLOAD:
+            yield chunk
+            chunk = _SENDER
+        chunk = f"{chunk} {tag}"
+    if chunk != _SENDER:
+        yield chunk
+
+
+def _notify(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    session.flush()  # последний autoflush commit идёт после before_commit
+    tags = cached_tags(session.info.get(_TAGS_KEY, ()))
+    if not tags or not settings.CACHE_NOTIFY_ENABLED:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+    for payload in _payloads(sorted(tags)):
+        connection.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": settings.CACHE_INVALIDATION_CHANNEL, "payload": payload},
+        )
+
+
+def _invalidate_committed(session: Session) -> None:
+    if session.in_nested_transaction():
+        return
+    tags = session.info.pop(_TAGS_KEY, None)
+    if tags:
+        invalidate_tags(cached_tags(tags))
+
+
+def _discard_rolled_back(session: Session, previous_transaction: SessionTransaction) -> None:
+    if previous_transaction.parent is None:
+        session.info.pop(_TAGS_KEY, None)
+
+
+def track_cache_tags(session: Session) -> None:
+    """Подписать сессию на сбор тегов и инвалидацию после commit (один раз)."""
+    if session.info.get(_TRACKED_KEY):
+        return
+    event.listen(session, "after_flush", _collect_flushed)
+    event.listen(session, "do_orm_execute", _collect_bulk)
+    event.listen(session, "before_commit", _notify)
+    event.listen(session, "after_commit", _invalidate_committed)
+    event.listen(session, "after_soft_rollback", _discard_rolled_back)
+    session.info[_TRACKED_KEY] = True
+
+
+class CacheInvalidationListener:
+    """
+    LISTEN на канал инвалидации в отдельном соединении (не из пула).
+
+    `ensure_listening` — задача PeriodicTask: подключается, если соединения
+    нет, и сбрасывает кэши (уведомления за время без соединения потеряны).
+    Ошибки подключения только логируются: следующая попытка — через интервал.
+    """
+
+    def __init__(self, dsn: str, channel: str, *, connect_timeout: float = 5.0) -> None:
+        self._dsn = dsn
+        self.channel = channel
+        self._connect_timeout = connect_timeout
+        self._conn: asyncpg.Connection | None = None
+
+    @property
+    def listening(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    async def ensure_listening(self) -> None:
+        if self.listening:
+            return
+        logger = structlog.get_logger(__name__)
+        try:
+            conn = await asyncpg.connect(self._dsn, timeout=self._connect_timeout)
+        except Exception as e:
+            logger.warning("cache_listener_connect_failed", error_type=type(e).__name__)
+            return
+        try:
+            await conn.add_listener(self.channel, self._on_notify)
+        except Exception as e:
+            conn.terminate()
+            logger.warning("cache_listener_connect_failed", error_type=type(e).__name__)
+            return
+        conn.add_termination_listener(self._on_terminated)
+        self._conn = conn
+        clear_caches()
+        logger.info("cache_listener_connected", channel=self.channel)
+
+    def _on_notify(self, connection: object, pid: int, channel: str, payload: str) -> None:
+        sender, _, tags = payload.partition(" ")
+        if sender == _SENDER:
+            return
+        notifications_received.inc()
+        invalidate_tags(tags.split())
+
+    def _on_terminated(self, connection: object) -> None:
+        self._conn = None
+        clear_caches()
+        structlog.get_logger(__name__).warning("cache_listener_disconnected")
+
+    async def aclose(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            conn.remove_termination_listener(self._on_terminated)
+            await conn.close()
+
+
+def create_invalidation_listener() -> CacheInvalidationListener:
+    """Слушатель на DATABASE_URL (asyncpg DSN без +asyncpg)."""
+    dsn = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+    return CacheInvalidationListener(
+        dsn.render_as_string(hide_password=False), settings.CACHE_INVALIDATION_CHANNEL
+    )
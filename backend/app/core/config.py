@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field, computed_field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -17,6 +19,18 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = Field(
         default="INFO", description="Logging level (DEBUG, INFO, WARNING, ERROR)"
     )
+    LOG_QUEUE_SIZE: int = Field(
+        default=10_000, description="Max log records waiting for the writer thread (excess dropped)"
+    )
+    LOG_REQUEST_SAMPLE_RATE: float = Field(
+        default=1.0,
+        ge=0.0,
+        le=1.0,
+        description="Share of fast 2xx request_finished events logged (errors/slow always logged)",
+    )
+    LOG_SLOW_REQUEST_MS: float = Field(
+        default=1000.0, description="Requests at least this slow are always logged"
+    )
 
     # === Сервер ===
     HOST: str = Field(default="0.0.0.0", description="Host for server startup")
@@ -29,9 +43,28 @@ class Settings(BaseSettings):
         description="Connection URL to PostgreSQL through asyncpg",
     )
 
-    @field_validator("DATABASE_URL", mode="before")
+    DB_POOL_SIZE: int = Field(default=20, ge=1, description="Persistent pool connections")
+    DB_MAX_OVERFLOW: int = Field(
+        default=10, ge=0, description="Connections opened above DB_POOL_SIZE at peak"
+    )
+    DB_POOL_TIMEOUT_SECONDS: float = Field(
+        default=5.0, gt=0, description="Wait for a pool connection before failing with 503"
+    )
+
+    DATABASE_REPLICA_URL: str | None = Field(
+        default=None,
+        description="Optional read replica for GET endpoints (get_read_uow); None = primary",
+    )
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = Field(
+        default=5.0, description="Replica lag above which reads fall back to the primary"
+    )
+    DATABASE_REPLICA_CHECK_SECONDS: float = Field(
+        default=5.0, description="How often the replica health/lag check runs"
+    )
+
+    @field_validator("DATABASE_URL", "DATABASE_REPLICA_URL", mode="before")
     @classmethod
-    def normalize_database_url(cls, v: str) -> str:
+    def normalize_database_url(cls, v: str | None) -> str | None:
         """
         Нормализуем DATABASE_URL для корректной работы SQLAlchemy с asyncpg.
 
@@ -62,15 +95,228 @@ class Settings(BaseSettings):
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(
         default=7, description="Lifetime of refresh token in days"
     )
+    REFRESH_TOKEN_RETENTION_DAYS: int = Field(
+        default=7,
+        description="Keep expired/revoked refresh tokens this long (audit) before purging",
+    )
+    REFRESH_TOKEN_PURGE_INTERVAL_SECONDS: float = Field(
+        default=3600.0, description="How often the refresh-token purge runs (0 = disabled)"
+    )
+    REFRESH_TOKEN_PURGE_BATCH_SIZE: int = Field(
+        default=5000, description="Rows deleted per purge transaction"
+    )
+    REFRESH_TOKEN_PURGE_MAX_BATCHES: int = Field(
+        default=100, description="Max purge batches per run"
+    )
     MAGIC_LINK_EXPIRE_MINUTES: int = Field(
         default=15, description="Lifetime of Magic Link token in minutes"
     )
+    MAGIC_LINK_PURGE_INTERVAL_SECONDS: float = Field(
+        default=600.0, description="How often expired Magic Link tokens are purged (0 = disabled)"
+    )
+    MAGIC_LINK_PURGE_BATCH_SIZE: int = Field(
+        default=5000, description="Magic Link tokens deleted per purge transaction"
+    )
+    MAGIC_LINK_PURGE_MAX_BATCHES: int = Field(
+        default=100, description="Max Magic Link purge batches per run"
+    )
     FRONTEND_URL: str = Field(
         default="http://localhost:3000", description="Frontend URL for Magic Link redirect"
     )
     RESEND_API_KEY: str | None = Field(
         default=None, description="Resend API key for sending emails (None = log link in dev)"
     )
+    ACCESS_TOKEN_CACHE_TTL_SECONDS: float = Field(
+        default=60.0,
+        description="Max time a verified access token is reused without re-verifying (0 = off)",
+    )
+    ACCESS_TOKEN_CACHE_MAX_SIZE: int = Field(
+        default=4096, description="Max verified access tokens kept per worker"
+    )
+    USER_CACHE_TTL_SECONDS: float = Field(
+        default=30.0,
+        description="TTL of the authenticated-user cache (0 = disabled)",
+    )
+    USER_CACHE_MAX_SIZE: int = Field(
+        default=10_000, description="Max users kept in the authenticated-user cache"
+    )
+    AUTH_TRUST_TOKEN_CLAIMS_FOR_READS: bool = Field(
+        default=False,
+        description="Read-only owner endpoints build the user from JWT claims, no DB/cache",
+    )
+    RESEND_API_BASE: str = Field(
+        default="https://api.resend.com",
+        description="Resend API base URL (override for a local stand-in provider)",
+    )
+    EMAIL_FROM: str = Field(
+        default="ZaFrame <onboarding@resend.dev>", description="Sender for outgoing emails"
+    )
+    EMAIL_HTTP_TIMEOUT_SECONDS: float = Field(
+        default=10.0, description="Timeout of one request to the email provider"
+    )
+
+    # === Email outbox (фоновая отправка) ===
+    EMAIL_OUTBOX_ENABLED: bool = Field(
+        default=True, description="Run the outbox sender in this process (lifespan)"
+    )
+    EMAIL_OUTBOX_POLL_SECONDS: float = Field(
+        default=2.0, description="Pause between outbox polls when the queue is drained"
+    )
+    EMAIL_OUTBOX_BATCH_SIZE: int = Field(default=50, description="Emails claimed per batch")
+    EMAIL_OUTBOX_CONCURRENCY: int = Field(
+        default=8, description="Max in-flight provider requests (also HTTP pool size)"
+    )
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = Field(
+        default=8, description="Attempts before an email is marked failed"
+    )
+    EMAIL_OUTBOX_BACKOFF_BASE_SECONDS: float = Field(
+        default=10.0, description="First retry delay; doubles with every attempt"
+    )
+    EMAIL_OUTBOX_BACKOFF_MAX_SECONDS: float = Field(
+        default=3600.0, description="Upper bound for the retry delay"
+    )
+
+    # === Metrics ===
+    METRICS_TOKEN: str | None = Field(
+        default=None, description="Bearer token required by GET /metrics (None = open)"
+    )
+
+    # === Query diagnostics ===
+    DB_DEBUG_HEADERS: bool = Field(
+        default=False, description="Add X-DB-Queries / X-DB-Time-Ms headers to responses"
+    )
+    DB_REPEATED_STATEMENT_THRESHOLD: int = Field(
+        default=5,
+        description="Warn when one statement runs this many times in a request (N+1; 0 = off)",
+    )
+    DB_SLOW_STATEMENT_MS: float = Field(
+        default=500.0, description="Log statements slower than this (ms, 0 = off)"
+    )
+    DB_SLOW_EXPLAIN_SAMPLE_RATE: float = Field(
+        default=0.0,
+        ge=0.0,
+        le=1.0,
+        description="Share of slow SELECTs re-run as EXPLAIN (ANALYZE, BUFFERS) (0 = off)",
+    )
+    DB_SLOW_EXPLAIN_TIMEOUT_MS: int = Field(
+        default=5000, ge=1, description="statement_timeout for the EXPLAIN ANALYZE capture"
+    )
+
+    # === Tracing ===
+    TRACE_SAMPLE_RATE: float = Field(
+        default=0.0, ge=0.0, le=1.0, description="Share of traces recorded (0 = tracing off)"
+    )
+    TRACE_EXPORTER: Literal["otlp-file", "log"] = Field(
+        default="otlp-file",
+        description="otlp-file: OTLP/JSON lines to TRACE_EXPORT_PATH; log: trace_span log events",
+    )
+    TRACE_EXPORT_PATH: str = Field(
+        default="traces.otlp.jsonl", description="File for the otlp-file trace exporter"
+    )
+    TRACE_EXPORT_QUEUE_SIZE: int = Field(
+        default=10000, ge=1, description="Finished spans buffered for export (excess is dropped)"
+    )
+
+    # === Admission control (per route class) ===
+    ADMISSION_CONTROL_ENABLED: bool = Field(
+        default=True, description="Per-route-class concurrency budgets with fast 503s"
+    )
+    ADMISSION_QUEUE_TIMEOUT_MS: float = Field(
+        default=250.0, gt=0, description="Wait for a slot in the class budget before 503"
+    )
+    ADMISSION_RETRY_AFTER_SECONDS: int = Field(
+        default=1, ge=0, description="Retry-After of admission and pool-timeout 503s"
+    )
+    ADMISSION_PUBLIC_READS_CONCURRENCY: int = Field(
+        default=12,
+        ge=1,
+        description="Concurrent requests admitted: public reads (GET catalog, search, slots)",
+    )
+    ADMISSION_PUBLIC_READS_STATEMENT_TIMEOUT_MS: int = Field(
+        default=3000,
+        ge=0,
+        description="Postgres statement_timeout: public reads (GET catalog, search, slots) (0 = none)",
+    )
+    ADMISSION_BOOKING_WRITES_CONCURRENCY: int = Field(
+        default=8, ge=1, description="Concurrent requests admitted: booking/payment writes"
+    )
+    ADMISSION_BOOKING_WRITES_STATEMENT_TIMEOUT_MS: int = Field(
+        default=10000,
+        ge=0,
+        description="Postgres statement_timeout: booking/payment writes (0 = none)",
+    )
+    ADMISSION_WEBHOOKS_CONCURRENCY: int = Field(
+        default=6, ge=1, description="Concurrent requests admitted: Stripe webhooks"
+    )
+    ADMISSION_WEBHOOKS_STATEMENT_TIMEOUT_MS: int = Field(
+        default=15000, ge=0, description="Postgres statement_timeout: Stripe webhooks (0 = none)"
+    )
+    ADMISSION_AUTH_CONCURRENCY: int = Field(
+        default=4, ge=1, description="Concurrent requests admitted: auth endpoints"
+    )
+    ADMISSION_AUTH_STATEMENT_TIMEOUT_MS: int = Field(
+        default=5000, ge=0, description="Postgres statement_timeout: auth endpoints (0 = none)"
+    )
+
+    # === Event-loop monitor ===
+    EVENT_LOOP_MONITOR_INTERVAL_MS: float = Field(
+        default=250.0, ge=0, description="Event-loop lag probe interval (0 = monitor off)"
+    )
+    EVENT_LOOP_BLOCK_THRESHOLD_MS: float = Field(
+        default=200.0, gt=0, description="Log the stack when one callback blocks the loop this long"
+    )
+
+    # === Startup warm-up ===
+    WARMUP_ENABLED: bool = Field(
+        default=True,
+        description="Warm pool, SQL cache and serializers at startup; /health/ready 503 until done",
+    )
+    WARMUP_POOL_CONNECTIONS: int = Field(
+        default=5, ge=0, description="Connections opened in parallel at startup (<= DB_POOL_SIZE)"
+    )
+    WARMUP_TIMEOUT_SECONDS: float = Field(
+        default=30.0, gt=0, description="Stop warming up after this long and report ready"
+    )
+
+    # === Application cache (app.core.cache) ===
+    CACHE_SHARED_URI: str = Field(
+        default="",
+        description=(
+            "Shared cache level: empty = per worker only, sqlite:///<path> = per host; "
+            "the file's directory must be owned by the app user and not writable by others"
+        ),
+    )
+    CACHE_NOTIFY_ENABLED: bool = Field(
+        default=True,
+        description="Broadcast invalidations via Postgres NOTIFY and LISTEN for other workers'",
+    )
+    CACHE_INVALIDATION_CHANNEL: str = Field(
+        default="cache_invalidation", description="LISTEN/NOTIFY channel for cache invalidation"
+    )
+    CACHE_LISTEN_CHECK_SECONDS: float = Field(
+        default=5.0, gt=0, description="How often a lost LISTEN connection is re-established"
+    )
+
+    # === Profiling (single requests, on demand) ===
+    PROFILING_ENABLED: bool = Field(
+        default=False, description="Install the profiling middleware (needs PROFILING_TOKEN)"
+    )
+    PROFILING_TOKEN: str | None = Field(
+        default=None, description="Requests with `X-Profile: <token>` are profiled"
+    )
+    PROFILING_DIR: str = Field(
+        default="profiles", description="Where CPU/allocation profiles are written"
+    )
+    PROFILING_SAMPLE_INTERVAL_MS: float = Field(
+        default=5.0, gt=0, description="Stack sampling interval of the CPU profile"
+    )
+
+    # === Rate limiting ===
+    RATE_LIMIT_STORAGE_URI: str = Field(
+        default="memory://",
+        description="Rate-limit counters: memory:// (per worker), sqlite:///<path> (per host), "
+        "redis://... (multi-host)",
+    )
 
     # === CORS ===
     # В env задаётся одна строка, через запятую: https://zeeframe.vercel.app или url1,url2
@@ -96,6 +342,10 @@ class Settings(BaseSettings):
     STRIPE_CURRENCY: str = Field(
         default="eur", description="Default currency for Stripe (eur for Ireland)"
     )
+    STRIPE_API_BASE: str | None = Field(
+        default=None,
+        description="Override Stripe API base URL (stripe-mock / local fake server in tests)",
+    )
 
     # === Bookings ===
     BOOKING_HOLD_MINUTES: int = Field(
@@ -105,6 +355,16 @@ class Settings(BaseSettings):
         description="WHY: pending bookings should expire to avoid locking capacity indefinitely",
     )
 
+    # === Archive (past slots + bookings → *_archive tables) ===
+    ARCHIVE_INTERVAL_SECONDS: float = Field(
+        default=3600.0, description="How often past slots are archived (0 = disabled)"
+    )
+    ARCHIVE_AFTER_DAYS: int = Field(
+        default=90, ge=1, description="Archive slots that ended more than N days ago"
+    )
+    ARCHIVE_BATCH_SIZE: int = Field(default=500, ge=1, description="Slots moved per transaction")
+    ARCHIVE_MAX_BATCHES: int = Field(default=100, description="Max archive batches per run")
+
     # === Pydantic Settings конфигурация ===
     model_config = SettingsConfigDict(
         env_file=".env",  # Load from .env file
@@ -11,18 +11,80 @@
 - Использует create_async_engine вместо create_engine
 - AsyncSession вместо Session для всех операций с БД
 
+Чтение (get_read_uow):
+- Сессии в READ ONLY транзакции (postgresql_readonly) — случайная запись в GET упадёт
+- Если задан DATABASE_REPLICA_URL, чтение идёт на реплику, пока она доступна и
+  отстаёт не больше DATABASE_REPLICA_MAX_LAG_SECONDS (ReplicaMonitor в lifespan),
+  иначе — на primary
+
+Метрики пула (GET /metrics):
+- db_pool_* — занято / overflow / размер пула, читаются при scrape
+- db_pool_wait_seconds — сколько запрос ждал соединение (очередь пула + connect)
+- каждый statement и его время пишутся в QueryStats текущего HTTP-запроса
+  (X-DB-Queries, лог request_finished, предупреждение о повторах — N+1)
+- выдача соединения — span db.pool.checkout в трассировке запроса (app.core.tracing)
+- statements дольше DB_SLOW_STATEMENT_MS пишутся в лог db_slow_statement, часть
+  SELECT — с планом EXPLAIN (ANALYZE, BUFFERS) (app.core.slow_queries)
+
+Пул и таймауты:
+- размер пула и время ожидания соединения — DB_POOL_SIZE / DB_MAX_OVERFLOW /
+  DB_POOL_TIMEOUT_SECONDS; исчерпанный пул — быстрый 503 (обработчик в main.py),
+  а не 30 секунд ожидания
+- statement_timeout_var — statement_timeout класса маршрута текущего запроса
+  (AdmissionControlMiddleware); каждая транзакция в запросе начинается с
+  SET LOCAL statement_timeout
+
 Почему DeclarativeBase:
 - Новая база для моделей в SQLAlchemy 2.0 (вместо declarative_base)
 - Поддерживает type hints через Mapped и mapped_column
 - Совместим с async операциями
 """
 
+import time
 from collections.abc import AsyncGenerator
+from contextvars import ContextVar
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
+import structlog
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import DeclarativeBase, Session, SessionTransaction
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import gauge, histogram, record_statement, record_statement_time
+from app.core.slow_queries import SlowStatementLog
+from app.core.tracing import span
+
+db_pool_wait = histogram(
+    "db_pool_wait_seconds",
+    "Time to get a connection from the pool (queue wait + new connection)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+    labelnames=("pool",),
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool, измеряющий время выдачи соединения (db_pool_wait_seconds)."""
+
+    pool_label = "primary"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            with span("db.pool.checkout", root=False, pool=self.pool_label):
+                return super()._do_get()
+        finally:
+            db_pool_wait.observe(time.perf_counter() - started, self.pool_label)
+
+
+class ReplicaInstrumentedQueuePool(InstrumentedQueuePool):
+    pool_label = "replica"
+
 
 # === Engine: пул соединений к БД ===
 # create_async_engine создаёт асинхронный engine с connection pooling.
@@ -31,11 +93,12 @@ from app.core.config import settings
 engine = create_async_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Проверка соединений перед использованием
-    pool_size=20,  # Увеличиваем количество постоянных соединений
-    max_overflow=10,  # Сколько можно открыть сверх лимита в пике
-    pool_timeout=30,  # Сколько ждать свободного слота
+    pool_size=settings.DB_POOL_SIZE,  # Постоянные соединения
+    max_overflow=settings.DB_MAX_OVERFLOW,  # Сколько можно открыть сверх лимита в пике
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,  # Сколько ждать свободного слота
     pool_recycle=3600,  # Пересоздавать соединение раз в час
     echo=settings.DEBUG,  # Логирование SQL в режиме отладки
+    poolclass=InstrumentedQueuePool,  # + метрика ожидания соединения
 )
 
 
@@ -50,6 +113,180 @@ async_session_maker = async_sessionmaker(
 )
 
 
+# === Чтение: READ ONLY сессии, опционально на реплике ===
+# execution_options(postgresql_readonly=True) делит пул с основным engine,
+# но каждая транзакция открывается как BEGIN READ ONLY.
+read_session_maker = async_sessionmaker(
+    engine.execution_options(postgresql_readonly=True),
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+replica_engine: AsyncEngine | None = None
+replica_session_maker: async_sessionmaker[AsyncSession] | None = None
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_async_engine(
+        settings.DATABASE_REPLICA_URL,
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=3600,
+        echo=settings.DEBUG,
+        poolclass=ReplicaInstrumentedQueuePool,
+    )
+    replica_session_maker = async_sessionmaker(
+        replica_engine.execution_options(postgresql_readonly=True),
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
+
+
+# statement_timeout (мс) для транзакций текущего запроса; None — таймаут сервера.
+statement_timeout_var: ContextVar[int | None] = ContextVar("statement_timeout", default=None)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(
+    _session: Session, _transaction: SessionTransaction, connection
+) -> None:
+    timeout_ms = statement_timeout_var.get()
+    if timeout_ms is not None:
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+_STATEMENT_STARTED = "query_started_at"
+
+
+def _before_cursor_execute(conn, _cursor, statement, _params, _context, _executemany) -> None:
+    # Statements on one connection run one at a time — a single slot is enough.
+    conn.info[_STATEMENT_STARTED] = time.perf_counter()
+    record_statement(statement)
+
+
+def _instrument(eng: AsyncEngine) -> SlowStatementLog:
+    """Счётчик statements запроса + журнал медленных statements для engine."""
+    slow_log = SlowStatementLog(
+        eng,
+        threshold_ms=settings.DB_SLOW_STATEMENT_MS,
+        explain_sample_rate=settings.DB_SLOW_EXPLAIN_SAMPLE_RATE,
+        explain_timeout_ms=settings.DB_SLOW_EXPLAIN_TIMEOUT_MS,
+    )
+
+    def after_cursor_execute(conn, _cursor, statement, params, _context, executemany) -> None:
+        started = conn.info.pop(_STATEMENT_STARTED, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        record_statement_time(elapsed)
+        slow_log.observe(statement, params, elapsed, executemany=executemany)
+
+    event.listen(eng.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(eng.sync_engine, "after_cursor_execute", after_cursor_execute)
+    return slow_log
+
+
+def _pool_stats() -> dict[tuple[str, ...], dict[str, float]]:
+    engines = {"primary": engine}
+    if replica_engine is not None:
+        engines["replica"] = replica_engine
+    stats = {}
+    for label, eng in engines.items():
+        pool = eng.sync_engine.pool
+        stats[(label,)] = {
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+        }
+    return stats
+
+
+slow_statement_log = _instrument(engine)
+replica_slow_statement_log = _instrument(replica_engine) if replica_engine is not None else None
+
+for _stat, _description in (
+    ("checked_out", "Connections currently checked out of the pool"),
+    ("overflow", "Connections open above pool_size"),
+    ("size", "Configured pool_size"),
+    ("checked_in", "Idle connections in the pool"),
+):
+    gauge(
+        f"db_pool_{_stat}",
+        _description,
+        lambda stat=_stat: {labels: values[stat] for labels, values in _pool_stats().items()},
+        labelnames=("pool",),
+    )
+
+# Отставание реплики в секундах. 0 — реплика догнала primary (принятый WAL
+# проигран) или это не реплика вовсе (например, второй локальный Postgres).
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+class ReplicaMonitor:
+    """
+    Состояние реплики для маршрутизации чтения.
+
+    check() вызывается периодически (PeriodicTask в lifespan); запросы только
+    читают `healthy`, без обращения к БД. До первой успешной проверки чтение
+    идёт на primary.
+    """
+
+    def __init__(self, replica: AsyncEngine | None, *, max_lag_seconds: float) -> None:
+        self._replica = replica
+        self.max_lag_seconds = max_lag_seconds
+        self.healthy = False
+        self.lag_seconds: float | None = None
+        self.checked_at: float | None = None
+
+    @property
+    def configured(self) -> bool:
+        return self._replica is not None
+
+    async def check(self) -> None:
+        """Измерить отставание реплики и обновить `healthy`."""
+        if self._replica is None:
+            return
+        logger = structlog.get_logger(__name__)
+        was_healthy = self.healthy
+        try:
+            async with self._replica.connect() as conn:
+                lag = float((await conn.execute(REPLICA_LAG_SQL)).scalar_one() or 0)
+        except Exception as e:
+            self.lag_seconds = None
+            self.healthy = False
+            if was_healthy:
+                logger.warning("db_replica_unavailable", error_type=type(e).__name__)
+        else:
+            self.lag_seconds = lag
+            self.healthy = lag <= self.max_lag_seconds
+            if was_healthy and not self.healthy:
+                logger.warning("db_replica_lagging", lag_seconds=round(lag, 3))
+        if self.healthy and not was_healthy:
+            logger.info("db_replica_in_use", lag_seconds=self.lag_seconds)
+        self.checked_at = time.monotonic()
+
+
+replica_monitor = ReplicaMonitor(
+    replica_engine, max_lag_seconds=settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+)
+
+
+def get_read_session_maker() -> async_sessionmaker[AsyncSession]:
+    """Фабрика сессий для чтения: реплика, если она здорова, иначе primary."""
+    if replica_session_maker is not None and replica_monitor.healthy:
+        return replica_session_maker
+    return read_session_maker
+
+
 # === Base для моделей ===
 # DeclarativeBase — база для всех ORM моделей.
 # Все модели будут наследоваться от этого класса.
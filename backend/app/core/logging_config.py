@@ -10,15 +10,31 @@ Also enforces required fields:
 - `level`
 - `service`
 - `request_id` (defaults to `unknown` when not provided)
+
+Log I/O is off the event loop: the request path only builds the event dict
+and puts the record on a bounded queue (`QueueHandler`); rendering and
+writing to stdout happen in a `QueueListener` background thread. When the
+queue is full the record is dropped (counted in `log_records_dropped_total`)
+rather than blocking the request.
 """
 
 from __future__ import annotations
 
 import logging
+import logging.handlers
+import queue
+import sys
 
 import structlog
 
 from app.core.config import settings
+from app.core.metrics import counter
+
+log_records_dropped = counter(
+    "log_records_dropped_total", "Log records dropped because the log queue was full"
+)
+
+_listener: logging.handlers.QueueListener | None = None
 
 
 def _add_service(
@@ -40,27 +56,64 @@ def _ensure_request_id(
     return event_dict
 
 
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that passes records through unformatted and never blocks.
+
+    The queue is in-process, so records need no pickling-safe `prepare()`:
+    structlog's event dict travels as is and is rendered by the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            log_records_dropped.inc()
+
+
 def setup_logging() -> None:
-    """Configure stdlib + structlog for the whole app."""
+    """Configure stdlib + structlog for the whole app and start the log writer thread."""
+    global _listener
+    shutdown_logging()
     level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
 
-    structlog.stdlib.recreate_defaults(log_level=level)
-
     if settings.DEBUG:
         renderer = structlog.dev.ConsoleRenderer(colors=False)
     else:
         renderer = structlog.processors.JSONRenderer()
 
+    shared_processors = [
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
+        structlog.processors.add_log_level,
+        _add_service,
+        _ensure_request_id,
+    ]
+
+    # Runs in the listener thread: final rendering for structlog and stdlib records.
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(
+        structlog.stdlib.ProcessorFormatter(
+            foreign_pre_chain=shared_processors,
+            processors=[structlog.stdlib.ProcessorFormatter.remove_processors_meta, renderer],
+        )
+    )
+    log_queue: queue.Queue[logging.LogRecord] = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    root.handlers = [_NonBlockingQueueHandler(log_queue)]
+    root.setLevel(level)
+    _listener = logging.handlers.QueueListener(log_queue, output)
+    _listener.start()
+
     structlog.configure(
         processors=[
             structlog.contextvars.merge_contextvars,
-            structlog.processors.TimeStamper(fmt="iso", utc=True),
-            structlog.processors.add_log_level,
-            _add_service,
-            _ensure_request_id,
+            *shared_processors,
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
-            renderer,
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -70,3 +123,11 @@ def setup_logging() -> None:
 
     # Reduce noise from uvicorn access logs.
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
+
+def shutdown_logging() -> None:
+    """Stop the log writer thread after flushing queued records (no-op if not started)."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,117 @@
+"""
+Event-loop lag monitor and blocking-call watchdog.
+
+Started in the lifespan (`EVENT_LOOP_MONITOR_INTERVAL_MS` > 0):
+- a probe task sleeps `interval` and records how late it woke up in
+  `event_loop_lag_seconds` — time other callbacks kept the loop busy;
+- a watchdog thread notices when the probe has not run for longer than
+  `block_threshold`: one callback is blocking the loop right now. It logs
+  `event_loop_blocked` with the loop thread's current stack and the request_id
+  of the running task (read from the task's context), once per blocking
+  episode, and counts it in `event_loop_blocked_total`.
+
+The stack points at the blocking call itself (sync SDK call, CPU-heavy loop,
+`time.sleep`), not at the place the lag was noticed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import sys
+import threading
+import time
+import traceback
+
+import structlog
+
+from app.core.metrics import counter, histogram
+from app.core.middleware.logging_middleware import request_id_var
+
+event_loop_lag = histogram(
+    "event_loop_lag_seconds",
+    "How late the event-loop probe woke up (time the loop was busy)",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+event_loop_blocked = counter(
+    "event_loop_blocked_total", "Times one callback blocked the event loop past the threshold"
+)
+
+STACK_LIMIT = 40
+
+
+class LoopMonitor:
+    """Probe task + watchdog thread for the running event loop."""
+
+    def __init__(self, *, interval: float, block_threshold: float) -> None:
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.last_lag: float | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._heartbeat = time.monotonic()
+        self._task: asyncio.Task[None] | None = None
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start on the running loop (call from the loop thread)."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._probe(), name="event_loop_monitor")
+        self._watchdog = threading.Thread(
+            target=self._watch, name="event-loop-watchdog", daemon=True
+        )
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _probe(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self.last_lag = max(0.0, now - expected)
+            event_loop_lag.observe(self.last_lag)
+            self._heartbeat = now
+
+    def _watch(self) -> None:
+        reported_beat: float | None = None
+        check_every = min(self.interval, self.block_threshold) / 2
+        while not self._stop.wait(check_every):
+            beat = self._heartbeat
+            blocked_for = time.monotonic() - beat - self.interval
+            if blocked_for >= self.block_threshold and beat != reported_beat:
+                reported_beat = beat
+                self._report(blocked_for)
+
+    def _running_request_id(self) -> str | None:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            return None
+        if task is None:
+            return None
+        return task.get_context().get(request_id_var)
+
+    def _report(self, blocked_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id or 0)
+        stack = traceback.format_stack(frame, limit=STACK_LIMIT) if frame is not None else []
+        event_loop_blocked.inc()
+        structlog.get_logger(__name__).warning(
+            "event_loop_blocked",
+            blocked_ms=round(blocked_for * 1000, 1),
+            stack="".join(stack),
+            request_id=self._running_request_id(),
+        )
@@ -0,0 +1,318 @@
+"""
+In-process metrics: cache hit rates, counters, histograms and gauges.
+
+Caches register themselves at import time; counters, histograms and gauges are
+created on first use via `counter(name)`, `labeled_counter(...)`, `histogram(...)`
+and `gauge(...)`. Snapshots (`cache_stats()`, `counter_values()`) are exposed in
+`/health/ready`; everything is rendered in the Prometheus text format by
+`render_prometheus()` for `GET /metrics`.
+
+Recording is a dict lookup plus an integer increment (histograms: one bisect
+over the bucket bounds); cumulative buckets are computed only when scraped.
+Gauges are read lazily at scrape time. Values are per process: with several
+uvicorn workers each worker reports its own numbers.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+from collections.abc import Callable, Iterable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from app.core.ttl_cache import CacheStats
+
+type Labels = tuple[str, ...]
+
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+QUERY_COUNT_BUCKETS: tuple[float, ...] = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+
+class Cache(Protocol):
+    """Anything with hit/miss stats and a size (TTLCache, TagCache)."""
+
+    @property
+    def stats(self) -> CacheStats: ...
+
+    def __len__(self) -> int: ...
+
+
+_caches: dict[str, Cache] = {}
+
+
+@dataclass
+class Counter:
+    """Monotonic counter (per process, reset on restart)."""
+
+    name: str
+    description: str = ""
+    value: int = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+@dataclass
+class LabeledCounter:
+    """Monotonic counter with one value per label combination."""
+
+    name: str
+    description: str
+    labelnames: Labels
+    values: dict[Labels, int] = field(default_factory=dict)
+
+    def inc(self, *labels: str, amount: int = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+
+@dataclass
+class _HistogramSeries:
+    counts: list[int]
+    sum: float = 0.0
+    # Rendered line prefixes (label sets never change) — built on the first scrape.
+    prefixes: tuple[list[str], str, str] | None = None
+
+
+@dataclass
+class Histogram:
+    """Fixed-bucket histogram (Prometheus semantics: bucket `le` is inclusive)."""
+
+    name: str
+    description: str
+    buckets: tuple[float, ...]
+    labelnames: Labels = ()
+    series: dict[Labels, _HistogramSeries] = field(default_factory=dict)
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = _HistogramSeries([0] * (len(self.buckets) + 1))
+        series.counts[bisect.bisect_left(self.buckets, value)] += 1
+        series.sum += value
+
+
+@dataclass
+class Gauge:
+    """Value read at scrape time: `read()` returns {label values: value}."""
+
+    name: str
+    description: str
+    labelnames: Labels
+    read: Callable[[], dict[Labels, float]]
+
+
+_counters: dict[str, Counter] = {}
+_labeled_counters: dict[str, LabeledCounter] = {}
+_histograms: dict[str, Histogram] = {}
+_gauges: dict[str, Gauge] = {}
+
+
+def counter(name: str, description: str = "") -> Counter:
+    """Get or create a counter by name."""
+    existing = _counters.get(name)
+    if existing is None:
+        existing = _counters[name] = Counter(name, description)
+    return existing
+
+
+def labeled_counter(name: str, description: str, labelnames: Iterable[str]) -> LabeledCounter:
+    """Get or create a labeled counter by name."""
+    existing = _labeled_counters.get(name)
+    if existing is None:
+        existing = _labeled_counters[name] = LabeledCounter(name, description, tuple(labelnames))
+    return existing
+
+
+def histogram(
+    name: str,
+    description: str,
+    *,
+    buckets: Iterable[float] = LATENCY_BUCKETS,
+    labelnames: Iterable[str] = (),
+) -> Histogram:
+    """Get or create a histogram by name."""
+    existing = _histograms.get(name)
+    if existing is None:
+        existing = _histograms[name] = Histogram(
+            name, description, tuple(sorted(buckets)), tuple(labelnames)
+        )
+    return existing
+
+
+def gauge(
+    name: str,
+    description: str,
+    read: Callable[[], dict[Labels, float]],
+    *,
+    labelnames: Iterable[str] = (),
+) -> Gauge:
+    """Register (or replace) a gauge read lazily at scrape time."""
+    _gauges[name] = Gauge(name, description, tuple(labelnames), read)
+    return _gauges[name]
+
+
+def counter_values() -> dict[str, int]:
+    """Snapshot of all unlabeled counters."""
+    return {name: c.value for name, c in sorted(_counters.items())}
+
+
+def register_cache(name: str, cache: Cache) -> None:
+    """Register a cache under a stable name (re-registration replaces it)."""
+    _caches[name] = cache
+
+
+def cache_stats() -> dict[str, dict[str, float | int]]:
+    """Snapshot of hits/misses/evictions/hit_rate/size per registered cache."""
+    return {
+        name: {
+            "hits": cache.stats.hits,
+            "misses": cache.stats.misses,
+            "evictions": cache.stats.evictions,
+            "hit_rate": round(cache.stats.hit_rate, 4),
+            "size": len(cache),
+        }
+        for name, cache in sorted(_caches.items())
+    }
+
+
+# === Per-request DB statements ===
+# The request middleware sets a fresh QueryStats; the engine's cursor-execute
+# listeners (app.core.database) record into it. SQLAlchemy runs the sync part
+# of async calls in a greenlet sharing the task's context, so the stats object
+# is visible there.
+@dataclass
+class QueryStats:
+    """Statements executed during one request: count, DB time and shapes."""
+
+    count: int = 0
+    seconds: float = 0.0
+    # Parameterized SQL text -> executions; the same text many times is an N+1.
+    statements: dict[str, int] = field(default_factory=dict)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements executed at least `threshold` times, most frequent first."""
+        if threshold <= 0 or self.count < threshold:
+            return []
+        found = [(sql, n) for sql, n in self.statements.items() if n >= threshold]
+        return sorted(found, key=lambda item: item[1], reverse=True)
+
+
+query_stats_var: ContextVar[QueryStats | None] = ContextVar("db_query_stats", default=None)
+
+
+def record_statement(statement: str) -> None:
+    """Count one statement against the current request (no-op outside requests)."""
+    current = query_stats_var.get()
+    if current is not None:
+        current.count += 1
+        current.statements[statement] = current.statements.get(statement, 0) + 1
+
+
+def record_statement_time(seconds: float) -> None:
+    """Add DB time of one statement to the current request."""
+    current = query_stats_var.get()
+    if current is not None:
+        current.seconds += seconds
+
+
+# === Request metrics (recorded by RequestLoggingMiddleware) ===
+http_request_duration = histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    labelnames=("method", "route", "status"),
+)
+http_request_db_seconds = histogram(
+    "http_request_db_seconds",
+    "Time spent executing DB statements per HTTP request",
+    labelnames=("method", "route"),
+)
+http_request_db_queries = histogram(
+    "http_request_db_queries",
+    "DB statements executed per HTTP request",
+    buckets=QUERY_COUNT_BUCKETS,
+    labelnames=("method", "route"),
+)
+
+
+# === Prometheus text exposition ===
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: Labels, values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _header(lines: list[str], name: str, description: str, kind: str) -> None:
+    lines.append(f"# HELP {name} {description}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _histogram_prefixes(h: Histogram, values: Labels) -> tuple[list[str], str, str]:
+    buckets = [
+        f"{h.name}_bucket{_labels(h.labelnames, values, f'le="{_number(bound)}"')} "
+        for bound in (*h.buckets, math.inf)
+    ]
+    labels = _labels(h.labelnames, values)
+    return buckets, f"{h.name}_sum{labels} ", f"{h.name}_count{labels} "
+
+
+def render_prometheus() -> str:
+    """All metrics of this process in the Prometheus text format (version 0.0.4)."""
+    lines: list[str] = []
+    for c in sorted(_counters.values(), key=lambda c: c.name):
+        _header(lines, c.name, c.description, "counter")
+        lines.append(f"{c.name} {c.value}")
+    for lc in sorted(_labeled_counters.values(), key=lambda c: c.name):
+        _header(lines, lc.name, lc.description, "counter")
+        for values, value in sorted(lc.values.items()):
+            lines.append(f"{lc.name}{_labels(lc.labelnames, values)} {value}")
+    for h in sorted(_histograms.values(), key=lambda h: h.name):
+        _header(lines, h.name, h.description, "histogram")
+        for values, series in sorted(h.series.items()):
+            if series.prefixes is None:
+                series.prefixes = _histogram_prefixes(h, values)
+            buckets, sum_prefix, count_prefix = series.prefixes
+            cumulative = 0
+            for prefix, count in zip(buckets, series.counts, strict=True):
+                cumulative += count
+                lines.append(f"{prefix}{cumulative}")
+            lines.append(f"{sum_prefix}{_number(series.sum)}")
+            lines.append(f"{count_prefix}{cumulative}")
+    for g in sorted(_gauges.values(), key=lambda g: g.name):
+        _header(lines, g.name, g.description, "gauge")
+        for values, value in sorted(g.read().items()):
+            lines.append(f"{g.name}{_labels(g.labelnames, values)} {_number(value)}")
+    if _caches:
+        for suffix, attr in (("hits", "hits"), ("misses", "misses"), ("evictions", "evictions")):
+            name = f"cache_{suffix}_total"
+            _header(lines, name, f"In-process cache {suffix}", "counter")
+            for cache_name, cache in sorted(_caches.items()):
+                lines.append(f'{name}{{cache="{cache_name}"}} {getattr(cache.stats, attr)}')
+        _header(lines, "cache_size", "Entries in the in-process cache", "gauge")
+        for cache_name, cache in sorted(_caches.items()):
+            lines.append(f'cache_size{{cache="{cache_name}"}} {len(cache)}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,165 @@
+"""Admission control: per-route-class concurrency budgets with fast 503s.
+
+Every HTTP request is put into one route class:
+- `webhooks` — `/webhooks/...` (Stripe);
+- `auth` — `/api/v1/auth/...`;
+- `public_reads` — other GET/HEAD/OPTIONS requests (catalog, search, slots);
+- `booking_writes` — other writes (bookings, payments, services...).
+
+Health probes and `/metrics` are not admission-controlled.
+
+Each class has its own concurrency budget. A request over the budget waits at
+most `queue_timeout` for a slot, then gets `503` with `Retry-After` instead of
+queueing on the DB pool for `pool_timeout` seconds. Budgets are sized so their
+sum fits the pool (`DB_POOL_SIZE + DB_MAX_OVERFLOW`): a burst of searches
+exhausts the `public_reads` budget, not the connections bookings and webhooks
+need.
+
+While an admitted request runs, its class's `statement_timeout` is in effect
+for every transaction it opens (`statement_timeout_var`, applied with
+`SET LOCAL` by app.core.database), so one slow search cannot hold a connection
+for long either.
+
+Metrics: `admission_in_flight{route_class}` and
+`admission_rejected_total{route_class}`.
+"""
+
+import asyncio
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+import structlog
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.database import statement_timeout_var
+from app.core.metrics import gauge, labeled_counter
+from app.core.middleware.logging_middleware import current_request_id
+
+PUBLIC_READS = "public_reads"
+BOOKING_WRITES = "booking_writes"
+WEBHOOKS = "webhooks"
+AUTH = "auth"
+
+EXEMPT_PATHS = frozenset({"/", "/api/v1/", "/metrics"})
+EXEMPT_PREFIXES = ("/health", "/api/v1/health")
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+admission_rejected = labeled_counter(
+    "admission_rejected_total",
+    "Requests rejected with 503 because their route class budget was full",
+    ("route_class",),
+)
+
+
+@dataclass(frozen=True, slots=True)
+class RouteClass:
+    """Concurrency budget and Postgres statement_timeout of one route class."""
+
+    max_concurrency: int
+    statement_timeout_ms: int
+
+
+def classify(method: str, path: str) -> str | None:
+    """Route class of a request (None: not admission-controlled)."""
+    if path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES):
+        return None
+    if path.startswith("/webhooks"):
+        return WEBHOOKS
+    if path.startswith("/api/v1/auth"):
+        return AUTH
+    if method in READ_METHODS:
+        return PUBLIC_READS
+    return BOOKING_WRITES
+
+
+class AdmissionControlMiddleware:
+    """
+    Reject requests over their route class budget with a fast 503.
+
+    Must run inside RequestLoggingMiddleware (add it before) so rejections are
+    logged and carry `X-Request-ID`.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        classes: Mapping[str, RouteClass],
+        queue_timeout: float,
+        retry_after_seconds: int = 1,
+    ) -> None:
+        self.app = app
+        self.classes = dict(classes)
+        self.queue_timeout = queue_timeout
+        self.retry_after_seconds = retry_after_seconds
+        self._slots = {name: asyncio.Semaphore(c.max_concurrency) for name, c in classes.items()}
+        self._admitted = dict.fromkeys(self.classes, 0)
+        gauge(
+            "admission_in_flight",
+            "Requests currently admitted, by route class",
+            self._in_flight,
+            labelnames=("route_class",),
+        )
+
+    def _in_flight(self) -> dict[tuple[str, ...], float]:
+        return {(name,): count for name, count in self._admitted.items()}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        name = classify(scope["method"], scope["path"])
+        if name not in self._slots:
+            await self.app(scope, receive, send)
+            return
+
+        slots = self._slots[name]
+        if slots.locked():
+            try:
+                async with asyncio.timeout(self.queue_timeout):
+                    await slots.acquire()
+            except TimeoutError:
+                await self._reject(scope, send, name)
+                return
+        else:
+            await slots.acquire()
+        self._admitted[name] += 1
+        token = statement_timeout_var.set(self.classes[name].statement_timeout_ms)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            statement_timeout_var.reset(token)
+            self._admitted[name] -= 1
+            slots.release()
+
+    async def _reject(self, scope: Scope, send: Send, name: str) -> None:
+        admission_rejected.inc(name)
+        request_id = current_request_id()
+        structlog.get_logger(__name__).warning(
+            "admission_rejected",
+            route_class=name,
+            method=scope["method"],
+            path=scope["path"],
+            request_id=request_id,
+        )
+        body = {
+            "type": "overloaded",
+            "title": "Service Unavailable",
+            "status": 503,
+            "detail": "Server is busy. Please retry shortly.",
+            **({"request_id": request_id} if request_id else {}),
+        }
+        payload = json.dumps(body).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(payload)).encode()),
+                    (b"retry-after", str(self.retry_after_seconds).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": payload})
@@ -1,68 +1,208 @@
 """Request logging middleware.
 
-Adds `X-Request-ID` to every request/response and logs structured request
-completion events via `structlog`.
+Adds `X-Request-ID` to every request/response, baseline security headers to
+every response, and logs structured request completion events via `structlog`.
+
+Pure ASGI (not `BaseHTTPMiddleware`): one pass over the `send` channel, no
+extra task or memory stream per request, streaming responses pass through
+unbuffered.
+
+Every request is also recorded in the request metrics (app.core.metrics):
+latency by route template and status, and DB statements per request. The
+route label is the matched template (`/api/v1/studios/{studio_id}`), or
+`unmatched` for 404s on unknown paths, so label cardinality stays bounded.
+
+DB statements are counted per request (count, DB time, repeated statement
+shapes). With `db_debug_headers` the response carries `X-DB-Queries` and
+`X-DB-Time-Ms` (statements executed before the response started); a
+statement repeated `repeated_statement_threshold` times in one request is
+logged as `db_repeated_statement` — usually an N+1 that slipped in.
+
+Fast successful (2xx) requests are logged with probability `sample_rate`
+(the event carries `sample_rate` so counts can be re-weighted); errors,
+401/403/429 and requests slower than `slow_request_ms` are always logged.
 """
 
+import random
 import time
 import uuid
+from contextvars import ContextVar
 
 import structlog
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    QueryStats,
+    http_request_db_queries,
+    http_request_db_seconds,
+    http_request_duration,
+    query_stats_var,
+)
 
 REQUEST_ID_HEADER = "X-Request-ID"
+DB_QUERIES_HEADER = "X-DB-Queries"
+DB_TIME_HEADER = "X-DB-Time-Ms"
 REQUEST_ID_STATE_KEY = "request_id"
 USER_ID_STATE_KEY = "user_id"
 
+SECURITY_HEADERS: tuple[tuple[str, str], ...] = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("Referrer-Policy", "strict-origin-when-cross-origin"),
+)
+
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def current_request_id() -> str | None:
+    """Request id of the request being handled in this context (None outside requests)."""
+    return request_id_var.get()
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Path template of the matched route (`unmatched` if routing found nothing).
+
+    The route's own `path_format` plus the prefix it was included under.
+    `path_format` of a route from an included router lacks the router prefix,
+    so the prefix is the leading part of the request path that the route's
+    segments do not cover (a `{name:path}` value spans several segments).
+    """
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return "unmatched"
+    params = (scope.get("path_params") or {}).values()
+    covered = template.count("/") + sum(str(v).count("/") for v in params)
+    segments = scope["path"].split("/")
+    return "/".join(segments[: len(segments) - covered]) + template
+
 
-def _get_request_id(request: Request) -> str:
+def _get_request_id(scope: Scope) -> str:
     """Read `X-Request-ID` from headers or generate a new one."""
-    raw = request.headers.get(REQUEST_ID_HEADER)
-    if raw and raw.strip():
-        return raw.strip()
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            raw = value.decode("latin-1").strip()
+            if raw:
+                return raw
+            break
     return str(uuid.uuid4())
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
+class RequestLoggingMiddleware:
     """
-    Add `request_id` and log each HTTP request after processing.
+    Add `request_id`, security headers and log HTTP requests after processing.
 
     Expects `request.state.user_id` to be optionally set by auth dependencies.
+    An exception escaping the app is logged as status 500 and re-raised.
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        logger = structlog.get_logger(__name__)
-        request_id = _get_request_id(request)
-        setattr(request.state, REQUEST_ID_STATE_KEY, request_id)
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        sample_rate: float = 1.0,
+        slow_request_ms: float = 1000.0,
+        db_debug_headers: bool = False,
+        repeated_statement_threshold: int = 0,
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_request_ms = slow_request_ms
+        self.db_debug_headers = db_debug_headers
+        self.repeated_statement_threshold = repeated_statement_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _get_request_id(scope)
+        state = scope.setdefault("state", {})
+        state[REQUEST_ID_STATE_KEY] = request_id
         start = time.perf_counter()
+        status = 500
+        queries = QueryStats()
 
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.setdefault(REQUEST_ID_HEADER, request_id)
+                for name, value in SECURITY_HEADERS:
+                    headers.setdefault(name, value)
+                if self.db_debug_headers:
+                    headers[DB_QUERIES_HEADER] = str(queries.count)
+                    headers[DB_TIME_HEADER] = f"{queries.seconds * 1000:.1f}"
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        queries_token = query_stats_var.set(queries)
         structlog.contextvars.bind_contextvars(request_id=request_id)
         try:
-            response = await call_next(request)
-            duration_ms = (time.perf_counter() - start) * 1000
-            status = response.status_code
-            user_id = getattr(request.state, USER_ID_STATE_KEY, None)
-
-            common_fields = {
-                "method": request.method,
-                "path": request.url.path,
-                "status": status,
-                "duration_ms": duration_ms,
-                "request_id": request_id,
-                "user_id": user_id,
-            }
-            event = "request_finished"
-            if status >= 500:
-                logger.error(event, **common_fields)
-            elif status in (401, 403, 429):
-                logger.warning(event, **common_fields)
-            else:
-                logger.info(event, **common_fields)
-
-            if REQUEST_ID_HEADER not in response.headers:
-                response.headers[REQUEST_ID_HEADER] = request_id
-            return response
+            await self.app(scope, receive, send_wrapper)
         finally:
+            duration = time.perf_counter() - start
+            route = route_template(scope)
+            http_request_duration.observe(duration, scope["method"], route, str(status))
+            http_request_db_queries.observe(queries.count, scope["method"], route)
+            http_request_db_seconds.observe(queries.seconds, scope["method"], route)
+            self._warn_repeated(scope, route, queries)
+            self._log(scope, state, status, request_id, duration * 1000, queries)
             structlog.contextvars.clear_contextvars()
+            query_stats_var.reset(queries_token)
+            request_id_var.reset(token)
+
+    def _warn_repeated(self, scope: Scope, route: str, queries: QueryStats) -> None:
+        repeated = queries.repeated(self.repeated_statement_threshold)
+        if not repeated:
+            return
+        logger = structlog.get_logger(__name__)
+        for statement, count in repeated:
+            logger.warning(
+                "db_repeated_statement",
+                method=scope["method"],
+                route=route,
+                count=count,
+                db_queries=queries.count,
+                statement=statement[:300],
+            )
+
+    def _log(
+        self,
+        scope: Scope,
+        state: dict,
+        status: int,
+        request_id: str,
+        duration_ms: float,
+        queries: QueryStats,
+    ) -> None:
+        sampled = 200 <= status < 300 and duration_ms < self.slow_request_ms
+        if sampled and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        logger = structlog.get_logger(__name__)
+        common_fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": status,
+            "duration_ms": duration_ms,
+            "db_queries": queries.count,
+            "db_ms": round(queries.seconds * 1000, 3),
+            "request_id": request_id,
+            "user_id": state.get(USER_ID_STATE_KEY),
+        }
+        if sampled and self.sample_rate < 1.0:
+            common_fields["sample_rate"] = self.sample_rate
+        event = "request_finished"
+        if status >= 500:
+            logger.error(event, **common_fields)
+        elif status in (401, 403, 429):
+            logger.warning(event, **common_fields)
+        elif duration_ms >= self.slow_request_ms:
+            logger.warning(event, slow=True, **common_fields)
+        else:
+            logger.info(event, **common_fields)
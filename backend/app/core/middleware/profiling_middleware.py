@@ -0,0 +1,188 @@
+"""On-demand profiling of single requests.
+
+Opt-in (`PROFILING_ENABLED`) and per request: only a request carrying
+`X-Profile: <PROFILING_TOKEN>` is profiled. For that request the middleware
+writes to `PROFILING_DIR`, tagged with the request id:
+- `<stamp>-<request_id>.folded` — sampling CPU profile: the event-loop thread's
+  stack every `sample_interval` seconds, in collapsed-stack format
+  (flamegraph.pl, speedscope, `py-spy`-style tooling read it);
+- `<stamp>-<request_id>.tracemalloc.txt` — top allocation sites grown during
+  the request (tracemalloc snapshot diff, by line);
+- `<stamp>-<request_id>.tracemalloc` — the end snapshot (`tracemalloc.Snapshot.load`).
+
+Samples are wall-clock stacks of the loop thread while the request is in
+flight: other requests served concurrently show up too, so profile on a quiet
+instance or read the stacks under the request's handler. One request is
+profiled at a time (tracemalloc and the sampler are process-wide); a second
+profiled request runs normally with `X-Profile: busy`. Allocation tracing
+slows the profiled request itself several times over; the middleware is not
+installed at all when profiling is disabled.
+"""
+
+import asyncio
+import os
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+
+import structlog
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.middleware.logging_middleware import current_request_id
+
+PROFILE_HEADER = "X-Profile"
+TRACEMALLOC_FRAMES = 10
+TOP_ALLOCATIONS = 50
+
+
+def _collapse(frame: FrameType | None, labels: dict[CodeType, str]) -> str:
+    """`root;...;leaf` for a stack; `labels` caches one label per code object."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        label = labels.get(code)
+        if label is None:
+            filename = os.path.basename(code.co_filename)
+            label = labels[code] = f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+        stack.append(label)
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval from a helper thread."""
+
+    def __init__(self, thread_id: int, *, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._labels: dict[CodeType, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[_collapse(frame, self._labels)] += 1
+
+    def folded(self) -> str:
+        """Collapsed stacks: `root;...;leaf <samples>` per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests that carry the profiling token (CPU samples + allocations).
+
+    Must run inside RequestLoggingMiddleware (add it before) so the request id
+    is known.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        token: str,
+        output_dir: str | Path,
+        sample_interval: float = 0.005,
+    ) -> None:
+        self.app = app
+        self.token = token.encode()
+        self.output_dir = Path(output_dir)
+        self.sample_interval = sample_interval
+        self._busy = False
+
+    def _requested(self, scope: Scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return secrets.compare_digest(value, self.token)
+        return False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.token or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+        if self._busy:
+            await self.app(scope, receive, self._with_header(send, "busy"))
+            return
+
+        self._busy = True
+        request_id = current_request_id() or "unknown"
+        sampler = StackSampler(threading.get_ident(), interval=self.sample_interval)
+        started_tracemalloc = not tracemalloc.is_tracing()
+        if started_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        before = tracemalloc.take_snapshot()
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, self._with_header(send, request_id))
+        finally:
+            sampler.stop()
+            duration = time.perf_counter() - started
+            after = tracemalloc.take_snapshot()
+            if started_tracemalloc:
+                tracemalloc.stop()
+            try:
+                paths = await asyncio.to_thread(
+                    self._write, request_id, sampler, before, after, duration
+                )
+            finally:
+                self._busy = False
+            structlog.get_logger(__name__).info(
+                "request_profiled",
+                path=scope["path"],
+                duration_ms=round(duration * 1000, 3),
+                samples=sampler.stacks.total(),
+                files=[str(p) for p in paths],
+                request_id=request_id,
+            )
+
+    @staticmethod
+    def _with_header(send: Send, value: str) -> Send:
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[PROFILE_HEADER] = value
+            await send(message)
+
+        return send_wrapper
+
+    def _write(
+        self,
+        request_id: str,
+        sampler: StackSampler,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+        duration: float,
+    ) -> list[Path]:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in request_id)[:64]
+        base = f"{time.strftime('%Y%m%dT%H%M%S')}-{safe_id}"
+
+        folded = self.output_dir / f"{base}.folded"
+        folded.write_text(sampler.folded(), encoding="utf-8")
+
+        growth = after.compare_to(before, "lineno")[:TOP_ALLOCATIONS]
+        summary = self.output_dir / f"{base}.tracemalloc.txt"
+        summary.write_text(
+            f"request_id={request_id} duration_ms={duration * 1000:.1f}\n"
+            + "".join(f"{stat}\n" for stat in growth),
+            encoding="utf-8",
+        )
+        snapshot = self.output_dir / f"{base}.tracemalloc"
+        after.dump(str(snapshot))
+        return [folded, summary, snapshot]
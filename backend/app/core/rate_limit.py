@@ -2,10 +2,16 @@
 Rate limiting для чувствительных эндпоинтов (Magic Link, refresh и т.д.).
 
 Используется SlowAPI; лимиты привязаны к IP (get_remote_address).
-In-memory backend по умолчанию; для нескольких инстансов — Redis (см. limits).
+Хранилище счётчиков — RATE_LIMIT_STORAGE_URI:
+- memory:// (по умолчанию) — свои счётчики в каждом воркере
+- sqlite:///<path> — общие для всех воркеров хоста (app.core.rate_limit_storage)
+- redis://... — общие для нескольких хостов (нужен пакет redis)
 """
 
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-limiter = Limiter(key_func=get_remote_address)
+from app.core import rate_limit_storage  # noqa: F401 — регистрирует схему sqlite://
+from app.core.config import settings
+
+limiter = Limiter(key_func=get_remote_address, storage_uri=settings.RATE_LIMIT_STORAGE_URI)
@@ -0,0 +1,138 @@
+"""
+Хранилище счётчиков rate limit в SQLite — общее для всех воркеров одного хоста.
+
+Почему не in-memory (по умолчанию в slowapi):
+- У каждого uvicorn-воркера свои счётчики — при K воркерах лимит фактически в K раз выше
+
+Почему SQLite:
+- Один файл на хосте, без отдельного сервиса; доступ из процесса — без сети
+- Один атомарный upsert (INSERT ... ON CONFLICT ... RETURNING) на запрос:
+  окно фиксированное (стратегия fixed-window slowapi), счётчик сбрасывается при истечении
+- WAL + synchronous=NORMAL: запись без fsync на каждый коммит, ~десятки мкс
+
+Для нескольких хостов — Redis (redis://..., встроенное хранилище limits).
+Postgres не используем: slowapi проверяет лимиты синхронно, а синхронный
+сетевой вызов в БД блокировал бы event loop.
+
+Подключение: RATE_LIMIT_STORAGE_URI=sqlite:////tmp/zaframe-ratelimit.db
+(импорт модуля регистрирует схему "sqlite" в limits).
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from limits.storage import Storage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_limits (
+    key TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    expires_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+_INCR_SQL = """
+INSERT INTO rate_limits (key, count, expires_at) VALUES (:key, :amount, :now + :expiry)
+ON CONFLICT (key) DO UPDATE SET
+    count = CASE WHEN expires_at <= :now THEN :amount ELSE count + :amount END,
+    expires_at = CASE WHEN expires_at <= :now THEN :now + :expiry ELSE expires_at END
+RETURNING count
+"""
+
+
+class SQLiteStorage(Storage):
+    """
+    Счётчики fixed-window в файле SQLite (схема URI: sqlite:///<path>).
+
+    Соединение — одно на поток (sqlite3 не разделяет соединения между потоками).
+    Просроченные ключи удаляются раз в `purge_every` инкрементов.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(
+        self,
+        uri: str | None = None,
+        wrap_exceptions: bool = False,
+        *,
+        busy_timeout_ms: int = 1000,
+        purge_every: int = 1000,
+        **options: float | str | bool,
+    ) -> None:
+        path = urlparse(uri or "").path
+        if not path:
+            raise ValueError("SQLite rate-limit storage requires a path: sqlite:///<path>")
+        self.path = path
+        self.busy_timeout_ms = int(busy_timeout_ms)
+        self.purge_every = int(purge_every)
+        self._local = threading.local()
+        self._incr_count = 0
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    @property
+    def base_exceptions(self) -> type[Exception] | tuple[type[Exception], ...]:
+        return sqlite3.Error
+
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is None:
+            # autocommit: каждый upsert — своя короткая транзакция
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+            conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            _INCR_SQL, {"key": key, "amount": amount, "now": now, "expiry": expiry}
+        ).fetchone()
+        self._incr_count += 1
+        if self.purge_every > 0 and self._incr_count % self.purge_every == 0:
+            conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        return int(row[0])
+
+    def get(self, key: str) -> int:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return int(row[0]) if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = (
+            self._connection()
+            .execute("SELECT expires_at FROM rate_limits WHERE key = ?", (key,))
+            .fetchone()
+        )
+        return float(row[0]) if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def reset(self) -> int | None:
+        return self._connection().execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        self._connection().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
@@ -1,6 +1,9 @@
 # Репозитории: выборки по сущностям, инжектируются через UoW.
 
+from app.core.repositories.archive_repo import ArchiveRepository
 from app.core.repositories.booking_repo import BookingRepository
+from app.core.repositories.email_outbox_repo import EmailOutboxRepository
+from app.core.repositories.magic_link_token_repo import MagicLinkTokenRepository
 from app.core.repositories.order_repo import OrderRepository
 from app.core.repositories.refresh_token_repo import RefreshTokenRepository
 from app.core.repositories.schedule_repo import ScheduleRepository
@@ -10,7 +13,10 @@ from app.core.repositories.studio_repo import StudioRepository
 from app.core.repositories.user_repo import UserRepository
 
 __all__ = [
+    "ArchiveRepository",
     "BookingRepository",
+    "EmailOutboxRepository",
+    "MagicLinkTokenRepository",
     "OrderRepository",
     "RefreshTokenRepository",
     "ScheduleRepository",
@@ -0,0 +1,126 @@
+"""
+Репозиторий архива прошедших слотов и бронирований.
+
+Перенос пачки (archive_slots_ended_before) и чтение истории для
+GET /bookings/history и GET /studios/{id}/slots/history.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, Insert, Row, Table, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import entity_name
+from app.core.cache_invalidation import add_cache_tags
+from app.core.datetime_utils import to_naive_utc
+from app.core.repositories.columns import (
+    BOOKING_ARCHIVE_COLUMNS,
+    SLOT_ARCHIVE_BUNDLE,
+    STUDIO_BUNDLE,
+)
+from app.core.tracing import traced_class
+from app.models.archive import BookingArchive, SlotArchive
+from app.models.booking import Booking
+from app.models.slot import Slot
+from app.models.studio import Studio
+
+
+def _move(source: Table, target: Table, condition: ColumnElement[bool]) -> Insert:
+    """DELETE ... RETURNING из `source` и INSERT этих строк в `target` одним statement."""
+    names = [c.name for c in source.columns]
+    moved = delete(source).where(condition).returning(*source.columns).cte("moved")
+    return insert(target).from_select(names, select(*[moved.c[name] for name in names]))
+
+
+@traced_class
+class ArchiveRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def archive_slots_ended_before(self, cutoff: datetime, *, limit: int) -> tuple[int, int]:
+        """
+        Перенести до `limit` слотов, закончившихся раньше `cutoff`, с их бронированиями.
+
+        Слоты пачки блокируются FOR UPDATE SKIP LOCKED (параллельные воркеры не
+        ждут друг друга, бронирование занятого слота дождётся переноса). Сначала
+        переносятся бронирования (FK на slots), затем сами слоты; каждая таблица —
+        одним DELETE ... RETURNING → INSERT. Возвращает (слотов, бронирований).
+
+        Пачка выбирается по индексу на start_time: слот заканчивается
+        после начала, поэтому start_time < cutoff ничего не отсекает, но даёт
+        range scan в порядке start_time вместо полного прохода с сортировкой;
+        end_time проверяется уже на найденных строках.
+
+        Core-выражения сессия не отслеживает, поэтому теги типов slot/booking
+        для инвалидации кэша после commit добавляются явно.
+        """
+        result = await self._session.execute(
+            select(Slot.id)
+            .where(
+                Slot.start_time < to_naive_utc(cutoff),
+                Slot.end_time < to_naive_utc(cutoff),
+            )
+            .order_by(Slot.start_time)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        slot_ids = list(result.scalars().all())
+        if not slot_ids:
+            return 0, 0
+        bookings = await self._session.execute(
+            _move(Booking.__table__, BookingArchive.__table__, Booking.slot_id.in_(slot_ids))
+        )
+        slots = await self._session.execute(
+            _move(Slot.__table__, SlotArchive.__table__, Slot.id.in_(slot_ids))
+        )
+        add_cache_tags(self._session, (entity_name(Slot), entity_name(Booking)))
+        return slots.rowcount or 0, bookings.rowcount or 0
+
+    async def list_my_rows(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 50,
+        user_id: int,
+        user_email: str,
+        include_guest_email: bool = True,
+    ) -> list[Row]:
+        """
+        Архивные бронирования пользователя строками, одним JOIN со слотом и студией.
+
+        Строка — колонки бронирования плюс вложенные row.slot / row.studio;
+        BookingListItem валидирует её напрямую, как строки BookingRepository.list_my_rows.
+        """
+        query = (
+            select(*BOOKING_ARCHIVE_COLUMNS, SLOT_ARCHIVE_BUNDLE, STUDIO_BUNDLE)
+            .join(SlotArchive, SlotArchive.id == BookingArchive.slot_id)
+            .join(Studio, Studio.id == SlotArchive.studio_id)
+            .where(
+                (BookingArchive.user_id == user_id)
+                | ((BookingArchive.guest_email == user_email) if include_guest_email else False)
+            )
+            .order_by(BookingArchive.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await self._session.execute(query)
+        return list(result.all())
+
+    async def list_slots(
+        self,
+        *,
+        studio_id: int,
+        skip: int = 0,
+        limit: int = 20,
+        start_from: datetime | None = None,
+        start_to: datetime | None = None,
+    ) -> list[SlotArchive]:
+        """Архивные слоты студии, новые первыми."""
+        query = select(SlotArchive).where(SlotArchive.studio_id == studio_id)
+        if start_from is not None:
+            query = query.where(SlotArchive.start_time >= to_naive_utc(start_from))
+        if start_to is not None:
+            query = query.where(SlotArchive.start_time <= to_naive_utc(start_to))
+        query = query.order_by(SlotArchive.start_time.desc()).offset(skip).limit(limit)
+        result = await self._session.execute(query)
+        return list(result.scalars().all())
@@ -6,15 +6,30 @@
 
 from datetime import UTC, datetime
 
-from sqlalchemy import and_, case, func, select
+from sqlalchemy import (
+    Integer,
+    Row,
+    Select,
+    String,
+    and_,
+    case,
+    column,
+    func,
+    select,
+    update,
+    values,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.repositories.columns import BOOKING_COLUMNS, SLOT_BUNDLE, STUDIO_BUNDLE
+from app.core.tracing import traced_class
 from app.models.booking import Booking, BookingStatus
 from app.models.slot import Slot
 from app.models.studio import Studio
 
 
+@traced_class
 class BookingRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -42,7 +57,13 @@ class BookingRepository:
         )
         return result.scalar_one_or_none()
 
-    async def list_my_with_slot_and_studio(
+    @staticmethod
+    def _mine(*, user_id: int, user_email: str, include_guest_email: bool):
+        return (Booking.user_id == user_id) | (
+            (Booking.guest_email == user_email) if include_guest_email else False
+        )
+
+    async def list_my_rows(
         self,
         *,
         skip: int = 0,
@@ -50,41 +71,44 @@ class BookingRepository:
         user_id: int,
         user_email: str,
         include_guest_email: bool = True,
-    ) -> list[Booking]:
+    ) -> list[Row]:
         """
-        List bookings for the current user with slot + studio preloaded (no N+1).
+        List bookings for the current user as plain rows, in one JOIN query (no N+1).
+
+        Each row carries BOOKING_COLUMNS plus nested row.slot / row.studio, so
+        BookingListItem validates it directly without ORM instances.
 
         include_guest_email=True makes the endpoint backward-compatible with guest bookings
         created before account activation (matched by guest_email == user.email).
         """
         query = (
-            select(Booking)
-            .options(
-                selectinload(Booking.slot).selectinload(Slot.studio),
-            )
+            select(*BOOKING_COLUMNS, SLOT_BUNDLE, STUDIO_BUNDLE)
+            .join(Slot, Slot.id == Booking.slot_id)
+            .join(Studio, Studio.id == Slot.studio_id)
             .where(
-                (Booking.user_id == user_id)
-                | ((Booking.guest_email == user_email) if include_guest_email else False)
+                self._mine(
+                    user_id=user_id, user_email=user_email, include_guest_email=include_guest_email
+                )
             )
             .order_by(Booking.created_at.desc())
             .offset(skip)
             .limit(limit)
         )
         result = await self._session.execute(query)
-        return list(result.scalars().all())
+        return list(result.all())
 
-    async def list_(
-        self,
+    @staticmethod
+    def _list_query(
+        query: Select,
         *,
-        skip: int = 0,
-        limit: int = 20,
+        skip: int,
+        limit: int,
         slot_id: int | None = None,
         user_id: int | None = None,
         guest_email: str | None = None,
         status: str | None = None,
         order_id: int | None = None,
-    ) -> list[Booking]:
-        query = select(Booking)
+    ) -> Select:
         if slot_id is not None:
             query = query.where(Booking.slot_id == slot_id)
         if user_id is not None:
@@ -95,10 +119,55 @@ class BookingRepository:
             query = query.where(Booking.status == status)
         if order_id is not None:
             query = query.where(Booking.order_id == order_id)
-        query = query.offset(skip).limit(limit).order_by(Booking.created_at.desc())
+        return query.offset(skip).limit(limit).order_by(Booking.created_at.desc())
+
+    async def list_(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 20,
+        slot_id: int | None = None,
+        user_id: int | None = None,
+        guest_email: str | None = None,
+        status: str | None = None,
+        order_id: int | None = None,
+    ) -> list[Booking]:
+        query = self._list_query(
+            select(Booking),
+            skip=skip,
+            limit=limit,
+            slot_id=slot_id,
+            user_id=user_id,
+            guest_email=guest_email,
+            status=status,
+            order_id=order_id,
+        )
         result = await self._session.execute(query)
         return list(result.scalars().all())
 
+    async def list_rows(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 20,
+        slot_id: int | None = None,
+        user_id: int | None = None,
+        guest_email: str | None = None,
+        status: str | None = None,
+    ) -> list[Row]:
+        """Same filters as list_, returned as BOOKING_COLUMNS rows (read-only listings)."""
+        query = self._list_query(
+            select(*BOOKING_COLUMNS),
+            skip=skip,
+            limit=limit,
+            slot_id=slot_id,
+            user_id=user_id,
+            guest_email=guest_email,
+            status=status,
+        )
+        result = await self._session.execute(query)
+        return list(result.all())
+
     async def count(
         self,
         *,
@@ -170,3 +239,73 @@ class BookingRepository:
         )
         result = await self._session.execute(counts_q)
         return {row.slot_id: (row.confirmed or 0, row.pending or 0) for row in result}
+
+    async def map_ids_by_checkout_session_ids(self, session_ids: list[str]) -> dict[str, int]:
+        """checkout_session_id -> booking_id для сессий, созданных по бронированию."""
+        if not session_ids:
+            return {}
+        result = await self._session.execute(
+            select(Booking.checkout_session_id, Booking.id).where(
+                Booking.checkout_session_id.in_(session_ids)
+            )
+        )
+        return {row.checkout_session_id: row.id for row in result}
+
+    async def confirm_paid_bulk(self, payments: dict[int, str | None]) -> list[int]:
+        """
+        Set-based подтверждение оплаты: booking_id -> payment_intent_id.
+
+        Одно UPDATE ... FROM (VALUES ...) на пачку; уже подтверждённые не трогаем.
+        Возвращает id реально изменённых бронирований.
+        """
+        if not payments:
+            return []
+        paid = values(
+            column("booking_id", Integer),
+            column("payment_intent_id", String),
+            name="paid",
+        ).data(list(payments.items()))
+        result = await self._session.execute(
+            update(Booking)
+            .where(
+                Booking.id == paid.c.booking_id,
+                Booking.status != BookingStatus.CONFIRMED,
+            )
+            .values(
+                status=BookingStatus.CONFIRMED,
+                payment_status="succeeded",
+                payment_intent_id=func.coalesce(
+                    paid.c.payment_intent_id, Booking.payment_intent_id
+                ),
+            )
+            .returning(Booking.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+
+    async def confirm_paid_by_order_ids(self, payments: dict[int, str | None]) -> int:
+        """Set-based подтверждение всех бронирований заказов: order_id -> payment_intent_id."""
+        if not payments:
+            return 0
+        paid = values(
+            column("order_id", Integer),
+            column("payment_intent_id", String),
+            name="paid_orders",
+        ).data(list(payments.items()))
+        result = await self._session.execute(
+            update(Booking)
+            .where(
+                Booking.order_id == paid.c.order_id,
+                Booking.status != BookingStatus.CONFIRMED,
+            )
+            .values(
+                status=BookingStatus.CONFIRMED,
+                payment_status="succeeded",
+                payment_intent_id=func.coalesce(
+                    paid.c.payment_intent_id, Booking.payment_intent_id
+                ),
+            )
+            .returning(Booking.id)
+            .execution_options(synchronize_session=False)
+        )
+        return len(result.scalars().all())
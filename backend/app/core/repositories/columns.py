@@ -0,0 +1,99 @@
+"""
+Колонки для read-path списков (list_rows и соседние методы репозиториев).
+
+Списочные эндпоинты не меняют данные, поэтому им не нужны ORM-объекты
+(identity map, отслеживание состояния, relationship loaders). Репозитории
+выбирают только эти колонки и возвращают sqlalchemy Row — кортеж со
+__slots__ и доступом по имени колонки, который *Response-схемы
+(from_attributes=True) валидируют напрямую.
+
+Наборы повторяют поля соответствующих схем ответа; синхронность проверяет
+tests/test_list_rows.py.
+"""
+
+from sqlalchemy.orm import Bundle
+
+from app.models.archive import BookingArchive, SlotArchive
+from app.models.booking import Booking
+from app.models.service import Service
+from app.models.slot import Slot
+from app.models.studio import Studio
+
+SLOT_COLUMNS = (
+    Slot.id,
+    Slot.studio_id,
+    Slot.start_time,
+    Slot.end_time,
+    Slot.title,
+    Slot.description,
+    Slot.max_capacity,
+    Slot.price_cents,
+    Slot.course_price_cents,
+    Slot.is_active,
+    Slot.created_at,
+    Slot.updated_at,
+)
+
+STUDIO_COLUMNS = (
+    Studio.id,
+    Studio.owner_id,
+    Studio.name,
+    Studio.description,
+    Studio.email,
+    Studio.phone,
+    Studio.address,
+    Studio.city,
+    Studio.latitude,
+    Studio.longitude,
+    Studio.amenities,
+    Studio.is_active,
+    Studio.created_at,
+    Studio.updated_at,
+)
+
+SERVICE_COLUMNS = (
+    Service.id,
+    Service.studio_id,
+    Service.name,
+    Service.description,
+    Service.type,
+    Service.category,
+    Service.duration_minutes,
+    Service.max_capacity,
+    Service.price_single_cents,
+    Service.price_course_cents,
+    Service.soft_limit_ratio,
+    Service.hard_limit_ratio,
+    Service.max_overbooked_ratio,
+    Service.tags,
+    Service.is_active,
+    Service.created_at,
+    Service.updated_at,
+)
+
+BOOKING_COLUMNS = (
+    Booking.id,
+    Booking.slot_id,
+    Booking.user_id,
+    Booking.guest_session_id,
+    Booking.guest_name,
+    Booking.guest_email,
+    Booking.guest_phone,
+    Booking.status,
+    Booking.checkout_session_id,
+    Booking.payment_intent_id,
+    Booking.payment_status,
+    Booking.created_at,
+    Booking.updated_at,
+    Booking.cancelled_at,
+)
+
+
+# Вложенные строки row.slot / row.studio (для BookingListItem).
+SLOT_BUNDLE = Bundle("slot", *SLOT_COLUMNS)
+STUDIO_BUNDLE = Bundle("studio", *STUDIO_COLUMNS)
+
+# Архив (bookings_archive / slots_archive) — те же имена колонок, что и у
+# исходных таблиц, поэтому строки валидируются теми же схемами.
+BOOKING_ARCHIVE_COLUMNS = tuple(BookingArchive.__table__.c[c.key] for c in BOOKING_COLUMNS)
+SLOT_ARCHIVE_BUNDLE = Bundle("slot", *(SlotArchive.__table__.c[c.key] for c in SLOT_COLUMNS))
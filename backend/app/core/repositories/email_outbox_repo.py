@@ -0,0 +1,36 @@
+"""
+Репозиторий для сущности EmailOutbox.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.tracing import traced_class
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+
+
+@traced_class
+class EmailOutboxRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def claim_due(self, *, limit: int, now: datetime) -> list[EmailOutbox]:
+        """
+        Забрать пачку писем, готовых к отправке.
+
+        FOR UPDATE SKIP LOCKED: несколько воркеров не отправят одно письмо дважды,
+        строки остаются заблокированными до commit отправителя.
+        """
+        result = await self._session.execute(
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status == EmailOutboxStatus.PENDING,
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(result.scalars().all())
@@ -0,0 +1,50 @@
+"""
+Репозиторий для сущности MagicLinkToken.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.tracing import traced_class
+from app.models.magic_link_token import MagicLinkToken
+
+
+@traced_class
+class MagicLinkTokenRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def consume(self, token_hash: str, now: datetime) -> int | None:
+        """
+        Использовать ссылку: удалить действующий токен и вернуть user_id.
+
+        Один DELETE ... RETURNING по уникальному индексу: два одновременных
+        перехода по одной ссылке не пройдут оба. None — нет или истёк.
+        """
+        result = await self._session.execute(
+            delete(MagicLinkToken)
+            .where(
+                MagicLinkToken.token_hash == token_hash,
+                MagicLinkToken.expires_at > now,
+            )
+            .returning(MagicLinkToken.user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def purge_expired(self, *, now: datetime, limit: int) -> int:
+        """Удалить до `limit` просроченных токенов (FOR UPDATE SKIP LOCKED)."""
+        batch = (
+            select(MagicLinkToken.id)
+            .where(MagicLinkToken.expires_at <= now)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self._session.execute(
+            delete(MagicLinkToken)
+            .where(MagicLinkToken.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
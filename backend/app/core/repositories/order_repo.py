@@ -2,13 +2,15 @@
 Репозиторий для сущности Order.
 """
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.order import Order
+from app.core.tracing import traced_class
+from app.models.order import Order, OrderStatus
 
 
+@traced_class
 class OrderRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -22,3 +24,16 @@ class OrderRepository:
             select(Order).options(selectinload(Order.service)).where(Order.id == order_id)
         )
         return result.scalar_one_or_none()
+
+    async def mark_paid_bulk(self, order_ids: list[int]) -> list[int]:
+        """Перевести заказы в PAID одним UPDATE; возвращает id реально изменённых заказов."""
+        if not order_ids:
+            return []
+        result = await self._session.execute(
+            update(Order)
+            .where(Order.id.in_(order_ids), Order.status != OrderStatus.PAID)
+            .values(status=OrderStatus.PAID)
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
@@ -2,21 +2,55 @@
 Репозиторий для сущности RefreshToken.
 """
 
-from sqlalchemy import select
+from datetime import datetime
+
+from sqlalchemy import delete, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.tracing import traced_class
 from app.models.refresh_token import RefreshToken
 
 
+@traced_class
 class RefreshTokenRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
-    async def get_by_user_and_jti(self, user_id: int, jti: str) -> RefreshToken | None:
+    async def get_active_by_user_and_jti(self, user_id: int, jti: str) -> RefreshToken | None:
+        """Не отозванная сессия (ix_refresh_tokens_active_user_jti); срок проверяет вызывающий."""
         result = await self._session.execute(
             select(RefreshToken).where(
                 RefreshToken.user_id == user_id,
                 RefreshToken.jti == jti,
+                RefreshToken.revoked_at.is_(None),
             )
         )
         return result.scalar_one_or_none()
+
+    async def purge_stale(self, *, older_than: datetime, limit: int) -> int:
+        """
+        Удалить до `limit` токенов, истёкших или отозванных раньше `older_than`.
+
+        Пачка выбирается с FOR UPDATE SKIP LOCKED — параллельные воркеры
+        не ждут друг друга. Условие OR покрыто ix_refresh_tokens_expires_at и
+        частичным ix_refresh_tokens_revoked_at_not_null (BitmapOr).
+        Возвращает число удалённых строк.
+        """
+        batch = (
+            select(RefreshToken.id)
+            .where(
+                or_(
+                    RefreshToken.expires_at < older_than,
+                    RefreshToken.revoked_at < older_than,
+                )
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self._session.execute(
+            delete(RefreshToken)
+            .where(RefreshToken.id.in_(batch))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
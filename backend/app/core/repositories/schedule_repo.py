@@ -5,9 +5,11 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.tracing import traced_class
 from app.models.schedule import Schedule
 
 
+@traced_class
 class ScheduleRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
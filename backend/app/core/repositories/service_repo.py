@@ -2,13 +2,16 @@
 Репозиторий для сущности Service.
 """
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.repositories.columns import SERVICE_COLUMNS
+from app.core.tracing import traced_class
 from app.models.service import Service
 
 
+@traced_class
 class ServiceRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -46,3 +49,19 @@ class ServiceRepository:
             query = query.where(Service.category == category)
         result = await self._session.execute(query)
         return list(result.scalars().all())
+
+    async def list_active_rows_by_studio_ids(
+        self,
+        studio_ids: list[int],
+        *,
+        category: str | None = None,
+    ) -> list[Row]:
+        """Активные услуги студий строками SERVICE_COLUMNS (карточки Explore)."""
+        query = select(*SERVICE_COLUMNS).where(
+            Service.studio_id.in_(studio_ids),
+            Service.is_active.is_(True),
+        )
+        if category is not None:
+            query = query.where(Service.category == category)
+        result = await self._session.execute(query)
+        return list(result.all())
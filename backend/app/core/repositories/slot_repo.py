@@ -4,13 +4,16 @@
 
 from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import Row, Select, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.datetime_utils import to_naive_utc
+from app.core.repositories.columns import SLOT_COLUMNS
+from app.core.tracing import traced_class
 from app.models.slot import Slot
 
 
+@traced_class
 class SlotRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -25,6 +28,27 @@ class SlotRepository:
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    def _list_query(
+        query: Select,
+        *,
+        skip: int,
+        limit: int,
+        studio_id: int | None,
+        start_from: datetime | None,
+        start_to: datetime | None,
+        is_active: bool | None,
+    ) -> Select:
+        if studio_id is not None:
+            query = query.where(Slot.studio_id == studio_id)
+        if start_from is not None:
+            query = query.where(Slot.start_time >= to_naive_utc(start_from))
+        if start_to is not None:
+            query = query.where(Slot.start_time <= to_naive_utc(start_to))
+        if is_active is not None:
+            query = query.where(Slot.is_active == is_active)
+        return query.offset(skip).limit(limit).order_by(Slot.start_time.asc())
+
     async def list_(
         self,
         *,
@@ -35,19 +59,41 @@ class SlotRepository:
         start_to: datetime | None = None,
         is_active: bool | None = None,
     ) -> list[Slot]:
-        query = select(Slot)
-        if studio_id is not None:
-            query = query.where(Slot.studio_id == studio_id)
-        if start_from is not None:
-            query = query.where(Slot.start_time >= to_naive_utc(start_from))
-        if start_to is not None:
-            query = query.where(Slot.start_time <= to_naive_utc(start_to))
-        if is_active is not None:
-            query = query.where(Slot.is_active == is_active)
-        query = query.offset(skip).limit(limit).order_by(Slot.start_time.asc())
+        query = self._list_query(
+            select(Slot),
+            skip=skip,
+            limit=limit,
+            studio_id=studio_id,
+            start_from=start_from,
+            start_to=start_to,
+            is_active=is_active,
+        )
         result = await self._session.execute(query)
         return list(result.scalars().all())
 
+    async def list_rows(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 20,
+        studio_id: int | None = None,
+        start_from: datetime | None = None,
+        start_to: datetime | None = None,
+        is_active: bool | None = None,
+    ) -> list[Row]:
+        """Те же фильтры, что и list_, но строки SLOT_COLUMNS без ORM-объектов (для списков)."""
+        query = self._list_query(
+            select(*SLOT_COLUMNS),
+            skip=skip,
+            limit=limit,
+            studio_id=studio_id,
+            start_from=start_from,
+            start_to=start_to,
+            is_active=is_active,
+        )
+        result = await self._session.execute(query)
+        return list(result.all())
+
     async def count(
         self,
         *,
@@ -4,14 +4,17 @@
 Выборки студий с фильтрами и по slug (для публичной страницы).
 """
 
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import Row, Select, and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.repositories.columns import STUDIO_COLUMNS
+from app.core.tracing import traced_class
 from app.models.service import Service
 from app.models.studio import Studio
 
 
+@traced_class
 class StudioRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
@@ -82,18 +85,19 @@ class StudioRepository:
             )
         return join_conditions
 
-    async def list_(
+    def _list_stmt(
         self,
+        stmt: Select,
         *,
-        skip: int = 0,
-        limit: int = 20,
-        owner_id: int | None = None,
-        is_active: bool | None = None,
-        city: str | None = None,
-        category: str | None = None,
-        query: str | None = None,
-        amenities: list[str] | None = None,
-    ) -> list[Studio]:
+        skip: int,
+        limit: int,
+        owner_id: int | None,
+        is_active: bool | None,
+        city: str | None,
+        category: str | None,
+        query: str | None,
+        amenities: list[str] | None,
+    ) -> Select:
         conditions = self._list_conditions(
             owner_id=owner_id,
             is_active=is_active,
@@ -109,21 +113,64 @@ class StudioRepository:
                 .where(and_(*join_conditions))
                 .distinct()
             )
-            stmt = (
-                select(Studio)
-                .where(Studio.id.in_(subq))
-                .order_by(Studio.created_at.desc())
-                .offset(skip)
-                .limit(limit)
-            )
-        else:
-            stmt = select(Studio)
-            if conditions:
-                stmt = stmt.where(*conditions)
-            stmt = stmt.order_by(Studio.created_at.desc()).offset(skip).limit(limit)
+            stmt = stmt.where(Studio.id.in_(subq))
+        elif conditions:
+            stmt = stmt.where(*conditions)
+        return stmt.order_by(Studio.created_at.desc()).offset(skip).limit(limit)
+
+    async def list_(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 20,
+        owner_id: int | None = None,
+        is_active: bool | None = None,
+        city: str | None = None,
+        category: str | None = None,
+        query: str | None = None,
+        amenities: list[str] | None = None,
+    ) -> list[Studio]:
+        stmt = self._list_stmt(
+            select(Studio),
+            skip=skip,
+            limit=limit,
+            owner_id=owner_id,
+            is_active=is_active,
+            city=city,
+            category=category,
+            query=query,
+            amenities=amenities,
+        )
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
+    async def list_rows(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 20,
+        owner_id: int | None = None,
+        is_active: bool | None = None,
+        city: str | None = None,
+        category: str | None = None,
+        query: str | None = None,
+        amenities: list[str] | None = None,
+    ) -> list[Row]:
+        """Те же фильтры, что и list_, но строки STUDIO_COLUMNS без ORM-объектов (Explore)."""
+        stmt = self._list_stmt(
+            select(*STUDIO_COLUMNS),
+            skip=skip,
+            limit=limit,
+            owner_id=owner_id,
+            is_active=is_active,
+            city=city,
+            category=category,
+            query=query,
+            amenities=amenities,
+        )
+        result = await self._session.execute(stmt)
+        return list(result.all())
+
     async def count(
         self,
         *,
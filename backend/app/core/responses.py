@@ -0,0 +1,52 @@
+"""
+JSON responses serialized exactly once by pydantic-core.
+
+With ``response_model=`` FastAPI validates whatever the handler returned, dumps it
+to Python objects and encodes those with the stdlib ``json`` module; handlers that
+already build schema instances pay for validation twice. ``typed_json_response``
+renders the payload straight to bytes with a cached ``TypeAdapter``: ORM objects,
+Core rows and plain dicts are validated once (from_attributes) and dumped, so
+handlers pass them as they are instead of building schema instances.
+
+Routes keep ``response_model=`` for OpenAPI. Returning a ``Response`` makes FastAPI
+skip its own validation and encoding pass.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from functools import cache
+from typing import Any
+
+from pydantic import TypeAdapter
+from starlette.responses import Response
+
+
+class TypedJSONResponse(Response):
+    """Response whose body is already-encoded JSON bytes."""
+
+    media_type = "application/json"
+
+
+@cache
+def _adapter(type_: Any) -> TypeAdapter[Any]:
+    # Schema build is the expensive part; one adapter per response type.
+    return TypeAdapter(type_)
+
+
+def prime_adapters(types: Iterable[Any]) -> int:
+    """Build the adapters for these response types ahead of traffic; how many distinct."""
+    return len({id(_adapter(t)) for t in types})
+
+
+def typed_json_response(
+    type_: Any,
+    content: Any,
+    *,
+    status_code: int = 200,
+    headers: Mapping[str, str] | None = None,
+) -> TypedJSONResponse:
+    """Validate ``content`` as ``type_`` (e.g. ``list[SlotResponse]``) and serialize it in one pass."""
+    adapter = _adapter(type_)
+    content = adapter.validate_python(content, from_attributes=True)
+    return TypedJSONResponse(adapter.dump_json(content), status_code=status_code, headers=headers)
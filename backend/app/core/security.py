@@ -9,6 +9,7 @@ JWT и Magic Link: создание и проверка токенов.
 
 import hashlib
 import hmac
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from secrets import token_urlsafe
@@ -16,6 +17,8 @@ from secrets import token_urlsafe
 from jose import JWTError, jwt
 
 from app.core.config import settings
+from app.core.metrics import register_cache
+from app.core.ttl_cache import TTLCache
 
 
 def _utcnow() -> datetime:
@@ -84,15 +87,67 @@ def decode_token(token: str) -> dict | None:
         return None
 
 
-def get_user_id_from_access_token(token: str) -> int | None:
-    """Извлечь user_id из access token."""
+@dataclass(frozen=True)
+class AccessTokenData:
+    """Структурированное содержимое access-токена после валидации."""
+
+    user_id: int
+    email: str | None
+    expires_at: float  # exp, unix timestamp
+
+
+# Проверенные access-токены: дашборды опрашивают API одним и тем же токеном,
+# и повторная HMAC-проверка + разбор JWT — чистая трата CPU. Ключ — sha256 токена
+# (сам токен в памяти не держим), запись живёт не дольше exp токена.
+access_token_cache: TTLCache[bytes, AccessTokenData] = TTLCache(
+    max_size=settings.ACCESS_TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=settings.ACCESS_TOKEN_CACHE_TTL_SECONDS,
+)
+register_cache("access_token", access_token_cache)
+
+
+def _decode_access_token(token: str) -> AccessTokenData | None:
     payload = decode_token(token)
     if payload is None or payload.get("type") != "access":
         return None
     try:
-        return int(payload["sub"])
-    except (ValueError, KeyError):
+        user_id = int(payload["sub"])
+        expires_at = float(payload["exp"])
+    except (ValueError, KeyError, TypeError):
         return None
+    email = payload.get("email")
+    return AccessTokenData(
+        user_id=user_id,
+        email=email if isinstance(email, str) else None,
+        expires_at=expires_at,
+    )
+
+
+def parse_access_token(token: str) -> AccessTokenData | None:
+    """
+    Распарсить и провалидировать access-token.
+
+    Возвращает AccessTokenData или None, если токен недействителен.
+    Успешно проверенные токены кэшируются (access_token_cache) до exp.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = access_token_cache.get(key)
+    now = time.time()
+    if cached is not None:
+        if cached.expires_at > now:
+            return cached
+        access_token_cache.pop(key)
+
+    data = _decode_access_token(token)
+    if data is not None:
+        access_token_cache.set(key, data, ttl_seconds=data.expires_at - now)
+    return data
+
+
+def get_user_id_from_access_token(token: str) -> int | None:
+    """Извлечь user_id из access token."""
+    data = parse_access_token(token)
+    return data.user_id if data is not None else None
 
 
 def get_user_id_from_refresh_token(token: str) -> int | None:
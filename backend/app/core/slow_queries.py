@@ -0,0 +1,187 @@
+"""
+Slow-statement log with sampled EXPLAIN capture.
+
+Every statement slower than `threshold_ms` is logged as `db_slow_statement`
+with its normalized SQL, the shape of its parameters (types only, never
+values), duration and request_id.
+
+With `explain_sample_rate` > 0 a sample of slow SELECTs is re-run as
+`EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)` and the plan is logged as
+`db_slow_statement_plan`, with the scanned relations summarized (`seq_scans`)
+so a sequential scan stands out without reading the whole plan. EXPLAIN
+ANALYZE executes the query a second time, so:
+- only plain SELECTs are explained (no FOR UPDATE/SHARE, no data-modifying CTEs);
+- it runs in a background task on its own connection, inside a rolled-back
+  transaction with `statement_timeout`, never on the request's connection;
+- at most one capture runs at a time per engine, and its own statements are
+  neither counted in the request stats nor logged as slow.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import random
+import re
+from typing import Any
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.metrics import counter
+from app.core.middleware.logging_middleware import current_request_id
+
+slow_statements = counter("db_slow_statements_total", "DB statements slower than the threshold")
+slow_statement_plans = counter(
+    "db_slow_statement_plans_total", "EXPLAIN ANALYZE plans captured for slow statements"
+)
+
+_capturing: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "slow_statement_capture", default=False
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w$])\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\$\d+(?:\s*,\s*\$\d+)+")
+_NOT_EXPLAINABLE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b", re.I)
+_WRITES = re.compile(r"\b(?:INSERT|UPDATE|DELETE|MERGE)\b", re.I)
+
+MAX_LOGGED_SQL = 2000
+MAX_PARAM_SHAPE = 20
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace, literals and `$1, $2, ...` lists so equal queries log alike."""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PARAM_LIST.sub("$n, ...", sql)
+    return _WHITESPACE.sub(" ", sql).strip()[:MAX_LOGGED_SQL]
+
+
+def parameters_shape(parameters: Any, *, executemany: bool = False) -> str:
+    """Parameter types without values: `(int, str, datetime)`, `3 x (int, str)`."""
+    if executemany:
+        rows = list(parameters or ())
+        return f"{len(rows)} x {parameters_shape(rows[0]) if rows else '()'}"
+    if isinstance(parameters, dict):
+        items = [f"{k}: {type(v).__name__}" for k, v in parameters.items()]
+    else:
+        items = [type(v).__name__ for v in parameters or ()]
+    if len(items) > MAX_PARAM_SHAPE:
+        items = [*items[:MAX_PARAM_SHAPE], f"... +{len(items) - MAX_PARAM_SHAPE}"]
+    return f"({', '.join(items)})"
+
+
+def is_explainable(statement: str) -> bool:
+    """Plain read-only SELECT: safe to execute again under EXPLAIN ANALYZE."""
+    head = statement.lstrip().upper()
+    if not head.startswith("SELECT"):
+        return False
+    return not (_NOT_EXPLAINABLE.search(statement) or _WRITES.search(statement))
+
+
+def plan_scans(plan: dict[str, Any]) -> list[str]:
+    """`Seq Scan on studios`, `Index Scan on bookings` ... for every node reading a relation."""
+    scans = []
+    stack = [plan]
+    while stack:
+        node = stack.pop()
+        relation = node.get("Relation Name")
+        if relation:
+            scans.append(f"{node.get('Node Type')} on {relation}")
+        stack.extend(reversed(node.get("Plans", ())))
+    return scans
+
+
+class SlowStatementLog:
+    """Slow-statement log for one engine; `observe()` is called after every statement."""
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        *,
+        threshold_ms: float,
+        explain_sample_rate: float = 0.0,
+        explain_timeout_ms: int = 5000,
+    ) -> None:
+        self.engine = engine
+        self.threshold_ms = threshold_ms
+        self.explain_sample_rate = explain_sample_rate
+        self.explain_timeout_ms = explain_timeout_ms
+        self._explain_task: asyncio.Task[None] | None = None
+
+    def observe(
+        self, statement: str, parameters: Any, seconds: float, *, executemany: bool = False
+    ) -> None:
+        duration_ms = seconds * 1000
+        if self.threshold_ms <= 0 or duration_ms < self.threshold_ms or _capturing.get():
+            return
+        slow_statements.inc()
+        request_id = current_request_id()
+        structlog.get_logger(__name__).warning(
+            "db_slow_statement",
+            statement=normalize_sql(statement),
+            parameters=parameters_shape(parameters, executemany=executemany),
+            duration_ms=round(duration_ms, 3),
+            request_id=request_id,
+        )
+        if not executemany and self._should_explain(statement):
+            self._start_explain(statement, parameters, request_id)
+
+    def _should_explain(self, statement: str) -> bool:
+        if self.explain_sample_rate <= 0 or random.random() >= self.explain_sample_rate:
+            return False
+        if self._explain_task is not None and not self._explain_task.done():
+            return False
+        return is_explainable(statement)
+
+    def _start_explain(self, statement: str, parameters: Any, request_id: str | None) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sync use of the engine (scripts) — nowhere to run the capture
+        # Fresh context: the capture is not part of the request's query stats.
+        self._explain_task = loop.create_task(
+            self.explain(statement, parameters, request_id=request_id),
+            context=contextvars.Context(),
+        )
+
+    async def explain(
+        self, statement: str, parameters: Any, *, request_id: str | None = None
+    ) -> dict[str, Any] | None:
+        """Run EXPLAIN (ANALYZE, BUFFERS) for `statement`, log and return the plan."""
+        _capturing.set(True)
+        logger = structlog.get_logger(__name__)
+        try:
+            async with self.engine.connect() as conn, conn.begin() as tx:
+                await conn.exec_driver_sql(
+                    f"SET LOCAL statement_timeout = {int(self.explain_timeout_ms)}"
+                )
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}",
+                    tuple(parameters) if isinstance(parameters, list) else parameters,
+                )
+                raw = result.scalar_one()
+                await tx.rollback()
+        except Exception as e:
+            logger.warning(
+                "db_slow_statement_explain_failed",
+                statement=normalize_sql(statement),
+                error_type=type(e).__name__,
+                request_id=request_id,
+            )
+            return None
+        explained = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+        slow_statement_plans.inc()
+        logger.warning(
+            "db_slow_statement_plan",
+            statement=normalize_sql(statement),
+            execution_ms=explained.get("Execution Time"),
+            seq_scans=[s for s in plan_scans(explained["Plan"]) if s.startswith("Seq Scan")],
+            scans=plan_scans(explained["Plan"]),
+            plan=explained["Plan"],
+            request_id=request_id,
+        )
+        return explained
@@ -0,0 +1,392 @@
+"""
+Request tracing: spans across router → service → repository → outbound calls.
+
+Spans come from:
+- `TracedRoute` (route class of every API router): one span per handler call
+  named by method and route template — dependency resolution (`get_uow`),
+  the endpoint and response serialization;
+- `@traced` functions: service modules via `traced_module(__name__)`,
+  repositories via `@traced_class`, `UnitOfWork.commit`;
+- `span(name)` blocks: outbound Stripe / Resend calls, pool checkout.
+
+The sampling decision is made once per trace (ratio `TRACE_SAMPLE_RATE` at
+the root span, children follow it). Finished spans go to a bounded
+buffer drained by one exporter thread once a second (a full buffer drops
+spans, counted in `trace_spans_dropped_total`). Exporters are pluggable (`SpanExporter`):
+OTLP/JSON lines appended to a file — the format the OpenTelemetry
+collector's `otlpjsonfile` receiver reads — or structlog events.
+
+Every span carries `request.id`. With `TRACE_SAMPLE_RATE=0` (default) a traced
+call costs one global check; in an unsampled trace, one context lookup.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import random
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+import structlog
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.metrics import counter
+from app.core.middleware.logging_middleware import current_request_id, route_template
+
+spans_dropped = counter(
+    "trace_spans_dropped_total", "Finished spans dropped because the export queue was full"
+)
+
+# OTLP span kinds.
+INTERNAL = 1
+SERVER = 2
+CLIENT = 3
+
+_UNSAMPLED = object()
+
+
+@dataclass(slots=True, eq=False)
+class Span:
+    """One timed operation; exported once finished."""
+
+    name: str
+    trace_id: int
+    span_id: int
+    parent_id: int | None
+    kind: int = INTERNAL
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or self.start_ns) - self.start_ns) / 1e6
+
+
+# Current span of this task: a Span, _UNSAMPLED inside an unsampled trace, None outside.
+_current: ContextVar[Any] = ContextVar("trace_span", default=None)
+
+
+def current_span() -> Span | None:
+    """Innermost sampled span of this context (None outside traces or when unsampled)."""
+    value = _current.get()
+    return value if isinstance(value, Span) else None
+
+
+class SpanExporter(Protocol):
+    """Receives batches of finished spans in the exporter thread."""
+
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Mapping[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()]
+
+
+def otlp_json(spans: Sequence[Span], *, service_name: str) -> dict[str, Any]:
+    """Spans as an OTLP/JSON `ExportTraceServiceRequest`."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "app"},
+                        "spans": [
+                            {
+                                "traceId": format(s.trace_id, "032x"),
+                                "spanId": format(s.span_id, "016x"),
+                                "parentSpanId": (
+                                    format(s.parent_id, "016x") if s.parent_id else ""
+                                ),
+                                "name": s.name,
+                                "kind": s.kind,
+                                "startTimeUnixNano": str(s.start_ns),
+                                "endTimeUnixNano": str(s.end_ns),
+                                "attributes": _otlp_attributes(s.attributes),
+                                # STATUS_CODE_ERROR = 2, UNSET = 0
+                                "status": {"code": 2, "message": s.error}
+                                if s.error
+                                else {"code": 0},
+                            }
+                            for s in spans
+                        ],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class OtlpJsonFileExporter:
+    """One OTLP/JSON request per line, appended to `path`."""
+
+    def __init__(self, path: str | Path, *, service_name: str) -> None:
+        self.path = Path(path)
+        self.service_name = service_name
+        self._file = self.path.open("a", encoding="utf-8")
+
+    def export(self, spans: Sequence[Span]) -> None:
+        payload = otlp_json(spans, service_name=self.service_name)
+        self._file.write(json.dumps(payload, separators=(",", ":")) + "\n")
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+
+class LogSpanExporter:
+    """Each span as a `trace_span` log event (local development)."""
+
+    def export(self, spans: Sequence[Span]) -> None:
+        logger = structlog.get_logger(__name__)
+        for s in spans:
+            logger.info(
+                "trace_span",
+                span=s.name,
+                trace_id=format(s.trace_id, "032x"),
+                span_id=format(s.span_id, "016x"),
+                parent_id=format(s.parent_id, "016x") if s.parent_id else None,
+                duration_ms=round(s.duration_ms, 3),
+                error=s.error,
+                request_id=s.attributes.get("request.id"),
+            )
+
+    def shutdown(self) -> None:
+        pass
+
+
+class _ExportQueue:
+    """
+    Bounded buffer of finished spans drained by one exporter thread.
+
+    `put()` is a deque append (no lock, no thread wake-up); the thread exports
+    whatever accumulated every `interval` seconds.
+    """
+
+    def __init__(self, exporter: SpanExporter, *, max_size: int, interval: float = 1.0) -> None:
+        self.exporter = exporter
+        self.max_size = max_size
+        self.interval = interval
+        self._spans: deque[Span] = deque()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def put(self, span: Span) -> None:
+        if len(self._spans) >= self.max_size:
+            spans_dropped.inc()
+            return
+        self._spans.append(span)
+
+    def _drain(self) -> None:
+        batch = []
+        while self._spans:
+            batch.append(self._spans.popleft())
+        if not batch:
+            return
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            structlog.get_logger(__name__).warning(
+                "trace_export_failed", error_type=type(e).__name__, spans=len(batch)
+            )
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._drain()
+        self._drain()
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Export what is buffered, stop the thread and the exporter."""
+        self._stop.set()
+        self._thread.join(timeout)
+        self.exporter.shutdown()
+
+
+_export_queue: _ExportQueue | None = None
+_sample_rate = 0.0
+
+
+def create_exporter(name: str) -> SpanExporter:
+    """Exporter by TRACE_EXPORTER name: `otlp-file` or `log`."""
+    if name == "otlp-file":
+        return OtlpJsonFileExporter(settings.TRACE_EXPORT_PATH, service_name=settings.APP_NAME)
+    if name == "log":
+        return LogSpanExporter()
+    raise ValueError(f"Unknown TRACE_EXPORTER: {name!r}")
+
+
+def configure_tracing(
+    *, sample_rate: float | None = None, exporter: SpanExporter | None = None
+) -> bool:
+    """
+    Start tracing with the exporter thread; returns False when the sample rate is 0.
+
+    Defaults come from settings; tests pass their own exporter.
+    """
+    global _export_queue, _sample_rate
+    shutdown_tracing()
+    rate = settings.TRACE_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate <= 0:
+        return False
+    _export_queue = _ExportQueue(
+        exporter or create_exporter(settings.TRACE_EXPORTER),
+        max_size=settings.TRACE_EXPORT_QUEUE_SIZE,
+    )
+    _sample_rate = rate
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Flush queued spans and stop the exporter thread (no-op if tracing is off)."""
+    global _export_queue
+    if _export_queue is not None:
+        export_queue, _export_queue = _export_queue, None
+        export_queue.shutdown()
+
+
+@contextmanager
+def span(
+    name: str, *, kind: int = INTERNAL, root: bool = True, **attributes: Any
+) -> Iterator[Span | None]:
+    """
+    Span around a block; yields None when the trace is not sampled.
+
+    Outbound calls use `kind=CLIENT`; `root=False` records the span only inside
+    an existing trace. An exception leaving the block marks the span with its
+    type and is re-raised.
+    """
+    export_queue = _export_queue
+    parent = _current.get()
+    if export_queue is None or parent is _UNSAMPLED or (parent is None and not root):
+        yield None
+        return
+    if parent is None:
+        if random.random() >= _sample_rate:
+            token = _current.set(_UNSAMPLED)
+            try:
+                yield None
+            finally:
+                _current.reset(token)
+            return
+        trace_id, parent_id = random.getrandbits(128) or 1, None
+    else:
+        trace_id, parent_id = parent.trace_id, parent.span_id
+    request_id = current_request_id()
+    if request_id is not None:
+        attributes["request.id"] = request_id
+    current = Span(name, trace_id, random.getrandbits(64) or 1, parent_id, kind, attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current.reset(token)
+        export_queue.put(current)
+
+
+def traced[F: Callable[..., Any]](func: F, *, name: str | None = None) -> F:
+    """Wrap a function (sync or async) in a span named `<module>.<qualname>`."""
+    span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _export_queue is None or _current.get() is _UNSAMPLED:
+                return await func(*args, **kwargs)
+            with span(span_name):
+                return await func(*args, **kwargs)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _export_queue is None or _current.get() is _UNSAMPLED:
+            return func(*args, **kwargs)
+        with span(span_name):
+            return func(*args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+def traced_class[C: type](cls: C) -> C:
+    """Class decorator: trace every public coroutine method defined on the class."""
+    for attr, value in list(vars(cls).items()):
+        if not attr.startswith("_") and inspect.iscoroutinefunction(value):
+            setattr(cls, attr, traced(value))
+    return cls
+
+
+def traced_module(module_name: str) -> None:
+    """
+    Trace every public coroutine function defined in a module.
+
+    Called at the bottom of the module, before anyone imports its names, so
+    routers and other services get the traced versions.
+    """
+    module = sys.modules[module_name]
+    for attr, value in list(vars(module).items()):
+        if (
+            not attr.startswith("_")
+            and inspect.iscoroutinefunction(value)
+            and value.__module__ == module_name
+        ):
+            setattr(module, attr, traced(value))
+
+
+class TracedRoute(APIRoute):
+    """
+    APIRoute whose handler runs in a span `GET /api/v1/studios/{studio_id}`.
+
+    Set as `route_class` of the API routers; the span covers dependency
+    resolution, the endpoint and response serialization.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Any]:
+        handler = super().get_route_handler()
+
+        async def traced_handler(request: Request) -> Response:
+            if _export_queue is None:
+                return await handler(request)
+            name = f"{request.method} {route_template(request.scope)}"
+            with span(name, kind=SERVER) as current:
+                response = await handler(request)
+                if current is not None:
+                    current.set_attribute("http.response.status_code", response.status_code)
+                return response
+
+        return traced_handler
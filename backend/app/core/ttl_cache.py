@@ -0,0 +1,93 @@
+"""
+Ограниченный in-process кэш с TTL и вытеснением LRU.
+
+Почему свой, а не functools.lru_cache:
+- Нужен TTL (данные из БД устаревают) и точечная инвалидация по ключу
+- Нужна статистика попаданий для метрик
+
+Кэш живёт в памяти одного процесса: каждый воркер держит свою копию,
+поэтому TTL — верхняя граница устаревания между воркерами.
+Не потокобезопасен — рассчитан на event loop (один поток).
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+
+@dataclass
+class CacheStats:
+    """Счётчики кэша (с момента создания или reset_stats)."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLCache[K: Hashable, V]:
+    """
+    Кэш на OrderedDict: порядок = давность использования, значение хранится вместе
+    с моментом истечения (time.monotonic). При переполнении вытесняется самый старый.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        ttl_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """Значение по ключу или None (нет, истекло или кэш выключен)."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def set(self, key: K, value: V, *, ttl_seconds: float | None = None) -> None:
+        """Положить значение; ttl_seconds переопределяет TTL кэша (но не больше него)."""
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        self._data[key] = (self._clock() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.stats.evictions += 1
+
+    def pop(self, key: K) -> None:
+        """Инвалидировать ключ (нет ключа — no-op)."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def reset_stats(self) -> None:
+        self.stats = CacheStats()
@@ -1,9 +1,15 @@
 from dataclasses import dataclass
 
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
 
+from app.core.cache_invalidation import track_cache_tags
 from app.core.repositories import (
+    ArchiveRepository,
     BookingRepository,
+    EmailOutboxRepository,
+    MagicLinkTokenRepository,
     OrderRepository,
     RefreshTokenRepository,
     ScheduleRepository,
@@ -12,6 +18,7 @@ from app.core.repositories import (
     StudioRepository,
     UserRepository,
 )
+from app.core.tracing import traced
 
 
 @dataclass
@@ -21,6 +28,8 @@ class UnitOfWork:
 
     Содержит сессию и репозитории; сервисы получают uow и используют
     uow.bookings, uow.users и т.д. для выборок, uow.session для add/delete/flush.
+    После commit изменённые сущности инвалидируют кэш приложения по тегам
+    (app.core.cache_invalidation).
     """
 
     session: AsyncSession
@@ -32,16 +41,65 @@ class UnitOfWork:
     schedules: ScheduleRepository
     refresh_tokens: RefreshTokenRepository
     orders: OrderRepository
+    email_outbox: EmailOutboxRepository
+    magic_links: MagicLinkTokenRepository
+    archive: ArchiveRepository
 
+    @property
+    def has_writes(self) -> bool:
+        """Были ли в транзакции записи (flush, INSERT/UPDATE/DELETE) или есть несброшенные."""
+        session = self.session
+        return bool(
+            session.info.get(_WRITES_KEY) or session.new or session.dirty or session.deleted
+        )
+
+    @traced
     async def commit(self) -> None:
+        """
+        Зафиксировать транзакцию, если в ней были записи.
+
+        Чистое чтение не коммитим: соединение вернётся в пул при закрытии сессии
+        (пул сам откатит транзакцию). Если запросов не было вовсе, соединение
+        из пула не бралось — AsyncSession берёт его лениво, на первом execute.
+        """
+        if not self.has_writes:
+            return
         await self.session.commit()
+        self.session.info[_WRITES_KEY] = False
 
     async def rollback(self) -> None:
         await self.session.rollback()
+        self.session.info[_WRITES_KEY] = False
+
+
+_WRITES_KEY = "uow_has_writes"
+_TRACKED_KEY = "uow_tracks_writes"
+
+
+def _mark_flush(session: Session, flush_context: object) -> None:
+    session.info[_WRITES_KEY] = True
+
+
+def _mark_write_statement(state: ORMExecuteState) -> None:
+    # Всё, что не SELECT (UPDATE/DELETE/INSERT, text()), считаем записью.
+    if not state.is_select:
+        state.session.info[_WRITES_KEY] = True
+
+
+def _track_writes(session: AsyncSession) -> None:
+    """Подписаться на события сессии один раз (несколько UoW могут делить сессию)."""
+    sync_session = session.sync_session
+    if sync_session.info.get(_TRACKED_KEY):
+        return
+    event.listen(sync_session, "after_flush", _mark_flush)
+    event.listen(sync_session, "do_orm_execute", _mark_write_statement)
+    sync_session.info[_TRACKED_KEY] = True
 
 
 def create_uow(session: AsyncSession) -> UnitOfWork:
     """Фабрика UoW: создаёт репозитории с одной и той же сессией."""
+    _track_writes(session)
+    track_cache_tags(session.sync_session)
     return UnitOfWork(
         session=session,
         bookings=BookingRepository(session),
@@ -52,4 +110,7 @@ def create_uow(session: AsyncSession) -> UnitOfWork:
         schedules=ScheduleRepository(session),
         refresh_tokens=RefreshTokenRepository(session),
         orders=OrderRepository(session),
+        email_outbox=EmailOutboxRepository(session),
+        magic_links=MagicLinkTokenRepository(session),
+        archive=ArchiveRepository(session),
     )
@@ -0,0 +1,210 @@
+"""
+Startup warm-up: pay connection, SQL-compilation and serializer costs before traffic.
+
+Without it the first requests after a deploy or scale-up pay, all at once, for
+TCP+TLS+auth to Postgres, SQLAlchemy statement compilation and pydantic
+schema builds — a multi-second p99 spike. `Warmup.start` (lifespan,
+`WARMUP_ENABLED`) runs in the background:
+
+1. opens `pool_connections` connections per engine in parallel and returns them
+   to the pool, so early requests check out an open connection;
+2. runs the hottest repository reads once (`run_hot_reads`, LIMIT-bounded, in a
+   read-only transaction) so their statements sit in SQLAlchemy's compiled cache;
+3. builds the TypeAdapters `typed_json_response` uses for every route's
+   response model.
+
+While it runs, `/health/ready` answers 503 `warming_up`, keeping the instance
+out of rotation. A failed step is logged and skipped: the regular readiness
+checks still decide whether the instance can serve.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+import types
+import typing
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from typing import Any
+
+import structlog
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.responses import prime_adapters
+from app.core.uow import UnitOfWork, create_uow
+
+HotReads = Callable[[UnitOfWork], Awaitable[None]]
+
+
+async def run_hot_reads(uow: UnitOfWork) -> None:
+    """
+    Statements behind the busiest endpoints, in the shapes requests use.
+
+    The compiled cache keys on statement structure, not values: an id that
+    matches nothing compiles the same SQL as a real one.
+    """
+    await uow.studios.list_rows(limit=1, is_active=True)
+    await uow.studios.count(is_active=True)
+    await uow.studios.get_by_id(0)
+    await uow.slots.list_rows(limit=1, studio_id=0)
+    await uow.slots.list_rows(limit=1)
+    await uow.slots.get_by_id(0)
+    await uow.services.list_active_rows_by_studio_ids([0])
+    await uow.bookings.list_my_rows(limit=1, user_id=0, user_email="")
+    await uow.bookings.count_confirmed_by_slot(0)
+    await uow.users.get_by_id(0)
+
+
+def _api_routes(routes: Iterable[Any]) -> Iterable[APIRoute]:
+    for route in routes:
+        if isinstance(route, APIRoute):
+            yield route
+            continue
+        # Newer FastAPI keeps included routers as nested route objects.
+        nested = getattr(getattr(route, "original_router", route), "routes", None)
+        if nested:
+            yield from _api_routes(nested)
+
+
+def response_types(app: FastAPI) -> list[Any]:
+    """Response models of all API routes; `A | B` contributes both arms."""
+    found: list[Any] = []
+    for route in _api_routes(app.routes):
+        model = route.response_model
+        if model is None:
+            continue
+        if typing.get_origin(model) in (typing.Union, types.UnionType):
+            found.extend(typing.get_args(model))
+        else:
+            found.append(model)
+    return found
+
+
+class Warmup:
+    """
+    Background warm-up task plus the state readiness checks read.
+
+    `pending` is True while it runs; `outcome` is "ok", "timeout" or "failed"
+    once it has finished (None if it never ran).
+    """
+
+    def __init__(self) -> None:
+        self.pending = False
+        self.outcome: str | None = None
+        self.duration_seconds: float | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def start(
+        self,
+        app: FastAPI,
+        *,
+        engines: Sequence[AsyncEngine],
+        session_factories: Sequence[Callable[[], AsyncSession]],
+        pool_connections: int,
+        timeout: float,
+        hot_reads: HotReads = run_hot_reads,
+    ) -> None:
+        """Start on the running loop; `pending` stays True until it finishes."""
+        self.pending = True
+        self._task = asyncio.create_task(
+            self._run(
+                app,
+                engines=engines,
+                session_factories=session_factories,
+                pool_connections=pool_connections,
+                timeout=timeout,
+                hot_reads=hot_reads,
+            ),
+            name="startup_warmup",
+        )
+
+    async def stop(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+        self.pending = False
+
+    async def _run(
+        self,
+        app: FastAPI,
+        *,
+        engines: Sequence[AsyncEngine],
+        session_factories: Sequence[Callable[[], AsyncSession]],
+        pool_connections: int,
+        timeout: float,
+        hot_reads: HotReads,
+    ) -> None:
+        logger = structlog.get_logger(__name__)
+        started = time.perf_counter()
+        steps: dict[str, Any] = {}
+        try:
+            async with asyncio.timeout(timeout):
+                steps["connections"] = sum(
+                    await asyncio.gather(*(open_connections(e, pool_connections) for e in engines))
+                )
+                steps["hot_reads"] = await _hot_reads(session_factories, hot_reads)
+                steps["serializers"] = prime_adapters(response_types(app))
+            self.outcome = "ok"
+        except TimeoutError:
+            self.outcome = "timeout"
+            logger.warning("warmup_timeout", timeout_seconds=timeout, **steps)
+        except Exception as e:
+            self.outcome = "failed"
+            logger.warning("warmup_failed", error_type=type(e).__name__, **steps)
+        finally:
+            self.duration_seconds = time.perf_counter() - started
+            self.pending = False
+        logger.info(
+            "warmup_finished",
+            outcome=self.outcome,
+            duration_ms=round(self.duration_seconds * 1000, 1),
+            **steps,
+        )
+
+
+async def open_connections(engine: AsyncEngine, count: int) -> int:
+    """Open up to `count` connections at once, then return them to the pool; how many opened."""
+    if count <= 0:
+        return 0
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(count)), return_exceptions=True
+    )
+    opened = [c for c in results if not isinstance(c, BaseException)]
+    try:
+        await asyncio.gather(*(c.execute(text("SELECT 1")) for c in opened))
+    finally:
+        await asyncio.gather(*(c.close() for c in opened), return_exceptions=True)
+    if len(opened) < count:
+        error = next(r for r in results if isinstance(r, BaseException))
+        structlog.get_logger(__name__).warning(
+            "warmup_connections_failed",
+            failed=count - len(opened),
+            error_type=type(error).__name__,
+        )
+    return len(opened)
+
+
+async def _hot_reads(
+    session_factories: Iterable[Callable[[], AsyncSession]], hot_reads: HotReads
+) -> int:
+    """Run `hot_reads` once per session factory (primary, replica); how many succeeded."""
+    done = 0
+    for session_factory in session_factories:
+        try:
+            async with session_factory() as session:
+                await hot_reads(create_uow(session))
+                await session.rollback()
+            done += 1
+        except Exception as e:
+            structlog.get_logger(__name__).warning(
+                "warmup_hot_reads_failed", error_type=type(e).__name__
+            )
+    return done
+
+
+warmup = Warmup()
@@ -12,33 +12,48 @@ import structlog
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi.errors import RateLimitExceeded
-from starlette.middleware.base import BaseHTTPMiddleware
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse
 
+from app.api.metrics import router as metrics_router
 from app.api.v1 import auth, bookings, health, payments, services, slots, studios
 from app.api.v1.endpoints import search
 from app.api.webhooks import router as webhooks_router
+from app.core.background import PeriodicTask
+from app.core.cache import configure_shared_backend
+from app.core.cache_invalidation import create_invalidation_listener
 from app.core.config import settings
-from app.core.database import engine
+from app.core.database import (
+    async_session_maker,
+    engine,
+    read_session_maker,
+    replica_engine,
+    replica_monitor,
+    replica_session_maker,
+)
 from app.core.exceptions import AppError
-from app.core.logging_config import setup_logging
+from app.core.logging_config import setup_logging, shutdown_logging
+from app.core.loop_monitor import LoopMonitor
+from app.core.middleware.admission import (
+    AUTH,
+    BOOKING_WRITES,
+    PUBLIC_READS,
+    WEBHOOKS,
+    AdmissionControlMiddleware,
+    RouteClass,
+)
 from app.core.middleware.logging_middleware import (
     REQUEST_ID_STATE_KEY,
     RequestLoggingMiddleware,
 )
+from app.core.middleware.profiling_middleware import ProfilingMiddleware
 from app.core.rate_limit import limiter
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Add baseline security headers to every response."""
-
-    async def dispatch(self, request: Request, call_next) -> Response:
-        response = await call_next(request)
-        response.headers.setdefault("X-Content-Type-Options", "nosniff")
-        response.headers.setdefault("X-Frame-Options", "DENY")
-        response.headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
-        return response
+from app.core.tracing import configure_tracing, shutdown_tracing
+from app.core.warmup import warmup
+from app.services.archive import run_slot_archive
+from app.services.auth import run_magic_link_purge, run_refresh_token_purge
+from app.services.email import create_outbox_sender
 
 
 # === Lifespan Context Manager ===
@@ -52,12 +67,109 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     """
     Lifespan context manager for DB and logging setup.
 
-    On startup: initialize logging (and optionally run readiness checks).
-    On shutdown: close all DB connections.
+    On startup: initialize logging and tracing, start the event-loop monitor and
+    background tasks (read-replica monitor, refresh-token and magic-link purges,
+    slot archive, email outbox sender, cache invalidation LISTEN) and the warm-up
+    that keeps `/health/ready` at 503 until pool, SQL cache and serializers are warm.
+    On shutdown: stop warm-up and background tasks, close the cache listener, the
+    shared cache and all DB connections, stop the event-loop monitor, then flush
+    spans and logs.
     """
     setup_logging()
+    configure_tracing()
+    loop_monitor = None
+    if settings.EVENT_LOOP_MONITOR_INTERVAL_MS > 0:
+        loop_monitor = LoopMonitor(
+            interval=settings.EVENT_LOOP_MONITOR_INTERVAL_MS / 1000,
+            block_threshold=settings.EVENT_LOOP_BLOCK_THRESHOLD_MS / 1000,
+        )
+        loop_monitor.start()
+    tasks: list[PeriodicTask] = []
+    if replica_monitor.configured:
+        await replica_monitor.check()
+        tasks.append(
+            PeriodicTask(
+                "db_replica_monitor",
+                replica_monitor.check,
+                interval=settings.DATABASE_REPLICA_CHECK_SECONDS,
+            )
+        )
+    if settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS > 0:
+        tasks.append(
+            PeriodicTask(
+                "refresh_token_purge",
+                lambda: run_refresh_token_purge(async_session_maker),
+                interval=settings.REFRESH_TOKEN_PURGE_INTERVAL_SECONDS,
+            )
+        )
+    if settings.MAGIC_LINK_PURGE_INTERVAL_SECONDS > 0:
+        tasks.append(
+            PeriodicTask(
+                "magic_link_purge",
+                lambda: run_magic_link_purge(async_session_maker),
+                interval=settings.MAGIC_LINK_PURGE_INTERVAL_SECONDS,
+            )
+        )
+    if settings.ARCHIVE_INTERVAL_SECONDS > 0:
+        tasks.append(
+            PeriodicTask(
+                "slot_archive",
+                lambda: run_slot_archive(async_session_maker),
+                interval=settings.ARCHIVE_INTERVAL_SECONDS,
+            )
+        )
+    outbox_sender = None
+    if settings.EMAIL_OUTBOX_ENABLED:
+        outbox_sender = create_outbox_sender(async_session_maker)
+        tasks.append(
+            PeriodicTask(
+                "email_outbox_sender",
+                outbox_sender.run_once,
+                interval=settings.EMAIL_OUTBOX_POLL_SECONDS,
+            )
+        )
+    shared_cache = configure_shared_backend(settings.CACHE_SHARED_URI)
+    cache_listener = None
+    if settings.CACHE_NOTIFY_ENABLED:
+        # The first connect happens in the task, so startup never waits on LISTEN.
+        cache_listener = create_invalidation_listener()
+        tasks.append(
+            PeriodicTask(
+                "cache_invalidation_listener",
+                cache_listener.ensure_listening,
+                interval=settings.CACHE_LISTEN_CHECK_SECONDS,
+            )
+        )
+    for task in tasks:
+        task.start()
+    if settings.WARMUP_ENABLED:
+        warmup.start(
+            app,
+            engines=[e for e in (engine, replica_engine) if e is not None],
+            session_factories=[
+                f for f in (read_session_maker, replica_session_maker) if f is not None
+            ],
+            pool_connections=min(settings.WARMUP_POOL_CONNECTIONS, settings.DB_POOL_SIZE),
+            timeout=settings.WARMUP_TIMEOUT_SECONDS,
+        )
     yield
+    await warmup.stop()
+    for task in reversed(tasks):
+        await task.stop()
+    if outbox_sender is not None:
+        await outbox_sender.aclose()
+    if cache_listener is not None:
+        await cache_listener.aclose()
+    if shared_cache is not None:
+        configure_shared_backend("")
+        shared_cache.close()
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    if loop_monitor is not None:
+        await loop_monitor.stop()
+    shutdown_tracing()
+    shutdown_logging()
 
 
 # Use settings from `config.py` instead of hardcoding.
@@ -105,6 +217,7 @@ _STATUS_TITLES: dict[int, str] = {
     422: "Unprocessable Entity",
     429: "Too Many Requests",
     500: "Internal Server Error",
+    503: "Service Unavailable",
 }
 
 
@@ -150,6 +263,22 @@ async def app_error_handler(request: Request, exc: AppError) -> JSONResponse:
     )
 
 
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+    """No DB connection within DB_POOL_TIMEOUT_SECONDS: fast 503 with Retry-After."""
+    request_id = _request_id(request)
+    structlog.get_logger(__name__).warning("db_pool_timeout", request_id=request_id)
+    return JSONResponse(
+        status_code=503,
+        content=_error_body(
+            detail="Server is busy. Please retry shortly.",
+            status_code=503,
+            request_id=request_id,
+            problem_type="overloaded",
+        ),
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+    )
+
+
 async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """Unhandled exception: log traceback and return 500."""
     logger = structlog.get_logger(__name__)
@@ -172,14 +301,56 @@ async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONR
 
 
 app.add_exception_handler(AppError, app_error_handler)
+app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
 app.add_exception_handler(Exception, unhandled_exception_handler)
 
-# === Logging middleware (request_id + request/response logging) ===
-# Add it first so it can wrap all requests (the last added runs first).
-app.add_middleware(RequestLoggingMiddleware)
+# === On-demand profiling (X-Profile: <PROFILING_TOKEN>) ===
+# Added before the request middleware so it runs inside it (request_id is set).
+if settings.PROFILING_ENABLED and settings.PROFILING_TOKEN:
+    app.add_middleware(
+        ProfilingMiddleware,
+        token=settings.PROFILING_TOKEN,
+        output_dir=settings.PROFILING_DIR,
+        sample_interval=settings.PROFILING_SAMPLE_INTERVAL_MS / 1000,
+    )
+
+# === Admission control (per route class budgets, fast 503) ===
+# Inside the request middleware, so rejections are logged with request_id.
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        classes={
+            PUBLIC_READS: RouteClass(
+                settings.ADMISSION_PUBLIC_READS_CONCURRENCY,
+                settings.ADMISSION_PUBLIC_READS_STATEMENT_TIMEOUT_MS,
+            ),
+            BOOKING_WRITES: RouteClass(
+                settings.ADMISSION_BOOKING_WRITES_CONCURRENCY,
+                settings.ADMISSION_BOOKING_WRITES_STATEMENT_TIMEOUT_MS,
+            ),
+            WEBHOOKS: RouteClass(
+                settings.ADMISSION_WEBHOOKS_CONCURRENCY,
+                settings.ADMISSION_WEBHOOKS_STATEMENT_TIMEOUT_MS,
+            ),
+            AUTH: RouteClass(
+                settings.ADMISSION_AUTH_CONCURRENCY,
+                settings.ADMISSION_AUTH_STATEMENT_TIMEOUT_MS,
+            ),
+        },
+        queue_timeout=settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000,
+        retry_after_seconds=settings.ADMISSION_RETRY_AFTER_SECONDS,
+    )
 
-# === Security headers Middleware ===
-app.add_middleware(SecurityHeadersMiddleware)
+# === Request middleware (request_id + logging + security headers) ===
+# One pure-ASGI layer instead of stacked BaseHTTPMiddleware classes.
+# Add it first so it can wrap all requests (the last added runs first).
+app.add_middleware(
+    RequestLoggingMiddleware,
+    sample_rate=settings.LOG_REQUEST_SAMPLE_RATE,
+    slow_request_ms=settings.LOG_SLOW_REQUEST_MS,
+    db_debug_headers=settings.DB_DEBUG_HEADERS or settings.DEBUG,
+    repeated_statement_threshold=settings.DB_REPEATED_STATEMENT_THRESHOLD,
+)
 
 # === CORS middleware ===
 app.add_middleware(
@@ -201,5 +372,6 @@ app.include_router(slots.router, prefix="/api/v1")
 app.include_router(bookings.router, prefix="/api/v1")
 app.include_router(payments.router, prefix="/api/v1")
 app.include_router(webhooks_router)
+app.include_router(metrics_router)
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(search.router, prefix="/api/v1")
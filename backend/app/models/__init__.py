@@ -6,8 +6,11 @@ from app.core.database import Base
 
 # Импортируем все модели для Alembic autogenerate
 # Alembic должен видеть все модели через Base.metadata
+from app.models.archive import BookingArchive, SlotArchive
 from app.models.booking import Booking, BookingStatus, BookingType
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
 from app.models.guest_session import GuestSession
+from app.models.magic_link_token import MagicLinkToken
 from app.models.order import Order, OrderStatus
 from app.models.refresh_token import RefreshToken
 from app.models.schedule import Schedule
@@ -21,10 +24,15 @@ __all__ = [
     "User",
     "Studio",
     "Slot",
+    "SlotArchive",
     "Booking",
+    "BookingArchive",
     "BookingStatus",
     "BookingType",
+    "EmailOutbox",
+    "EmailOutboxStatus",
     "GuestSession",
+    "MagicLinkToken",
     "Order",
     "OrderStatus",
     "Service",
@@ -0,0 +1,90 @@
+"""
+Архив прошедших слотов и их бронирований.
+
+Почему архивные таблицы, а не партиционирование по времени:
+- bookings.slot_id — внешний ключ на slots.id; партиции потребовали бы
+  составных первичных ключей (id, start_time) и переделки всех FK;
+- горячие таблицы нужны только текущим и будущим занятиям: подсчёт мест,
+  list_by_service_active, расписания студий. Репозитории их не меняются.
+
+Фоновая задача (app.services.archive) переносит слоты, закончившиеся раньше
+ARCHIVE_AFTER_DAYS, вместе с их бронированиями в slots_archive / bookings_archive.
+Колонки — копия исходных таблиц (те же имена, типы и id) плюс archived_at;
+внешних ключей нет: архив не мешает удалять студии и пользователей.
+История читается отдельным API (GET /bookings/history, GET /studios/{id}/slots/history).
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Table, func
+from sqlalchemy.orm import Mapped, relationship
+
+from app.models import Base
+from app.models.booking import Booking
+from app.models.slot import Slot
+from app.models.studio import Studio
+
+
+def _archive_table(source: Table, name: str, *indexes: Index) -> Table:
+    """
+    Таблица с колонками `source` + archived_at.
+
+    Без FK, индексов и автоинкремента; все колонки, кроме id, допускают NULL —
+    старые строки (created_at из ранних миграций) переносятся как есть.
+    """
+    columns = [
+        Column(c.name, c.type, primary_key=c.primary_key, autoincrement=False)
+        for c in source.columns
+    ]
+    archived_at = Column(
+        "archived_at", DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    return Table(name, Base.metadata, *columns, archived_at, *indexes)
+
+
+class SlotArchive(Base):
+    """Прошедший слот, перенесённый из slots."""
+
+    __table__ = _archive_table(
+        Slot.__table__,
+        "slots_archive",
+        Index("ix_slots_archive_studio_start", "studio_id", "start_time"),
+    )
+
+    id: Mapped[int]
+    studio_id: Mapped[int]
+    start_time: Mapped[datetime]
+    archived_at: Mapped[datetime]
+
+    studio: Mapped[Studio] = relationship(
+        Studio,
+        primaryjoin="foreign(SlotArchive.studio_id) == Studio.id",
+        viewonly=True,
+    )
+
+
+class BookingArchive(Base):
+    """Бронирование прошедшего слота, перенесённое из bookings."""
+
+    __table__ = _archive_table(
+        Booking.__table__,
+        "bookings_archive",
+        Index("ix_bookings_archive_slot_id", "slot_id"),
+        Index("ix_bookings_archive_user_id", "user_id"),
+        Index("ix_bookings_archive_guest_email", "guest_email"),
+    )
+
+    id: Mapped[int]
+    slot_id: Mapped[int]
+    user_id: Mapped[int | None]
+    guest_email: Mapped[str | None]
+    created_at: Mapped[datetime]
+    archived_at: Mapped[datetime]
+
+    slot: Mapped[SlotArchive] = relationship(
+        SlotArchive,
+        primaryjoin="foreign(BookingArchive.slot_id) == SlotArchive.id",
+        viewonly=True,
+    )
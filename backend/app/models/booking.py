@@ -16,7 +16,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DateTime, ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base
@@ -50,6 +50,21 @@ class Booking(TimestampMixin, Base):
     """
 
     __tablename__ = "bookings"
+    __table_args__ = (
+        # Занятость слотов: slot_id IN (...) + status, reserved_until из индекса.
+        Index(
+            "ix_bookings_slot_status", "slot_id", "status", postgresql_include=["reserved_until"]
+        ),
+        # Активные pending-холды слота.
+        Index(
+            "ix_bookings_pending_hold",
+            "slot_id",
+            "reserved_until",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # «Мои бронирования» гостя по email.
+        Index("ix_bookings_guest_email", "guest_email"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
@@ -0,0 +1,64 @@
+"""
+Модель EmailOutbox — очередь исходящих писем (transactional outbox).
+
+Почему outbox, а не отправка в запросе:
+- Запрос только кладёт письмо в таблицу в той же транзакции (дёшево, без сети)
+- Медленный или недоступный провайдер не превращается в падение API
+- Фоновый отправитель шлёт пачками, с повторами и экспоненциальной задержкой
+
+Статусы:
+- pending: ждёт отправки (или повторной попытки после next_attempt_at)
+- sent: провайдер принял письмо
+- failed: исчерпаны попытки или постоянная ошибка провайдера (4xx)
+"""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Index, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+from app.models.mixins import TimestampMixin
+
+
+class EmailOutboxStatus:
+    """Статусы письма в outbox."""
+
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class EmailOutbox(TimestampMixin, Base):
+    """Письмо, ожидающее отправки фоновым отправителем."""
+
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        # Выборка отправителя: pending + next_attempt_at <= now, по порядку id.
+        Index(
+            "ix_email_outbox_pending_next_attempt",
+            "next_attempt_at",
+            postgresql_where="status = 'pending'",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    to_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    subject: Mapped[str] = mapped_column(String(255), nullable=False)
+    html: Mapped[str] = mapped_column(Text, nullable=False)
+    # Тип письма (magic_link, ...) — для логов и метрик, не для логики отправки
+    kind: Mapped[str] = mapped_column(String(50), nullable=False)
+
+    status: Mapped[str] = mapped_column(
+        String(20), default=EmailOutboxStatus.PENDING, nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    provider_message_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
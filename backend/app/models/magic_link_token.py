@@ -0,0 +1,45 @@
+"""
+Модель MagicLinkToken — выданные, но ещё не использованные ссылки для входа.
+
+Почему отдельная таблица, а не поля users.magic_link_*:
+- Проверка ссылки — поиск по уникальному индексу token_hash, а не скан users
+- У пользователя может быть несколько действующих ссылок (разные устройства,
+  повторный запрос письма не ломает предыдущую ссылку)
+- Просроченные строки удаляет фоновая чистка (по индексу expires_at)
+
+Храним только HMAC-хэш токена (см. hash_magic_link_token), сам токен — в письме.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+class MagicLinkToken(Base):
+    """Одноразовая ссылка для входа; удаляется при использовании."""
+
+    __tablename__ = "magic_link_tokens"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base
@@ -19,6 +19,21 @@ class RefreshToken(Base):
     """
 
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Поиск активной сессии при refresh/logout; отозванные строки не индексируются.
+        Index(
+            "ix_refresh_tokens_active_user_jti",
+            "user_id",
+            "jti",
+            postgresql_where=text("revoked_at IS NULL"),
+        ),
+        # Очистка отозванных (purge_stale): вместе с ix_refresh_tokens_expires_at — BitmapOr.
+        Index(
+            "ix_refresh_tokens_revoked_at_not_null",
+            "revoked_at",
+            postgresql_where=text("revoked_at IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
@@ -48,7 +63,6 @@ class RefreshToken(Base):
     revoked_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
         nullable=True,
-        index=True,
     )
     last_used_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
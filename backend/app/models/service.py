@@ -10,7 +10,7 @@ from __future__ import annotations
 
 import enum
 
-from sqlalchemy import JSON, Enum, Float, ForeignKey, Integer, String
+from sqlalchemy import JSON, Enum, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base
@@ -46,11 +46,20 @@ class Service(TimestampMixin, Base):
     """
 
     __tablename__ = "services"
+    __table_args__ = (
+        # Активные услуги студий с фильтром по категории.
+        Index("ix_services_studio_active_category", "studio_id", "is_active", "category"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
     # Привязка к студии
-    studio_id: Mapped[int] = mapped_column(ForeignKey("studios.id"), nullable=False, index=True)
+    studio_id: Mapped[int] = mapped_column(
+        ForeignKey("studios.id"),
+        nullable=False,
+        index=True,
+        info={"cache_parent_tag": True},  # изменение инвалидирует и "studio:<id>"
+    )
 
     # Основная информация
     name: Mapped[str] = mapped_column(String(200), nullable=False)
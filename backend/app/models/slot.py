@@ -17,7 +17,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base
@@ -40,11 +40,28 @@ class Slot(TimestampMixin, Base):
     """
 
     __tablename__ = "slots"
+    __table_args__ = (
+        # Расписание студии по времени.
+        Index("ix_slots_studio_start", "studio_id", "start_time"),
+        # list_by_service_active: фильтр + ORDER BY start_time из одного индекса.
+        Index(
+            "ix_slots_service_status_active_start",
+            "service_id",
+            "status",
+            "is_active",
+            "start_time",
+        ),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, index=True)
 
     # Связь со студией
-    studio_id: Mapped[int] = mapped_column(ForeignKey("studios.id"), nullable=False, index=True)
+    studio_id: Mapped[int] = mapped_column(
+        ForeignKey("studios.id"),
+        nullable=False,
+        index=True,
+        info={"cache_parent_tag": True},  # изменение инвалидирует и "studio:<id>"
+    )
 
     # Связь с услугой и шаблоном расписания
     service_id: Mapped[int | None] = mapped_column(
@@ -9,7 +9,7 @@
 
 from __future__ import annotations
 
-from sqlalchemy import Float, ForeignKey, String, Text
+from sqlalchemy import Float, ForeignKey, Index, String, Text, func
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -78,3 +78,7 @@ class Studio(TimestampMixin, Base):
         back_populates="studio",
         cascade="all, delete-orphan",
     )
+
+
+# Фильтр по городу без учёта регистра: func.lower(Studio.city) == ...
+Index("ix_studios_lower_city", func.lower(Studio.city))
@@ -40,17 +40,8 @@ class User(TimestampMixin, Base):
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     phone: Mapped[str | None] = mapped_column(String(20), nullable=True)
 
-    # Аутентификация (для Magic Link)
+    # Аутентификация (для Magic Link; сами ссылки — в magic_link_tokens)
     is_active: Mapped[bool] = mapped_column(default=True)  # Аккаунт активирован через Magic Link
-    magic_link_token: Mapped[str | None] = mapped_column(
-        String(255),
-        nullable=True,
-        index=True,
-    )  # Хэш токена для Magic Link
-    magic_link_expires_at: Mapped[datetime | None] = mapped_column(
-        DateTime(timezone=True),
-        nullable=True,
-    )  # Срок действия токена (UTC)
 
     # Временные поля авторизации
     last_login_at: Mapped[datetime | None] = mapped_column(
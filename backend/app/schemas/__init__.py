@@ -5,11 +5,11 @@ from app.schemas.booking import (
     BookingCancel,
     BookingCreate,
     BookingCreateAuthenticated,
+    BookingListItem,
     BookingResponse,
     BookingUpdate,
     BookingWithSlot,
     BookingWithUser,
-    BookingListItem,
 )
 from app.schemas.guest_session import (
     GuestSessionBase,
@@ -52,6 +52,7 @@ from app.schemas.slot import (
 from app.schemas.studio import (
     StudioBase,
     StudioCreate,
+    StudioListItem,
     StudioResponse,
     StudioUpdate,
     StudioWithSlots,
@@ -82,6 +83,7 @@ __all__ = [
     "StudioCreate",
     "StudioUpdate",
     "StudioResponse",
+    "StudioListItem",
     "StudioWithSlots",
     "StudioPublicResponse",
     # Slot
@@ -10,7 +10,7 @@ from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from app.models.booking import BookingType
 from app.schemas.slot import SlotResponse
-from app.schemas.studio import StudioResponse
+from app.schemas.studio import StudioListItem
 
 
 class BookingBase(BaseModel):
@@ -102,7 +102,7 @@ class BookingListItem(BookingResponse):
     """
 
     slot: SlotResponse = Field(..., description="Информация о слоте")
-    studio: StudioResponse = Field(..., description="Информация о студии")
+    studio: StudioListItem = Field(..., description="Информация о студии")
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -8,7 +8,7 @@ from pydantic import BaseModel, Field
 
 from app.models import ServiceCategory
 from app.schemas.service import ServiceResponse
-from app.schemas.studio import StudioResponse
+from app.schemas.studio import StudioListItem
 
 
 class SearchQueryParams(BaseModel):
@@ -52,5 +52,5 @@ class SearchQueryParams(BaseModel):
 class SearchResult(BaseModel):
     """Результат поиска: студия + подходящие услуги."""
 
-    studio: StudioResponse
+    studio: StudioListItem
     matched_services: list[ServiceResponse]
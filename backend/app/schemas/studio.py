@@ -53,6 +53,14 @@ class StudioResponse(StudioBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class StudioListItem(StudioResponse):
+    """Студия в списках (GET /studios, поиск, кабинет бронирований)."""
+
+    # Email проверен при записи (StudioCreate/StudioUpdate); повторная проверка
+    # email-validator на каждой студии в списке стоила дороже всей остальной схемы.
+    email: str | None = Field(None, description="Email студии")
+
+
 class StudioWithSlots(StudioResponse):
     """Студия с количеством слотов (для списков)."""
 
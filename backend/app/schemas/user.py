@@ -7,7 +7,7 @@ Pydantic schemas для User модели.
 - UserResponse: данные для ответа API (включая id, timestamps)
 
 Почему отдельные схемы:
-- Безопасность: не возвращаем внутренние поля (magic_link_token)
+- Безопасность: не возвращаем внутренние поля (is_active управляется сервером)
 - Валидация: разные правила для создания и обновления
 - Гибкость: можем добавлять вычисляемые поля в Response
 """
@@ -0,0 +1,100 @@
+"""
+Бенчмарк read-path списков: ORM-объекты (list_) против строк Core (list_rows).
+
+Для каждой выборки — страница `--limit` строк, как в GET /slots и GET /studios:
+- CPU на строку: time.process_time() за выборку + model_validate в схему ответа
+  (сеть и ожидание Postgres в CPU процесса почти не попадают);
+- память на строку: прирост tracemalloc, пока страница и сессия живы
+  (для ORM сюда входят identity map и состояние объектов).
+Каждая итерация — новая сессия, как у запроса.
+
+Нужна БД с данными (например, после seed_100_studios и генерации расписаний).
+
+Запуск (из директории backend):
+    uv run python -m app.scripts.bench_list_rows
+    uv run python -m app.scripts.bench_list_rows --limit 100 --iterations 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import async_session_maker, engine
+from app.core.repositories import SlotRepository, StudioRepository
+from app.schemas import SlotResponse, StudioListItem
+
+Fetch = Callable[[AsyncSession], Awaitable[list[Any]]]
+
+
+async def _measure(fetch: Fetch, schema: type[BaseModel], iterations: int) -> tuple[float, float]:
+    """(мкс CPU на строку, байт на строку); память — отдельным проходом под tracemalloc."""
+    cpu = 0.0
+    rows_total = 0
+    for _ in range(iterations):
+        async with async_session_maker() as session:
+            started = time.process_time()
+            rows = await fetch(session)
+            [schema.model_validate(r) for r in rows]
+            cpu += time.process_time() - started
+            rows_total += len(rows)
+
+    memory_runs = min(iterations, 10)
+    bytes_total = 0
+    memory_rows = 0
+    for _ in range(memory_runs):
+        async with async_session_maker() as session:
+            tracemalloc.start()
+            rows = await fetch(session)
+            [schema.model_validate(r) for r in rows]
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            bytes_total += current
+            memory_rows += len(rows)
+    return cpu / max(rows_total, 1) * 1e6, bytes_total / max(memory_rows, 1)
+
+
+async def main(args: argparse.Namespace) -> None:
+    limit = args.limit
+    cases: list[tuple[str, type[BaseModel], Fetch, Fetch]] = [
+        (
+            "slots",
+            SlotResponse,
+            lambda s: SlotRepository(s).list_(limit=limit),
+            lambda s: SlotRepository(s).list_rows(limit=limit),
+        ),
+        (
+            "studios",
+            StudioListItem,
+            lambda s: StudioRepository(s).list_(limit=limit, is_active=True),
+            lambda s: StudioRepository(s).list_rows(limit=limit, is_active=True),
+        ),
+    ]
+    print(f"[bench] page={limit} rows, iterations={args.iterations}")
+    for name, schema, orm_fetch, rows_fetch in cases:
+        # Прогрев: кэш компиляции SQL и prepared statements asyncpg.
+        await _measure(orm_fetch, schema, 3)
+        await _measure(rows_fetch, schema, 3)
+        orm_us, orm_bytes = await _measure(orm_fetch, schema, args.iterations)
+        rows_us, rows_bytes = await _measure(rows_fetch, schema, args.iterations)
+        print(
+            f"[bench] {name:<8} orm:  {orm_us:6.1f} us/row {orm_bytes:8.0f} B/row\n"
+            f"[bench] {name:<8} rows: {rows_us:6.1f} us/row {rows_bytes:8.0f} B/row "
+            f"({orm_us / max(rows_us, 1e-9):.1f}x less CPU, "
+            f"{orm_bytes / max(rows_bytes, 1):.1f}x less memory)"
+        )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ORM vs Core rows for list endpoints")
+    parser.add_argument("--limit", type=int, default=100, help="Rows per page")
+    parser.add_argument("--iterations", type=int, default=100, help="Pages per measurement")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,161 @@
+"""
+Бенчмарк middleware: прежние два слоя BaseHTTPMiddleware (логирование + security
+headers) против одного pure-ASGI RequestLoggingMiddleware.
+
+Приложение — настоящее app.main.app, запросы идут в процессе через
+httpx.ASGITransport (`--concurrency` клиентов, `--duration` секунд на прогон),
+так что в цифрах только стек FastAPI/middleware, без сети и uvicorn.
+БД не нужна: проверка /health и UoW для /api/v1/studios подменены заглушками.
+
+Запуск (из директории backend):
+    SECRET_KEY=bench uv run python -m app.scripts.bench_middleware
+    SECRET_KEY=bench uv run python -m app.scripts.bench_middleware --concurrency 32 --duration 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+import structlog
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.api.deps import get_read_uow
+from app.api.v1 import health
+from app.core.middleware.logging_middleware import (
+    REQUEST_ID_HEADER,
+    REQUEST_ID_STATE_KEY,
+    RequestLoggingMiddleware,
+    _get_request_id,
+)
+from app.main import app
+from app.models.studio import Studio
+
+
+class _LegacyRequestLogging(BaseHTTPMiddleware):
+    """Прежний RequestLoggingMiddleware (до перехода на pure ASGI)."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        logger = structlog.get_logger(__name__)
+        request_id = _get_request_id(request.scope)
+        setattr(request.state, REQUEST_ID_STATE_KEY, request_id)
+        start = time.perf_counter()
+        structlog.contextvars.bind_contextvars(request_id=request_id)
+        try:
+            response = await call_next(request)
+            logger.info(
+                "request_finished",
+                method=request.method,
+                path=request.url.path,
+                status=response.status_code,
+                duration_ms=(time.perf_counter() - start) * 1000,
+                request_id=request_id,
+                user_id=getattr(request.state, "user_id", None),
+            )
+            if REQUEST_ID_HEADER not in response.headers:
+                response.headers[REQUEST_ID_HEADER] = request_id
+            return response
+        finally:
+            structlog.contextvars.clear_contextvars()
+
+
+class _LegacySecurityHeaders(BaseHTTPMiddleware):
+    """Прежний SecurityHeadersMiddleware из main.py."""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        response = await call_next(request)
+        response.headers.setdefault("X-Content-Type-Options", "nosniff")
+        response.headers.setdefault("X-Frame-Options", "DENY")
+        response.headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
+        return response
+
+
+def _studios(count: int) -> list[Studio]:
+    now = datetime.now(UTC)
+    return [
+        Studio(
+            id=i,
+            owner_id=1,
+            name=f"Studio {i}",
+            city="Dublin",
+            amenities=["shower"],
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def _use_stack(middleware: list[Middleware]) -> None:
+    app.user_middleware = middleware
+    app.middleware_stack = None  # Starlette пересоберёт стек на следующем запросе
+
+
+async def _rps(path: str, args: argparse.Namespace) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.get(path)  # прогрев + сборка стека
+        done = 0
+        deadline = time.perf_counter() + args.duration
+
+        async def worker() -> None:
+            nonlocal done
+            while time.perf_counter() < deadline:
+                response = await client.get(path)
+                response.raise_for_status()
+                done += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        return done / (time.perf_counter() - started)
+
+
+async def main(args: argparse.Namespace) -> None:
+    # Логи проходят через structlog, но никуда не пишутся — мерим middleware, не stdout.
+    structlog.configure(logger_factory=structlog.ReturnLoggerFactory())
+    studios = _studios(args.studios)
+    stub_uow = SimpleNamespace(
+        studios=SimpleNamespace(list_rows=_returning(studios), count=_returning(len(studios)))
+    )
+
+    async def stub_read_uow():
+        yield stub_uow
+
+    app.dependency_overrides[get_read_uow] = stub_read_uow
+    others = [m for m in app.user_middleware if m.cls is not RequestLoggingMiddleware]
+    stacks = {
+        "before (2x BaseHTTPMiddleware)": others
+        + [Middleware(_LegacySecurityHeaders), Middleware(_LegacyRequestLogging)],
+        "after (pure ASGI)": others + [Middleware(RequestLoggingMiddleware)],
+    }
+    with patch.object(health, "_check_database", _returning(True)):
+        for path in ("/health", "/api/v1/studios"):
+            for name, middleware in stacks.items():
+                _use_stack(middleware)
+                rps = await _rps(path, args)
+                print(f"[bench] {path} {name}: {rps:,.0f} req/s")
+    app.dependency_overrides.pop(get_read_uow, None)
+
+
+def _returning(value):
+    async def stub(*_args, **_kwargs):
+        return value
+
+    return stub
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Middleware stack benchmark")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per run")
+    parser.add_argument("--studios", type=int, default=20, help="Studios in list response")
+    asyncio.run(main(parser.parse_args()))
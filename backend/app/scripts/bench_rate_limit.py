@@ -0,0 +1,95 @@
+"""
+Бенчмарк хранилищ rate limit (RATE_LIMIT_STORAGE_URI).
+
+Для каждого backend меряет стоимость одной проверки лимита (hit fixed-window,
+как в slowapi) в одном процессе, затем — `--workers` процессов, бьющих в один
+ключ одновременно: задержка p50/p99 и итоговый счётчик (должен совпасть с
+числом запросов — иначе воркеры не делят лимит).
+
+Запуск (из директории backend):
+    SECRET_KEY=bench uv run python -m app.scripts.bench_rate_limit
+    SECRET_KEY=bench uv run python -m app.scripts.bench_rate_limit --workers 8 --redis redis://localhost:6379
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from limits import RateLimitItemPerMinute
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+from app.core import rate_limit_storage  # noqa: F401 — схема sqlite://
+
+LIMIT = RateLimitItemPerMinute(10**9)
+
+
+def _hit_latencies(uri: str, key: str, count: int) -> list[float]:
+    limiter = FixedWindowRateLimiter(storage_from_string(uri))
+    latencies = []
+    for _ in range(count):
+        started = time.perf_counter()
+        limiter.hit(LIMIT, key)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _worker(uri: str, key: str, count: int, queue: multiprocessing.Queue) -> None:
+    queue.put(_hit_latencies(uri, key, count))
+
+
+def _report(name: str, latencies: list[float]) -> str:
+    ordered = sorted(latencies)
+    p99 = ordered[int(len(ordered) * 0.99) - 1]
+    return f"[bench] {name}: p50={statistics.median(ordered) * 1e3:.3f} ms p99={p99 * 1e3:.3f} ms"
+
+
+def bench(name: str, uri: str, args: argparse.Namespace) -> None:
+    storage = storage_from_string(uri)
+    storage.reset()
+    print(_report(f"{name} single process", _hit_latencies(uri, "bench:single", args.requests)))
+
+    if name == "memory":
+        print("[bench] memory: per-process counters, multi-worker run skipped")
+        return
+    key = "bench:shared"
+    queue: multiprocessing.Queue = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=_worker, args=(uri, key, args.requests, queue))
+        for _ in range(args.workers)
+    ]
+    for p in procs:
+        p.start()
+    latencies = [lat for _ in procs for lat in queue.get()]
+    for p in procs:
+        p.join()
+    expected = args.workers * args.requests
+    shared = FixedWindowRateLimiter(storage).get_window_stats(LIMIT, key)
+    counted = LIMIT.amount - shared.remaining
+    print(_report(f"{name} {args.workers} workers", latencies))
+    print(f"[bench] {name}: shared counter={counted} expected={expected}")
+
+
+def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "memory": "memory://",
+            "sqlite": f"sqlite:///{Path(tmp) / 'ratelimit.db'}",
+        }
+        if args.redis:
+            backends["redis"] = args.redis
+        for name, uri in backends.items():
+            bench(name, uri, args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rate-limit storage benchmark")
+    parser.add_argument("--requests", type=int, default=5000, help="Hits per process")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent processes")
+    parser.add_argument("--redis", default=None, help="Also bench this redis:// URI")
+    main(parser.parse_args())
@@ -0,0 +1,185 @@
+"""
+Бенчмарк сериализации ответов: штатный путь FastAPI (response_model) против
+typed_json_response (app.core.responses).
+
+Два самых больших списка API:
+- GET /studios?include_services=true — `--studios` карточек SearchResult
+  по `--services` услуг: прежний обработчик собирал модели, а FastAPI валидировал
+  их второй раз; теперь строки валидируются один раз при сериализации;
+- GET /bookings/my — `--studios` строк BookingListItem со вложенными slot и studio.
+
+Оба варианта — маршруты отдельного FastAPI-приложения без middleware, запросы идут
+в процессе через httpx.ASGITransport; БД не нужна, данные собираются в памяти.
+Печатается время на запрос и размер тела (тела обоих вариантов сравниваются).
+
+Запуск (из директории backend):
+    SECRET_KEY=bench uv run python -m app.scripts.bench_serialization
+    SECRET_KEY=bench uv run python -m app.scripts.bench_serialization --studios 100 --services 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.responses import typed_json_response
+from app.schemas import BookingListItem, SearchResult, ServiceResponse, StudioListItem
+
+NOW = datetime(2026, 5, 10, 18, 0, tzinfo=UTC)
+
+
+def _studio(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=i,
+        owner_id=i,
+        name=f"Studio {i}",
+        description="Yoga, pilates and boxing in the city centre. " * 3,
+        email=f"studio{i}@example.com",
+        phone="+353100000",
+        address=f"{i} Main Street",
+        city="Dublin",
+        latitude=53.35,
+        longitude=-6.26,
+        amenities=["shower", "parking", "mats"],
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def _service(studio_id: int, j: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=studio_id * 100 + j,
+        studio_id=studio_id,
+        name=f"Class {j}",
+        description="Beginner friendly class",
+        type="single_class",
+        category="yoga",
+        duration_minutes=60,
+        max_capacity=12,
+        price_single_cents=1500,
+        price_course_cents=None,
+        soft_limit_ratio=1.0,
+        hard_limit_ratio=1.5,
+        max_overbooked_ratio=0.3,
+        tags=["beginner", "evening"],
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def _booking(i: int) -> SimpleNamespace:
+    slot = SimpleNamespace(
+        id=i,
+        studio_id=i,
+        start_time=NOW,
+        end_time=NOW,
+        title=f"Class {i}",
+        description=None,
+        max_capacity=12,
+        price_cents=1500,
+        course_price_cents=None,
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    return SimpleNamespace(
+        id=i,
+        slot_id=i,
+        user_id=1,
+        guest_session_id=None,
+        guest_name="Guest",
+        guest_email="guest@example.com",
+        guest_phone=None,
+        status="confirmed",
+        checkout_session_id=f"cs_{i}",
+        payment_intent_id=f"pi_{i}",
+        payment_status="succeeded",
+        created_at=NOW,
+        updated_at=NOW,
+        cancelled_at=None,
+        slot=slot,
+        studio=_studio(i),
+    )
+
+
+def _search_results(studios: list, services: dict[int, list]) -> list[SearchResult]:
+    # Прежний list_studios(include_services=True): модели собирались в обработчике.
+    return [
+        SearchResult(
+            studio=StudioListItem.model_validate(s),
+            matched_services=[ServiceResponse.model_validate(svc) for svc in services[s.id]],
+        )
+        for s in studios
+    ]
+
+
+def build_app(args: argparse.Namespace) -> FastAPI:
+    studios = [_studio(i) for i in range(1, args.studios + 1)]
+    services = {s.id: [_service(s.id, j) for j in range(args.services)] for s in studios}
+    bookings = [_booking(i) for i in range(1, args.studios + 1)]
+    app = FastAPI()
+
+    @app.get("/default/search", response_model=list[SearchResult])
+    async def default_search():
+        return _search_results(studios, services)
+
+    @app.get("/typed/search", response_model=list[SearchResult])
+    async def typed_search():
+        results = [{"studio": s, "matched_services": services[s.id]} for s in studios]
+        return typed_json_response(list[SearchResult], results)
+
+    @app.get("/default/my", response_model=list[BookingListItem])
+    async def default_my():
+        return bookings
+
+    @app.get("/typed/my", response_model=list[BookingListItem])
+    async def typed_my():
+        return typed_json_response(list[BookingListItem], bookings)
+
+    return app
+
+
+async def _per_request_ms(client: httpx.AsyncClient, path: str, number: int) -> float:
+    await client.get(path)  # прогрев: сборка схем и TypeAdapter
+    best = float("inf")
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(number):
+            (await client.get(path)).raise_for_status()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best * 1e3
+
+
+async def main(args: argparse.Namespace) -> None:
+    app = build_app(args)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name in ("search", "my"):
+            default_body = (await client.get(f"/default/{name}")).content
+            typed_body = (await client.get(f"/typed/{name}")).content
+            same = json.loads(default_body) == json.loads(typed_body)
+            default_ms = await _per_request_ms(client, f"/default/{name}", args.number)
+            typed_ms = await _per_request_ms(client, f"/typed/{name}", args.number)
+            print(
+                f"[bench] {name:<6} body={len(typed_body) / 1024:.0f}kB same_json={same}\n"
+                f"[bench] {name:<6} response_model: {default_ms:6.2f} ms/request\n"
+                f"[bench] {name:<6} typed_json:     {typed_ms:6.2f} ms/request "
+                f"({default_ms / typed_ms:.1f}x faster)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="response_model vs typed_json_response")
+    parser.add_argument("--studios", type=int, default=100, help="Items per list (page size)")
+    parser.add_argument("--services", type=int, default=8, help="Services per studio card")
+    parser.add_argument("--number", type=int, default=50, help="Requests per timing run")
+    asyncio.run(main(parser.parse_args()))
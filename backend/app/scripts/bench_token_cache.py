@@ -0,0 +1,66 @@
+"""
+Микробенчмарк кэша проверенных access-токенов (app.core.security.access_token_cache).
+
+Сравнивает стоимость полной проверки JWT (python-jose decode + HMAC) со стоимостью
+попадания в кэш и показывает hit rate на модели «дашборды опрашивают API»:
+`--clients` клиентов, каждый делает `--polls` запросов одним токеном.
+
+Запуск (из директории backend):
+    SECRET_KEY=bench uv run python -m app.scripts.bench_token_cache
+    SECRET_KEY=bench uv run python -m app.scripts.bench_token_cache --clients 500 --polls 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import timeit
+
+from app.core.security import (
+    _decode_access_token,
+    access_token_cache,
+    create_access_token,
+    parse_access_token,
+)
+
+
+def _per_call_us(fn, number: int) -> float:
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def main(args: argparse.Namespace) -> None:
+    token = create_access_token(1, "bench@example.com")
+
+    decode_us = _per_call_us(lambda: _decode_access_token(token), args.number)
+    access_token_cache.clear()
+    parse_access_token(token)
+    hit_us = _per_call_us(lambda: parse_access_token(token), args.number)
+    print(f"[bench] full verify: {decode_us:.1f} us/call")
+    print(f"[bench] cache hit:   {hit_us:.1f} us/call ({decode_us / hit_us:.1f}x faster)")
+
+    # Поток запросов: клиенты вперемешку, у каждого свой токен на всё время опроса.
+    tokens = [create_access_token(i, f"user{i}@example.com") for i in range(args.clients)]
+    requests = [t for t in tokens for _ in range(args.polls)]
+    random.Random(0).shuffle(requests)
+    access_token_cache.clear()
+    access_token_cache.reset_stats()
+    started = time.perf_counter()
+    for t in requests:
+        parse_access_token(t)
+    elapsed = time.perf_counter() - started
+    stats = access_token_cache.stats
+    print(
+        f"[bench] polling: requests={len(requests)} clients={args.clients} "
+        f"hit_rate={stats.hit_rate:.3f} evictions={stats.evictions} "
+        f"avg={elapsed / len(requests) * 1e6:.1f} us/request"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Access-token cache microbenchmark")
+    parser.add_argument("--number", type=int, default=20_000, help="Calls per timing run")
+    parser.add_argument("--clients", type=int, default=200, help="Distinct tokens (clients)")
+    parser.add_argument("--polls", type=int, default=30, help="Requests per client")
+    main(parser.parse_args())
@@ -0,0 +1,215 @@
+"""
+Локальный заменитель Resend API для outbox-отправителя (тесты и замер пропускной способности).
+
+Принимает POST /emails в формате Resend и отвечает {"id": ...}. Поведение настраивается:
+- latency — задержка ответа (имитация сетевого round trip провайдера);
+- fail_every — каждый N-й запрос отвечает fail_status (429/5xx — временная ошибка);
+- statuses — фиксированный код ответа для конкретного получателя (например 422).
+
+Запуск (из директории backend):
+    uv run python -m app.scripts.fake_email_provider --port 12112 --latency 0.05
+    RESEND_API_KEY=re_fake RESEND_API_BASE=http://127.0.0.1:12112 uv run uvicorn app.main:app
+
+Замер отправителя без БД (пачки из памяти, реальные HTTP-запросы):
+    uv run python -m app.scripts.fake_email_provider --bench 2000 --latency 0.05 --concurrency 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import threading
+import time
+from datetime import UTC, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+
+class FakeEmailProvider:
+    """HTTP-сервер в фоновом потоке; используется в тестах и из CLI."""
+
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        fail_every: int = 0,
+        fail_status: int = 500,
+        statuses: dict[str, int] | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        self.latency = latency
+        self.fail_every = fail_every
+        self.fail_status = fail_status
+        self.statuses = statuses or {}
+        self.received: list[dict] = []
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def respond(self, body: dict) -> tuple[int, dict]:
+        """Код и тело ответа на одно письмо."""
+        with self._lock:
+            self.requests += 1
+            number = self.requests
+        recipient = (body.get("to") or [""])[0]
+        if recipient in self.statuses:
+            status = self.statuses[recipient]
+            return status, {"statusCode": status, "message": "Rejected by fake provider"}
+        if self.fail_every and number % self.fail_every == 0:
+            return self.fail_status, {"statusCode": self.fail_status, "message": "Try again"}
+        with self._lock:
+            self.received.append(body)
+            email_id = f"fake_email_{next(self._ids):08d}"
+        return 200, {"id": email_id}
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело уходят отдельными write — без этого Nagle + delayed ACK
+            # добавляют ~40 мс к каждому ответу и искажают замер.
+            disable_nagle_algorithm = True
+
+            def do_POST(self) -> None:  # noqa: N802 — http.server API
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                if self.path != "/emails":
+                    self._send(404, {"message": "Unknown path"})
+                    return
+                with server._lock:
+                    server.in_flight += 1
+                    server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+                try:
+                    if server.latency:
+                        time.sleep(server.latency)
+                    status, body = server.respond(json.loads(raw or b"{}"))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+                self._send(status, body)
+
+            def _send(self, status: int, body: dict) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+        return Handler
+
+    def start(self) -> FakeEmailProvider:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+async def _bench(args: argparse.Namespace, provider: FakeEmailProvider) -> None:
+    """Прогнать `--bench` писем через deliver_outbox_batch; outbox — в памяти вместо БД."""
+    from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+    from app.services.email import ResendEmailClient, deliver_outbox_batch
+
+    queue = [
+        EmailOutbox(
+            id=i,
+            to_email=f"user{i}@example.com",
+            subject="Sign in to ZaFrame",
+            html="<p>bench</p>",
+            kind="bench",
+            status=EmailOutboxStatus.PENDING,
+            attempts=0,
+        )
+        for i in range(args.bench)
+    ]
+
+    async def claim_due(*, limit: int, now: datetime) -> list[EmailOutbox]:
+        batch = queue[:limit]
+        del queue[:limit]
+        return batch
+
+    async def flush() -> None:
+        return None
+
+    uow = SimpleNamespace(
+        email_outbox=SimpleNamespace(claim_due=claim_due),
+        session=SimpleNamespace(flush=flush),
+    )
+    client = ResendEmailClient("re_fake", base_url=provider.url, max_connections=args.concurrency)
+    started = time.perf_counter()
+    sent = 0
+    try:
+        while processed := await deliver_outbox_batch(
+            uow,
+            client,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            max_attempts=1,
+            backoff_base_seconds=1,
+            backoff_max_seconds=1,
+            sender="ZaFrame <bench@example.com>",
+            now=datetime.now(UTC),
+        ):
+            sent += processed
+    finally:
+        await client.aclose()
+    elapsed = time.perf_counter() - started
+    rate = sent / elapsed if elapsed > 0 else 0.0
+    print(
+        f"[fake-email] emails={sent} batch={args.batch_size} concurrency={args.concurrency} "
+        f"latency={args.latency}s elapsed={elapsed:.2f}s rate={rate:.0f}/s "
+        f"peak_in_flight={provider.peak_in_flight}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Resend API (POST /emails)")
+    parser.add_argument("--port", type=int, default=12112)
+    parser.add_argument("--latency", type=float, default=0.0, help="Response delay, seconds")
+    parser.add_argument("--fail-every", type=int, default=0, help="Every N-th request fails")
+    parser.add_argument("--fail-status", type=int, default=500)
+    parser.add_argument("--bench", type=int, default=0, help="Send N emails and exit")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    fake = FakeEmailProvider(
+        latency=args.latency,
+        fail_every=args.fail_every,
+        fail_status=args.fail_status,
+        port=0 if args.bench else args.port,
+    ).start()
+    if args.bench:
+        try:
+            asyncio.run(_bench(args, fake))
+        finally:
+            fake.stop()
+    else:
+        print(f"[fake-email] listening at {fake.url}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            fake.stop()
@@ -0,0 +1,149 @@
+"""
+Локальный fake Stripe API для сверки оплат (reconciliation) и нагрузочных прогонов.
+
+Отдаёт только GET /v1/checkout/sessions с фильтром created[gte]/created[lt],
+limit и курсором starting_after — этого достаточно для
+app.services.reconciliation. Сессии генерируются детерминированно:
+- каждая 10-я — заказ (metadata.order_id), остальные — бронирования (metadata.booking_id);
+- каждая 3-я не оплачена (payment_status=unpaid);
+- каждая 25-я без metadata (сопоставляется по checkout_session_id).
+
+Запуск (из директории backend):
+    uv run python -m app.scripts.fake_stripe --sessions 100000 --port 12111
+    STRIPE_SECRET_KEY=sk_test_fake STRIPE_API_BASE=http://127.0.0.1:12111 \\
+        uv run python -m app.scripts.reconcile_stripe --hours 48
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def build_sessions(count: int, *, created_from: int, span_seconds: int) -> list[dict]:
+    """Сгенерировать `count` сессий, равномерно распределённых по окну (по возрастанию created)."""
+    sessions: list[dict] = []
+    for i in range(count):
+        metadata: dict[str, str] = {}
+        if i % 25 != 0:
+            if i % 10 == 0:
+                metadata["order_id"] = str(i // 10 + 1)
+            else:
+                metadata["booking_id"] = str(i + 1)
+        sessions.append(
+            {
+                "id": f"cs_fake_{i:08d}",
+                "object": "checkout.session",
+                "created": created_from + (i * span_seconds) // max(1, count),
+                "status": "complete" if i % 3 else "open",
+                "payment_status": "paid" if i % 3 else "unpaid",
+                "payment_intent": f"pi_fake_{i:08d}" if i % 3 else None,
+                "metadata": metadata,
+            }
+        )
+    return sessions
+
+
+class FakeStripeServer:
+    """HTTP-сервер в фоновом потоке; используется в тестах и из CLI."""
+
+    def __init__(self, sessions: list[dict], *, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.sessions = sessions
+        self._created = [s["created"] for s in sessions]
+        self._index = {s["id"]: i for i, s in enumerate(sessions)}
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def page(self, query: dict[str, list[str]]) -> dict:
+        """Одна страница в формате Stripe list (новые сессии первыми)."""
+        gte = int(query.get("created[gte]", ["0"])[0])
+        lt = int(query.get("created[lt]", [str(2**62)])[0])
+        limit = min(100, int(query.get("limit", ["10"])[0]))
+        lo = bisect.bisect_left(self._created, gte)
+        hi = bisect.bisect_left(self._created, lt)
+        # Stripe отдаёт новые первыми: идём по индексам окна сверху вниз.
+        top = hi - 1
+        starting_after = query.get("starting_after", [None])[0]
+        if starting_after is not None:
+            top = self._index.get(starting_after, lo) - 1
+        bottom = max(lo, top - limit + 1)
+        data = self.sessions[bottom : top + 1][::-1] if top >= lo else []
+        return {
+            "object": "list",
+            "url": "/v1/checkout/sessions",
+            "has_more": top >= lo and bottom > lo,
+            "data": data,
+        }
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802 — http.server API
+                parsed = urlparse(self.path)
+                if parsed.path != "/v1/checkout/sessions":
+                    self._send(404, {"error": {"message": "Unknown path"}})
+                    return
+                with server._lock:
+                    server.requests += 1
+                self._send(200, server.page(parse_qs(parsed.query)))
+
+            def _send(self, status: int, body: dict) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: object) -> None:
+                return
+
+        return Handler
+
+    def start(self) -> FakeStripeServer:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Stripe API (checkout sessions list)")
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--hours", type=int, default=24, help="Spread sessions over last N hours")
+    parser.add_argument("--port", type=int, default=12111)
+    args = parser.parse_args()
+
+    now = int(time.time())
+    span = args.hours * 3600
+    fake = FakeStripeServer(
+        build_sessions(args.sessions, created_from=now - span, span_seconds=span),
+        port=args.port,
+    ).start()
+    print(f"[fake-stripe] {args.sessions} sessions at {fake.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
@@ -0,0 +1,185 @@
+"""
+Отчёт об использовании индексов по pg_stat_user_indexes.
+
+Для каждого индекса: число сканирований (idx_scan), прочитанные кортежи и
+размер. Отдельно — кандидаты на удаление:
+- unused — ни одного сканирования с последнего сброса статистики
+  (уникальные индексы и первичные ключи не предлагаются: они держат ограничения);
+- redundant — колонки индекса являются префиксом другого индекса той же таблицы
+  (например, slots(studio_id) при slots(studio_id, start_time));
+- invalid — остатки прерванного CREATE INDEX CONCURRENTLY, их нужно удалить
+  и построить заново.
+
+Статистика копится с момента stats_reset (печатается в шапке) и на каждом
+сервере своя — смотрите primary и реплику отдельно, на данных за полный
+рабочий цикл (неделя, а не час после деплоя).
+
+Запуск (из директории backend):
+    uv run python -m app.scripts.index_usage_report
+    uv run python -m app.scripts.index_usage_report --table bookings --unused-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+
+from sqlalchemy import text
+
+from app.core.database import engine
+
+INDEX_STATS_SQL = text(
+    """
+    SELECT
+        s.relname AS table_name,
+        s.indexrelname AS index_name,
+        s.idx_scan,
+        s.idx_tup_read,
+        s.idx_tup_fetch,
+        pg_relation_size(s.indexrelid) AS size_bytes,
+        i.indisunique AS is_unique,
+        i.indisprimary AS is_primary,
+        i.indisvalid AS is_valid,
+        i.indkey::text AS columns,
+        i.indnkeyatts AS key_columns,
+        i.indexprs IS NOT NULL AS has_expressions,
+        i.indpred IS NOT NULL AS is_partial
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    WHERE s.schemaname = :schema
+      AND (CAST(:table AS text) IS NULL OR s.relname = :table)
+    ORDER BY s.relname, s.idx_scan DESC, s.indexrelname
+    """
+)
+
+STATS_RESET_SQL = text(
+    "SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class IndexStats:
+    table_name: str
+    index_name: str
+    idx_scan: int
+    idx_tup_read: int
+    idx_tup_fetch: int
+    size_bytes: int
+    is_unique: bool
+    is_primary: bool
+    is_valid: bool
+    columns: tuple[int, ...]
+    has_expressions: bool
+    is_partial: bool
+
+    @property
+    def droppable(self) -> bool:
+        """Можно удалить без потери ограничения (не PK и не UNIQUE)."""
+        return not (self.is_unique or self.is_primary)
+
+
+def _size(size_bytes: int) -> str:
+    size = float(size_bytes)
+    for unit in ("B", "kB", "MB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GB"
+
+
+def unused_indexes(stats: list[IndexStats]) -> list[IndexStats]:
+    """Валидные индексы без единого сканирования, не держащие ограничений."""
+    return [s for s in stats if s.idx_scan == 0 and s.is_valid and s.droppable]
+
+
+def redundant_indexes(stats: list[IndexStats]) -> list[tuple[IndexStats, IndexStats]]:
+    """
+    Пары (лишний, покрывающий): колонки первого — префикс колонок второго.
+
+    Индексы с выражениями и частичные не сравниваются: префикс колонок у них
+    не означает, что один заменяет другой.
+    """
+    plain = [s for s in stats if s.is_valid and not (s.has_expressions or s.is_partial)]
+    pairs = []
+    for index in plain:
+        if not index.droppable:
+            continue
+        for other in plain:
+            if (
+                other is not index
+                and other.table_name == index.table_name
+                and len(other.columns) > len(index.columns)
+                and other.columns[: len(index.columns)] == index.columns
+            ):
+                pairs.append((index, other))
+                break
+    return pairs
+
+
+async def fetch_index_stats(*, schema: str, table: str | None) -> list[IndexStats]:
+    async with engine.connect() as conn:
+        rows = (await conn.execute(INDEX_STATS_SQL, {"schema": schema, "table": table})).all()
+    return [
+        IndexStats(
+            table_name=row.table_name,
+            index_name=row.index_name,
+            idx_scan=row.idx_scan,
+            idx_tup_read=row.idx_tup_read,
+            idx_tup_fetch=row.idx_tup_fetch,
+            size_bytes=row.size_bytes,
+            is_unique=row.is_unique,
+            is_primary=row.is_primary,
+            is_valid=row.is_valid,
+            # Только ключевые колонки, без INCLUDE.
+            columns=tuple(int(c) for c in row.columns.split()[: row.key_columns]),
+            has_expressions=row.has_expressions,
+            is_partial=row.is_partial,
+        )
+        for row in rows
+    ]
+
+
+async def main(args: argparse.Namespace) -> None:
+    async with engine.connect() as conn:
+        stats_reset = (await conn.execute(STATS_RESET_SQL)).scalar_one_or_none()
+    stats = await fetch_index_stats(schema=args.schema, table=args.table)
+    await engine.dispose()
+
+    print(f"[indexes] schema={args.schema} indexes={len(stats)} stats_reset={stats_reset}")
+    if not args.unused_only:
+        print(f"{'table':<20} {'index':<45} {'scans':>12} {'tup_read':>14} {'size':>9}")
+        for s in stats:
+            print(
+                f"{s.table_name:<20} {s.index_name:<45} {s.idx_scan:>12} "
+                f"{s.idx_tup_read:>14} {_size(s.size_bytes):>9}"
+            )
+
+    unused = unused_indexes(stats)
+    print(f"\n[unused] {len(unused)} index(es) never scanned:")
+    for s in sorted(unused, key=lambda s: s.size_bytes, reverse=True):
+        print(f"  {s.table_name}.{s.index_name} size={_size(s.size_bytes)}")
+
+    redundant = redundant_indexes(stats)
+    print(f"\n[redundant] {len(redundant)} index(es) covered by a wider one:")
+    for index, covering in redundant:
+        print(
+            f"  {index.table_name}.{index.index_name} (scans={index.idx_scan}) "
+            f"<- {covering.index_name}"
+        )
+
+    invalid = [s for s in stats if not s.is_valid]
+    if invalid:
+        print(f"\n[invalid] {len(invalid)} index(es) from interrupted concurrent builds:")
+        for s in invalid:
+            print(f"  DROP INDEX CONCURRENTLY {s.index_name};")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report index usage from pg_stat_user_indexes")
+    parser.add_argument("--schema", default="public", help="Schema to report on")
+    parser.add_argument("--table", default=None, help="Only indexes of this table")
+    parser.add_argument(
+        "--unused-only", action="store_true", help="Skip the per-index table, print candidates"
+    )
+    asyncio.run(main(parser.parse_args()))
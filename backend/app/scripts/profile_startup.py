@@ -0,0 +1,138 @@
+"""
+Профиль холодного старта: импорт app.main и первый запрос.
+
+На бесплатном плане Render (render.yaml) инстанс засыпает, и первый запрос
+после простоя ждёт запуска процесса. Скрипт в чистом интерпретаторе меряет:
+- время `import app.main` (все роутеры, схемы и модели регистрируются здесь);
+- первый запрос GET / напрямую через ASGI (сборка стека middleware);
+- самые дорогие модули по `python -X importtime` (cumulative и self).
+
+Тяжёлые SDK (stripe, httpx для Resend) импортируются при первом использовании;
+tests/test_startup.py проверяет это и бюджет времени старта.
+
+Запуск (из директории backend):
+    SECRET_KEY=bench uv run python -m app.scripts.profile_startup
+    SECRET_KEY=bench uv run python -m app.scripts.profile_startup --top 40 --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Выполняется в отдельном процессе: импорт app.main и один ASGI-запрос без httpx,
+# чтобы измерение не тянуло лишних модулей.
+_STARTUP_SNIPPET = """
+import asyncio, json, sys, time
+
+started = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+
+async def first_request():
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    status = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": "/", "raw_path": b"/",
+        "query_string": b"", "root_path": "", "headers": [],
+        "client": ("127.0.0.1", 1), "server": ("startup", 80),
+    }
+    await app(scope, receive, send)
+    return status[0]
+
+status = asyncio.run(first_request())
+finished = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - started,
+    "first_request_seconds": finished - imported,
+    "status": status,
+    "modules": sorted(sys.modules),
+}))
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class StartupProfile:
+    import_seconds: float
+    first_request_seconds: float
+    status: int
+    modules: frozenset[str]
+
+    @property
+    def total_seconds(self) -> float:
+        return self.import_seconds + self.first_request_seconds
+
+
+def measure_startup() -> StartupProfile:
+    """Один холодный старт в новом интерпретаторе."""
+    out = subprocess.run(
+        [sys.executable, "-c", _STARTUP_SNIPPET],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    data = json.loads(out.strip().splitlines()[-1])
+    return StartupProfile(
+        import_seconds=data["import_seconds"],
+        first_request_seconds=data["first_request_seconds"],
+        status=data["status"],
+        modules=frozenset(data["modules"]),
+    )
+
+
+def import_profile(top: int) -> list[tuple[int, int, str]]:
+    """Самые дорогие модули `import app.main`: (cumulative мкс, self мкс, модуль)."""
+    err = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue  # заголовок
+        rows.append((int(cumulative_us), int(self_us), module.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(args: argparse.Namespace) -> None:
+    profiles = [measure_startup() for _ in range(args.runs)]
+    best = min(profiles, key=lambda p: p.total_seconds)
+    print(
+        f"[startup] runs={args.runs} best: import={best.import_seconds * 1e3:.0f}ms "
+        f"first_request={best.first_request_seconds * 1e3:.0f}ms "
+        f"total={best.total_seconds * 1e3:.0f}ms modules={len(best.modules)}"
+    )
+    deferred = [m for m in ("stripe", "httpx") if m in best.modules]
+    print(f"[startup] deferred SDKs loaded at startup: {deferred or 'none'}")
+    print(f"\n{'cumulative':>11} {'self':>9}  module")
+    for cumulative_us, self_us, module in import_profile(args.top):
+        print(f"{cumulative_us / 1e3:9.1f}ms {self_us / 1e3:7.1f}ms {module}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold-start profile of app.main")
+    parser.add_argument("--runs", type=int, default=3, help="Cold starts to measure")
+    parser.add_argument("--top", type=int, default=25, help="Slowest imports to print")
+    main(parser.parse_args())
@@ -0,0 +1,108 @@
+"""
+Сверка оплат со Stripe: догоняем потерянные webhook'и.
+
+Листает Checkout Sessions за окно времени, находит оплаченные и подтверждает
+соответствующие бронирования/заказы пачками (см. app.services.reconciliation).
+Операция идемпотентна — безопасно запускать по cron поверх работающих webhook'ов.
+
+Запуск (из директории backend):
+    uv run python -m app.scripts.reconcile_stripe --hours 24
+    uv run python -m app.scripts.reconcile_stripe --since 2026-04-01T00:00:00Z --dry-run
+
+Против локального fake-сервера (см. app.scripts.fake_stripe):
+    STRIPE_SECRET_KEY=sk_test_fake STRIPE_API_BASE=http://127.0.0.1:12111 \\
+        uv run python -m app.scripts.reconcile_stripe --hours 24 --fetch-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+from app.core.database import async_session_maker
+from app.core.uow import create_uow
+from app.services.payment import get_stripe_client
+from app.services.reconciliation import (
+    iter_checkout_session_pages,
+    reconcile_checkout_sessions,
+)
+
+
+def _parse_dt(value: str) -> datetime:
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=UTC)
+
+
+async def _fetch_only(
+    args: argparse.Namespace, created_from: datetime, created_to: datetime
+) -> None:
+    """Только выборка из Stripe (без БД) — замер пропускной способности чтения."""
+    client = get_stripe_client()
+    started = time.perf_counter()
+    sessions = pages = 0
+    async for page in iter_checkout_session_pages(
+        client,
+        created_from=created_from,
+        created_to=created_to,
+        concurrency=args.concurrency,
+        slices=args.slices,
+    ):
+        pages += 1
+        sessions += len(page)
+    elapsed = time.perf_counter() - started
+    rate = sessions / elapsed if elapsed > 0 else 0.0
+    print(f"[fetch] sessions={sessions} pages={pages} elapsed={elapsed:.2f}s rate={rate:.0f}/s")
+
+
+async def main(args: argparse.Namespace) -> None:
+    created_to = _parse_dt(args.until) if args.until else datetime.now(UTC)
+    created_from = _parse_dt(args.since) if args.since else created_to - timedelta(hours=args.hours)
+    if args.fetch_only:
+        await _fetch_only(args, created_from, created_to)
+        return
+
+    client = get_stripe_client()
+    async with async_session_maker() as session:
+        uow = create_uow(session)
+        try:
+            report = await reconcile_checkout_sessions(
+                client,
+                uow,
+                created_from=created_from,
+                created_to=created_to,
+                concurrency=args.concurrency,
+                slices=args.slices,
+                batch_size=args.batch_size,
+                dry_run=args.dry_run,
+            )
+        except Exception:
+            await uow.rollback()
+            raise
+
+    print(
+        f"[reconcile] window={created_from.isoformat()}..{created_to.isoformat()} "
+        f"sessions={report.sessions_seen} paid={report.sessions_paid} "
+        f"pages={report.pages_fetched} bookings_confirmed={report.bookings_confirmed} "
+        f"orders_paid={report.orders_paid} unmatched={len(report.unmatched_session_ids)} "
+        f"elapsed={report.elapsed_seconds:.2f}s rate={report.sessions_per_second:.0f}/s"
+        + (" (dry run)" if args.dry_run else "")
+    )
+    for session_id in report.unmatched_session_ids[:20]:
+        print(f"[reconcile] unmatched paid session: {session_id}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile Stripe checkout sessions")
+    parser.add_argument("--since", help="Window start (ISO 8601, UTC by default)")
+    parser.add_argument("--until", help="Window end (ISO 8601), default: now")
+    parser.add_argument("--hours", type=int, default=24, help="Window size if --since is omitted")
+    parser.add_argument("--concurrency", type=int, default=8, help="Max in-flight Stripe requests")
+    parser.add_argument(
+        "--slices", type=int, default=None, help="Window slices (default: concurrency)"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Sessions per DB transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Roll back instead of commit")
+    parser.add_argument("--fetch-only", action="store_true", help="Only page Stripe, no DB writes")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,104 @@
+"""
+Архивация прошедших слотов и история бронирований.
+
+Горячие таблицы slots / bookings держат только текущие и будущие занятия:
+фоновая задача переносит слоты, закончившиеся больше ARCHIVE_AFTER_DAYS
+назад, вместе с бронированиями в slots_archive / bookings_archive
+(app.models.archive). Обычные выборки и подсчёт мест работают как раньше,
+история читается отсюда — get_my_booking_history, get_studio_slot_history.
+"""
+
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.background import run_in_batches
+from app.core.config import settings
+from app.core.metrics import counter
+from app.core.tracing import traced_module
+from app.core.uow import UnitOfWork
+from app.models.archive import SlotArchive
+from app.models.user import User
+from app.services.user import UserPrincipal
+
+slots_archived = counter("slots_archived_total", "Past slots moved to slots_archive")
+bookings_archived = counter("bookings_archived_total", "Bookings moved to bookings_archive")
+
+
+async def archive_past_slots(
+    uow: UnitOfWork,
+    *,
+    batch_size: int,
+    now: datetime | None = None,
+) -> tuple[int, int]:
+    """Перенести одну пачку прошедших слотов с бронированиями; (слотов, бронирований)."""
+    now = now or datetime.now(UTC)
+    cutoff = now - timedelta(days=settings.ARCHIVE_AFTER_DAYS)
+    return await uow.archive.archive_slots_ended_before(cutoff, limit=batch_size)
+
+
+async def run_slot_archive(session_factory: Callable[[], AsyncSession]) -> None:
+    """Background job: archive past slots and their bookings in bounded batches."""
+    bookings_moved = 0
+
+    async def batch(uow: UnitOfWork, limit: int) -> int:
+        nonlocal bookings_moved
+        slots, bookings = await archive_past_slots(uow, batch_size=limit)
+        bookings_moved += bookings
+        return slots
+
+    slots_moved = await run_in_batches(
+        session_factory,
+        batch,
+        batch_size=settings.ARCHIVE_BATCH_SIZE,
+        max_batches=settings.ARCHIVE_MAX_BATCHES,
+    )
+    slots_archived.inc(slots_moved)
+    bookings_archived.inc(bookings_moved)
+    if slots_moved:
+        structlog.get_logger(__name__).info(
+            "slots_archived", slots=slots_moved, bookings=bookings_moved
+        )
+
+
+async def get_my_booking_history(
+    uow: UnitOfWork,
+    *,
+    user: User | UserPrincipal,
+    skip: int = 0,
+    limit: int = 50,
+    include_guest_email: bool = True,
+) -> list[Row]:
+    """Архивные бронирования пользователя строками с вложенными slot и studio."""
+    return await uow.archive.list_my_rows(
+        skip=skip,
+        limit=limit,
+        user_id=user.id,
+        user_email=user.email,
+        include_guest_email=include_guest_email,
+    )
+
+
+async def get_studio_slot_history(
+    uow: UnitOfWork,
+    studio_id: int,
+    *,
+    skip: int = 0,
+    limit: int = 20,
+    start_from: datetime | None = None,
+    start_to: datetime | None = None,
+) -> list[SlotArchive]:
+    """Архивные слоты студии."""
+    return await uow.archive.list_slots(
+        studio_id=studio_id,
+        skip=skip,
+        limit=limit,
+        start_from=start_from,
+        start_to=start_to,
+    )
+
+
+traced_module(__name__)
@@ -2,25 +2,39 @@
 Authentication business logic: magic link and JWT.
 """
 
-from datetime import UTC, datetime
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
 
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.background import run_in_batches
 from app.core.config import settings
 from app.core.exceptions import UnauthorizedError, ValidationError
+from app.core.metrics import counter
 from app.core.security import (
     create_access_token,
-    create_refresh_token,
     create_csrf_token,
+    create_refresh_token,
     generate_magic_link_token,
     get_magic_link_expires_at,
     get_user_id_from_access_token,
     hash_magic_link_token,
+    parse_access_token,
     parse_refresh_token,
 )
+from app.core.tracing import traced_module
 from app.core.uow import UnitOfWork
+from app.models.magic_link_token import MagicLinkToken
 from app.models.refresh_token import RefreshToken
 from app.models.user import User
-from app.services.email import send_magic_link_email
-from app.services.user import get_or_create_user, get_user_by_id
+from app.services.email import enqueue_magic_link_email
+from app.services.user import (
+    UserPrincipal,
+    get_or_create_user,
+    get_user_by_id,
+    get_user_principal,
+)
 
 
 async def request_magic_link(
@@ -32,17 +46,23 @@ async def request_magic_link(
     Request a magic link.
 
     1. Creates or updates user by email/name
-    2. Generates token and stores hash in DB
-    3. Sends email with link
+    2. Generates token and stores its hash in magic_link_tokens
+       (earlier links of the user stay valid until used or expired)
+    3. Enqueues the email with the link (sent by the outbox sender)
     """
     user = await get_or_create_user(uow, email=email, name=name)
     token = generate_magic_link_token()
-    user.magic_link_token = hash_magic_link_token(token)
-    user.magic_link_expires_at = get_magic_link_expires_at()
+    uow.session.add(
+        MagicLinkToken(
+            user_id=user.id,
+            token_hash=hash_magic_link_token(token),
+            expires_at=get_magic_link_expires_at(),
+        )
+    )
     await uow.session.flush()
 
     magic_link_url = f"{settings.FRONTEND_URL}/auth/verify?token={token}"
-    await send_magic_link_email(email, magic_link_url)
+    await enqueue_magic_link_email(uow, email, magic_link_url)
 
 
 async def verify_magic_link(
@@ -52,17 +72,17 @@ async def verify_magic_link(
     """
     Verify magic link token.
 
+    The token row is deleted on use (single-use, unique index lookup).
     Returns (user, access_token, refresh_token, csrf_token).
     Raises ValidationError if the token is invalid.
+    The caller drops the cached principal after commit (user row changed).
     """
     now_utc = datetime.now(UTC)
-    token_hash = hash_magic_link_token(token)
-    user = await uow.users.get_by_magic_link_token(token_hash, now_utc)
+    user_id = await uow.magic_links.consume(hash_magic_link_token(token), now_utc)
+    user = await get_user_by_id(uow, user_id) if user_id is not None else None
     if user is None:
         raise ValidationError("Magic link is invalid or has expired")
 
-    user.magic_link_token = None
-    user.magic_link_expires_at = None
     user.last_login_at = now_utc
     await uow.session.flush()
     await uow.session.refresh(user)
@@ -103,7 +123,7 @@ async def refresh_access_token(
     jti = refresh_data.jti
     now_utc = datetime.now(UTC)
 
-    refresh_session = await uow.refresh_tokens.get_by_user_and_jti(user_id, jti)
+    refresh_session = await uow.refresh_tokens.get_active_by_user_and_jti(user_id, jti)
     if refresh_session is None or not refresh_session.is_active(now_utc):
         raise UnauthorizedError("Invalid refresh token")
 
@@ -143,9 +163,34 @@ async def get_current_user_from_token(
     return await get_user_by_id(uow, user_id)
 
 
+async def get_current_principal_from_token(
+    uow: UnitOfWork,
+    token: str,
+) -> UserPrincipal | None:
+    """Resolve user principal from access token (cached by user id)."""
+    user_id = get_user_id_from_access_token(token)
+    if user_id is None:
+        return None
+    return await get_user_principal(uow, user_id)
+
+
+def get_principal_from_token_claims(token: str) -> UserPrincipal | None:
+    """
+    Build user principal from access token claims only (no DB, no cache).
+
+    Trusts the token for its whole lifetime: a deleted or changed user keeps
+    access until the token expires. Used for read-only owner endpoints when
+    AUTH_TRUST_TOKEN_CLAIMS_FOR_READS is enabled.
+    """
+    data = parse_access_token(token)
+    if data is None or data.email is None:
+        return None
+    return UserPrincipal(id=data.user_id, email=data.email)
+
+
 async def logout_current_session(
     uow: UnitOfWork,
-    user: User,
+    user: User | UserPrincipal,
     refresh_token: str,
 ) -> None:
     """
@@ -153,13 +198,14 @@ async def logout_current_session(
 
     If token is invalid or not owned by user — silent no-op (idempotent).
     If session exists and active — sets revoked_at / last_used_at.
+    The caller drops the cached principal after commit.
     """
     data = parse_refresh_token(refresh_token)
     if data is None or data.user_id != user.id:
         return
 
     now_utc = datetime.now(UTC)
-    refresh_session = await uow.refresh_tokens.get_by_user_and_jti(user.id, data.jti)
+    refresh_session = await uow.refresh_tokens.get_active_by_user_and_jti(user.id, data.jti)
     if refresh_session is None:
         return
 
@@ -167,3 +213,69 @@ async def logout_current_session(
         refresh_session.revoked_at = now_utc
         refresh_session.last_used_at = now_utc
         await uow.session.flush()
+
+
+refresh_tokens_purged = counter(
+    "refresh_tokens_purged_total", "Expired/revoked refresh tokens deleted by the purge job"
+)
+
+
+async def purge_refresh_tokens(
+    uow: UnitOfWork,
+    *,
+    batch_size: int,
+    now: datetime | None = None,
+) -> int:
+    """
+    Delete one batch of refresh tokens expired or revoked before the retention window.
+
+    Rows are kept for REFRESH_TOKEN_RETENTION_DAYS after expiry/revocation
+    (audit of recent sessions), then removed.
+    """
+    now = now or datetime.now(UTC)
+    cutoff = now - timedelta(days=settings.REFRESH_TOKEN_RETENTION_DAYS)
+    return await uow.refresh_tokens.purge_stale(older_than=cutoff, limit=batch_size)
+
+
+async def run_refresh_token_purge(session_factory: Callable[[], AsyncSession]) -> None:
+    """Background job: purge stale refresh tokens in bounded batches."""
+    deleted = await run_in_batches(
+        session_factory,
+        lambda uow, limit: purge_refresh_tokens(uow, batch_size=limit),
+        batch_size=settings.REFRESH_TOKEN_PURGE_BATCH_SIZE,
+        max_batches=settings.REFRESH_TOKEN_PURGE_MAX_BATCHES,
+    )
+    refresh_tokens_purged.inc(deleted)
+    if deleted:
+        structlog.get_logger(__name__).info("refresh_tokens_purged", deleted=deleted)
+
+
+magic_link_tokens_purged = counter(
+    "magic_link_tokens_purged_total", "Expired magic-link tokens deleted by the purge job"
+)
+
+
+async def purge_magic_link_tokens(
+    uow: UnitOfWork,
+    *,
+    batch_size: int,
+    now: datetime | None = None,
+) -> int:
+    """Delete one batch of expired (never used) magic-link tokens."""
+    return await uow.magic_links.purge_expired(now=now or datetime.now(UTC), limit=batch_size)
+
+
+async def run_magic_link_purge(session_factory: Callable[[], AsyncSession]) -> None:
+    """Background job: purge expired magic-link tokens in bounded batches."""
+    deleted = await run_in_batches(
+        session_factory,
+        lambda uow, limit: purge_magic_link_tokens(uow, batch_size=limit),
+        batch_size=settings.MAGIC_LINK_PURGE_BATCH_SIZE,
+        max_batches=settings.MAGIC_LINK_PURGE_MAX_BATCHES,
+    )
+    magic_link_tokens_purged.inc(deleted)
+    if deleted:
+        structlog.get_logger(__name__).info("magic_link_tokens_purged", deleted=deleted)
+
+
+traced_module(__name__)
@@ -9,11 +9,24 @@
 
 from datetime import UTC, datetime
 
+from sqlalchemy import Row
+
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.metrics import labeled_counter
+from app.core.tracing import traced_module
 from app.core.uow import UnitOfWork
 from app.models.booking import Booking, BookingStatus, BookingType
 from app.schemas.booking import BookingCreate, BookingUpdate
 from app.models.user import User
+from app.services.user import UserPrincipal
+
+# Исходы попыток бронирования (GET /metrics):
+# created — бронь создана; no_seats — все места выкуплены (confirmed);
+# oversell_prevented — места держат неоплаченные pending-брони (или курс
+# переполнил бы занятия) — без этой проверки слот был бы перепродан.
+booking_outcomes = labeled_counter(
+    "bookings_total", "Booking attempts by booking type and outcome", ("type", "outcome")
+)
 
 
 async def get_booking(uow: UnitOfWork, booking_id: int) -> Booking | None:
@@ -38,7 +51,7 @@ async def get_bookings(
     user_id: int | None = None,
     guest_email: str | None = None,
     status: str | None = None,
-) -> list[Booking]:
+) -> list[Row]:
     """
     Список бронирований с фильтрами.
 
@@ -46,8 +59,10 @@ async def get_bookings(
     user_id — бронирования пользователя
     guest_email — бронирования гостя (до активации)
     status — pending, confirmed, cancelled
+
+    Возвращает строки BOOKING_COLUMNS (без ORM-объектов).
     """
-    return await uow.bookings.list_(
+    return await uow.bookings.list_rows(
         skip=skip,
         limit=limit,
         slot_id=slot_id,
@@ -77,17 +92,18 @@ async def get_bookings_count(
 async def get_my_bookings(
     uow: UnitOfWork,
     *,
-    user: User,
+    user: User | UserPrincipal,
     skip: int = 0,
     limit: int = 50,
     include_guest_email: bool = True,
-) -> list[Booking]:
+) -> list[Row]:
     """
     Bookings list for personal cabinet (slot+studio embedded).
 
     include_guest_email=True merges legacy guest bookings by guest_email == user.email.
+    Rows carry booking columns plus row.slot / row.studio and validate as BookingListItem.
     """
-    return await uow.bookings.list_my_with_slot_and_studio(
+    return await uow.bookings.list_my_rows(
         skip=skip,
         limit=limit,
         user_id=user.id,
@@ -123,6 +139,8 @@ async def create_booking(uow: UnitOfWork, schema: BookingCreate) -> Booking:
     confirmed_count = await uow.bookings.count_confirmed_by_slot(slot.id)
     pending_count = await uow.bookings.count_pending_by_slot(slot.id, now=now_utc)
     if confirmed_count + pending_count >= slot.max_capacity:
+        outcome = "no_seats" if confirmed_count >= slot.max_capacity else "oversell_prevented"
+        booking_outcomes.inc("single", outcome)
         raise ValidationError("No seats available")
 
     booking = Booking(
@@ -137,6 +155,7 @@ async def create_booking(uow: UnitOfWork, schema: BookingCreate) -> Booking:
     uow.session.add(booking)
     await uow.session.flush()
     await uow.session.refresh(booking)
+    booking_outcomes.inc("single", "created")
     return booking
 
 
@@ -168,3 +187,6 @@ async def update_booking(
     await uow.session.flush()
     await uow.session.refresh(booking)
     return booking
+
+
+traced_module(__name__)
@@ -1,52 +1,53 @@
 """
-Отправка email через Resend.
+Отправка email через Resend — через outbox (таблица email_outbox).
 
 Почему Resend:
 - Простой API
 - Бесплатный tier (100 писем/день)
 - Надёжная доставка
 
-Если RESEND_API_KEY не задан — логируем ссылку (для разработки).
+Почему outbox:
+- Запрос только кладёт письмо в email_outbox в своей транзакции (enqueue_*),
+  без сетевых вызовов — медленный провайдер не тормозит API
+- EmailOutboxSender в фоне забирает пачки (FOR UPDATE SKIP LOCKED) и шлёт их
+  через общий httpx.AsyncClient (пул соединений) с ограниченной параллельностью
+- Временные ошибки (сеть, 429, 5xx) — повтор с экспоненциальной задержкой,
+  постоянные (прочие 4xx) и исчерпанные попытки — статус failed
+
+Если RESEND_API_KEY не задан — письма помечаются отправленными без сети (dev mode).
 """
 
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
 import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.tracing import CLIENT, span, traced_module
+from app.core.uow import UnitOfWork, create_uow
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
 
+if TYPE_CHECKING:
+    import httpx
 
-async def send_magic_link_email(email: str, magic_link_url: str) -> bool:
-    """
-    Отправить Magic Link на email.
-
-    Возвращает True при успехе, False при ошибке.
-    Если RESEND_API_KEY не задан — логируем URL и возвращаем True (dev mode).
-    """
-    if not settings.RESEND_API_KEY:
-        logger = structlog.get_logger(__name__)
-        logger.info("magic_link_dev_mode_no_provider")
-        return True
+MAGIC_LINK_KIND = "magic_link"
+MAGIC_LINK_SUBJECT = "Sign in to ZaFrame"
 
-    logger = structlog.get_logger(__name__)
-    try:
-        import resend
 
-        logger.debug(
-            "resend_provider_enabled",
-            resend_api_key_configured=True,
-        )
-        resend.api_key = settings.RESEND_API_KEY
-
-        params: resend.Emails.SendParams = {
-            "from": "ZaFrame <onboarding@resend.dev>",
-            "to": [email],
-            "subject": "Sign in to ZaFrame",
-            "html": f"""
+def render_magic_link_email(magic_link_url: str) -> str:
+    """HTML письма со ссылкой для входа."""
+    return f"""
             <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
                 <h2 style="color: #2c3e50;">Sign in to ZaFrame</h2>
                 <p>Click the link below to sign in to your account:</p>
                 <p style="margin: 20px 0;">
-                    <a href="{magic_link_url}" 
-                       style="background-color: #45d1b8; color: white; padding: 12px 24px; 
+                    <a href="{magic_link_url}"
+                       style="background-color: #45d1b8; color: white; padding: 12px 24px;
                               text-decoration: none; border-radius: 6px; display: inline-block;">
                         Sign in
                     </a>
@@ -62,24 +63,284 @@ async def send_magic_link_email(email: str, magic_link_url: str) -> bool:
                     If you didn't request this email, you can safely ignore it.
                 </p>
             </div>
-            """,
-        }
+            """
+
+
+async def enqueue_email(
+    uow: UnitOfWork,
+    *,
+    to_email: str,
+    subject: str,
+    html: str,
+    kind: str,
+) -> EmailOutbox:
+    """
+    Положить письмо в outbox (без commit — его делает вызывающий/get_uow).
+
+    Письмо уйдёт только если транзакция запроса закоммитится.
+    """
+    message = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        html=html,
+        kind=kind,
+        status=EmailOutboxStatus.PENDING,
+        attempts=0,
+    )
+    uow.session.add(message)
+    await uow.session.flush()
+    return message
 
-        result = resend.Emails.send(params)
-        logger.info(
-            "magic_link_email_sent",
-            resend_id=result.get("id", "unknown"),
+
+async def enqueue_magic_link_email(uow: UnitOfWork, email: str, magic_link_url: str) -> EmailOutbox:
+    """Поставить в очередь письмо с Magic Link."""
+    return await enqueue_email(
+        uow,
+        to_email=email,
+        subject=MAGIC_LINK_SUBJECT,
+        html=render_magic_link_email(magic_link_url),
+        kind=MAGIC_LINK_KIND,
+    )
+
+
+class EmailProviderError(Exception):
+    """Ошибка провайдера; retryable=False — повтор бессмыслен (невалидный адрес, from и т.п.)."""
+
+    def __init__(self, detail: str, *, retryable: bool, status_code: int | None = None) -> None:
+        super().__init__(detail)
+        self.detail = detail
+        self.retryable = retryable
+        self.status_code = status_code
+
+
+class ResendEmailClient:
+    """
+    Асинхронный клиент Resend HTTP API (POST /emails) поверх одного httpx.AsyncClient.
+
+    Клиент живёт всё время работы отправителя: keep-alive соединения
+    переиспользуются между письмами и пачками. `transport` — подмена транспорта
+    (например httpx.MockTransport). httpx импортируется здесь, а не при старте
+    приложения: без RESEND_API_KEY клиент не создаётся вовсе.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        base_url: str,
+        timeout: float = 10.0,
+        max_connections: int = 10,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        import httpx
+
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+            transport=transport,
         )
-        return True
-    except Exception as e:
-        logger.error(
-            "magic_link_email_send_failed",
-            error_type=type(e).__name__,
+
+    async def send(self, *, sender: str, to: str, subject: str, html: str) -> str:
+        """Отправить одно письмо; возвращает id письма у провайдера."""
+        import httpx
+
+        try:
+            with span("resend.emails.send", kind=CLIENT):
+                response = await self._client.post(
+                    "/emails",
+                    json={"from": sender, "to": [to], "subject": subject, "html": html},
+                )
+        except httpx.HTTPError as e:
+            raise EmailProviderError(type(e).__name__, retryable=True) from e
+
+        if response.is_success:
+            return str(response.json().get("id", "unknown"))
+        retryable = response.status_code == 429 or response.status_code >= 500
+        raise EmailProviderError(
+            response.text[:500],
+            retryable=retryable,
+            status_code=response.status_code,
         )
-        if settings.DEBUG:
-            # Safe for local dev: Resend returns API error text (domain, from, quota), not user PII.
-            logger.warning(
-                "magic_link_resend_error_detail",
-                detail=str(e)[:800],
-            )
-        return False
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def create_resend_client() -> ResendEmailClient | None:
+    """Клиент из настроек; None без RESEND_API_KEY (dev mode)."""
+    if not settings.RESEND_API_KEY:
+        return None
+    return ResendEmailClient(
+        settings.RESEND_API_KEY,
+        base_url=settings.RESEND_API_BASE,
+        timeout=settings.EMAIL_HTTP_TIMEOUT_SECONDS,
+        max_connections=settings.EMAIL_OUTBOX_CONCURRENCY,
+    )
+
+
+def retry_delay(attempts: int, *, base_seconds: float, max_seconds: float) -> timedelta:
+    """Экспоненциальная задержка перед попыткой №(attempts + 1): base * 2^(attempts - 1)."""
+    exponent = max(0, attempts - 1)
+    return timedelta(seconds=min(max_seconds, base_seconds * (2**exponent)))
+
+
+async def deliver_outbox_batch(
+    uow: UnitOfWork,
+    client: ResendEmailClient | None,
+    *,
+    batch_size: int,
+    concurrency: int,
+    max_attempts: int,
+    backoff_base_seconds: float,
+    backoff_max_seconds: float,
+    sender: str,
+    now: datetime | None = None,
+) -> int:
+    """
+    Отправить одну пачку писем из outbox (без commit — им управляет вызывающий).
+
+    Письма пачки шлются параллельно, не больше `concurrency` одновременно.
+    Возвращает число обработанных писем (0 — очередь пуста).
+    """
+    logger = structlog.get_logger(__name__)
+    now = now or datetime.now(UTC)
+    messages = await uow.email_outbox.claim_due(limit=batch_size, now=now)
+    if not messages:
+        return 0
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def deliver(message: EmailOutbox) -> None:
+        message.attempts += 1
+        if client is None:
+            logger.info("email_dev_mode_no_provider", kind=message.kind, email_id=message.id)
+            _mark_sent(message, None)
+            return
+        try:
+            async with semaphore:
+                provider_id = await client.send(
+                    sender=sender,
+                    to=message.to_email,
+                    subject=message.subject,
+                    html=message.html,
+                )
+        except EmailProviderError as e:
+            message.last_error = e.detail[:500]
+            if e.retryable and message.attempts < max_attempts:
+                delay = retry_delay(
+                    message.attempts,
+                    base_seconds=backoff_base_seconds,
+                    max_seconds=backoff_max_seconds,
+                )
+                message.next_attempt_at = datetime.now(UTC) + delay
+                logger.warning(
+                    "email_send_retry_scheduled",
+                    kind=message.kind,
+                    email_id=message.id,
+                    attempts=message.attempts,
+                    status_code=e.status_code,
+                    retry_in_seconds=delay.total_seconds(),
+                )
+            else:
+                message.status = EmailOutboxStatus.FAILED
+                # Тело письма содержит одноразовую ссылку — не храним его дольше нужного.
+                message.html = ""
+                logger.error(
+                    "email_send_failed",
+                    kind=message.kind,
+                    email_id=message.id,
+                    attempts=message.attempts,
+                    status_code=e.status_code,
+                )
+            return
+        _mark_sent(message, provider_id)
+        logger.info("email_sent", kind=message.kind, email_id=message.id, resend_id=provider_id)
+
+    await asyncio.gather(*(deliver(m) for m in messages))
+    await uow.session.flush()
+    return len(messages)
+
+
+def _mark_sent(message: EmailOutbox, provider_id: str | None) -> None:
+    message.status = EmailOutboxStatus.SENT
+    message.sent_at = datetime.now(UTC)
+    message.provider_message_id = provider_id
+    message.last_error = None
+    message.html = ""
+
+
+class EmailOutboxSender:
+    """
+    Фоновый отправитель outbox: одна пачка — одна транзакция.
+
+    Запускается из lifespan через PeriodicTask (app.core.background);
+    пока пачки полные, следующая забирается сразу, без ожидания интервала.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        client: ResendEmailClient | None,
+        *,
+        batch_size: int,
+        concurrency: int,
+        max_attempts: int,
+        backoff_base_seconds: float,
+        backoff_max_seconds: float,
+        sender: str,
+    ) -> None:
+        self._session_factory = session_factory
+        self.client = client
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.sender = sender
+
+    async def run_once(self) -> bool:
+        """Обработать одну пачку; True — пачка была полной (вероятно, есть ещё)."""
+        async with self._session_factory() as session:
+            uow = create_uow(session)
+            try:
+                processed = await deliver_outbox_batch(
+                    uow,
+                    self.client,
+                    batch_size=self.batch_size,
+                    concurrency=self.concurrency,
+                    max_attempts=self.max_attempts,
+                    backoff_base_seconds=self.backoff_base_seconds,
+                    backoff_max_seconds=self.backoff_max_seconds,
+                    sender=self.sender,
+                )
+                await uow.commit()
+            except Exception:
+                await uow.rollback()
+                raise
+        return processed >= self.batch_size
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.aclose()
+
+
+def create_outbox_sender(session_factory: Callable[[], AsyncSession]) -> EmailOutboxSender:
+    """Отправитель с параметрами из настроек."""
+    return EmailOutboxSender(
+        session_factory,
+        create_resend_client(),
+        batch_size=settings.EMAIL_OUTBOX_BATCH_SIZE,
+        concurrency=settings.EMAIL_OUTBOX_CONCURRENCY,
+        max_attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+        backoff_base_seconds=settings.EMAIL_OUTBOX_BACKOFF_BASE_SECONDS,
+        backoff_max_seconds=settings.EMAIL_OUTBOX_BACKOFF_MAX_SECONDS,
+        sender=settings.EMAIL_FROM,
+    )
+
+
+traced_module(__name__)
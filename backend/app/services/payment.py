@@ -9,23 +9,52 @@
 
 from __future__ import annotations
 
-import stripe
+import asyncio
+from typing import TYPE_CHECKING
 
 from app.core.config import settings
 from app.core.exceptions import AppError, NotFoundError, ValidationError
+from app.core.tracing import CLIENT, span, traced_module
 from app.core.uow import UnitOfWork
 from app.models.booking import BookingStatus
 from app.models.order import OrderStatus
 from app.models.slot import Slot
 
+if TYPE_CHECKING:
+    import stripe
 
-def _get_stripe_client() -> stripe.StripeClient:
-    """Получить Stripe-клиент. Выбрасывает AppError при отсутствии ключа."""
+
+def get_stripe_client() -> stripe.StripeClient:
+    """
+    Получить Stripe-клиент. Выбрасывает AppError при отсутствии ключа.
+
+    SDK импортируется при первом вызове, а не при старте приложения
+    (холодный старт, см. tests/test_startup.py).
+    """
     if not settings.STRIPE_SECRET_KEY:
         raise AppError("STRIPE_SECRET_KEY is not configured", status_code=503)
+    import stripe
+
+    if settings.STRIPE_API_BASE:
+        return stripe.StripeClient(
+            api_key=settings.STRIPE_SECRET_KEY,
+            base_addresses={"api": settings.STRIPE_API_BASE},
+        )
     return stripe.StripeClient(api_key=settings.STRIPE_SECRET_KEY)
 
 
+async def _create_stripe_checkout_session(
+    client: stripe.StripeClient, params: dict
+) -> stripe.checkout.Session:
+    """
+    checkout.sessions.create в span трассировки (исходящий вызов Stripe).
+
+    Stripe SDK синхронный — вызов уходит в поток, чтобы не блокировать event loop.
+    """
+    with span("stripe.checkout.sessions.create", kind=CLIENT):
+        return await asyncio.to_thread(client.v1.checkout.sessions.create, params=params)
+
+
 async def create_checkout_session(
     uow: UnitOfWork,
     booking_id: int,
@@ -50,9 +79,10 @@ async def create_checkout_session(
     if slot.price_cents <= 0:
         raise ValidationError("Slot has no price for checkout")
 
-    client = _get_stripe_client()
-    session = client.v1.checkout.sessions.create(
-        params={
+    client = get_stripe_client()
+    session = await _create_stripe_checkout_session(
+        client,
+        {
             "success_url": success_url,
             "cancel_url": cancel_url,
             "mode": "payment",
@@ -71,7 +101,7 @@ async def create_checkout_session(
             ],
             "metadata": {"booking_id": str(booking_id)},
             "customer_email": booking.guest_email or None,
-        }
+        },
     )
 
     booking.checkout_session_id = session.id
@@ -102,12 +132,13 @@ async def create_order_checkout_session(
     if order.total_amount_cents <= 0:
         raise ValidationError("Order has no payable amount")
 
-    client = _get_stripe_client()
+    client = get_stripe_client()
 
     product_name = order.service.name if order.service is not None else f"Заказ #{order.id}"
 
-    session = client.v1.checkout.sessions.create(
-        params={
+    session = await _create_stripe_checkout_session(
+        client,
+        {
             "success_url": success_url,
             "cancel_url": cancel_url,
             "mode": "payment",
@@ -128,7 +159,7 @@ async def create_order_checkout_session(
                 "order_id": str(order_id),
             },
             "customer_email": order.guest_email or None,
-        }
+        },
     )
 
     await uow.session.flush()
@@ -189,3 +220,40 @@ async def confirm_order_after_payment(
             booking.payment_intent_id = payment_intent_id
     await uow.session.flush()
     return True
+
+
+async def confirm_bookings_after_payment_bulk(
+    uow: UnitOfWork,
+    payments: dict[int, str | None],
+) -> int:
+    """
+    Пакетный вариант confirm_booking_after_payment (reconciliation).
+
+    payments: booking_id -> payment_intent_id. Та же семантика, что у webhook
+    (идемпотентно, уже CONFIRMED не трогаем), но одним set-based UPDATE.
+    Возвращает количество реально подтверждённых бронирований.
+    """
+    changed = await uow.bookings.confirm_paid_bulk(payments)
+    return len(changed)
+
+
+async def confirm_orders_after_payment_bulk(
+    uow: UnitOfWork,
+    payments: dict[int, str | None],
+) -> int:
+    """
+    Пакетный вариант confirm_order_after_payment (reconciliation).
+
+    payments: order_id -> payment_intent_id. Как и webhook, бронирования
+    подтверждаются только для заказов, которые этим вызовом перешли в PAID.
+    Возвращает количество заказов, переведённых в PAID.
+    """
+    newly_paid = await uow.orders.mark_paid_bulk(list(payments))
+    if newly_paid:
+        await uow.bookings.confirm_paid_by_order_ids(
+            {order_id: payments[order_id] for order_id in newly_paid}
+        )
+    return len(newly_paid)
+
+
+traced_module(__name__)
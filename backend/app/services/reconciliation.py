@@ -0,0 +1,283 @@
+"""
+Сверка оплат со Stripe (reconciliation) — страховка на случай потерянных webhook'ов.
+
+Почему отдельный сервис:
+- Webhook может не дойти (сбой сети, отключённый endpoint, отставание обработки),
+  и бронирование остаётся pending, хотя Stripe уже списал деньги.
+- Сверка постранично читает Checkout Sessions за окно времени, сопоставляет их
+  с бронированиями/заказами (metadata и checkout_session_id) и применяет
+  изменения пачками через те же сервисы payment, что и webhook.
+
+Выборка из Stripe:
+- окно [created_from, created_to) режется на срезы, каждый срез листается
+  курсором starting_after;
+- одновременно выполняется не больше `concurrency` запросов (семафор);
+- SDK синхронный, поэтому каждый запрос уходит в поток (asyncio.to_thread).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+import structlog
+
+from app.core.tracing import CLIENT, span, traced_module
+from app.core.uow import UnitOfWork
+from app.services.payment import (
+    confirm_bookings_after_payment_bulk,
+    confirm_orders_after_payment_bulk,
+)
+
+STRIPE_MAX_PAGE_SIZE = 100
+
+
+@dataclass(frozen=True, slots=True)
+class CheckoutSessionSnapshot:
+    """Минимальный срез Checkout Session, нужный для сверки."""
+
+    id: str
+    created: int
+    status: str | None
+    payment_status: str | None
+    booking_id: int | None
+    order_id: int | None
+    payment_intent_id: str | None
+
+    @property
+    def is_paid(self) -> bool:
+        return self.payment_status == "paid"
+
+
+@dataclass
+class ReconciliationReport:
+    """Итог прогона сверки (для CLI и логов)."""
+
+    sessions_seen: int = 0
+    sessions_paid: int = 0
+    pages_fetched: int = 0
+    bookings_confirmed: int = 0
+    orders_paid: int = 0
+    unmatched_session_ids: list[str] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def sessions_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.sessions_seen / self.elapsed_seconds
+
+
+def _to_int(value: Any) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def snapshot_from_stripe(obj: Any) -> CheckoutSessionSnapshot:
+    """Собрать CheckoutSessionSnapshot из объекта Stripe (StripeObject или dict)."""
+    if hasattr(obj, "to_dict"):
+        obj = obj.to_dict()
+    metadata = obj.get("metadata") or {}
+    payment_intent = obj.get("payment_intent")
+    if isinstance(payment_intent, dict):
+        payment_intent = payment_intent.get("id")
+    return CheckoutSessionSnapshot(
+        id=obj["id"],
+        created=int(obj.get("created") or 0),
+        status=obj.get("status"),
+        payment_status=obj.get("payment_status"),
+        booking_id=_to_int(metadata.get("booking_id")),
+        order_id=_to_int(metadata.get("order_id")),
+        payment_intent_id=payment_intent,
+    )
+
+
+def split_window(created_from: int, created_to: int, slices: int) -> list[tuple[int, int]]:
+    """Разбить [created_from, created_to) на не более `slices` непересекающихся срезов."""
+    if created_to <= created_from:
+        return []
+    slices = max(1, min(slices, created_to - created_from))
+    step, rest = divmod(created_to - created_from, slices)
+    windows: list[tuple[int, int]] = []
+    start = created_from
+    for idx in range(slices):
+        end = start + step + (1 if idx < rest else 0)
+        windows.append((start, end))
+        start = end
+    return windows
+
+
+async def iter_checkout_session_pages(
+    client: Any,
+    *,
+    created_from: datetime,
+    created_to: datetime,
+    concurrency: int = 8,
+    slices: int | None = None,
+    page_size: int = STRIPE_MAX_PAGE_SIZE,
+) -> AsyncIterator[list[CheckoutSessionSnapshot]]:
+    """
+    Постранично выдать Checkout Sessions за окно [created_from, created_to).
+
+    Срезы окна листаются параллельно; семафор ограничивает число одновременных
+    запросов к Stripe значением `concurrency`. Порядок страниц не гарантирован.
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    windows = split_window(
+        int(created_from.timestamp()),
+        int(created_to.timestamp()),
+        slices or max(1, concurrency),
+    )
+    # Ограниченная очередь: медленная запись в БД тормозит чтение, память не растёт.
+    queue: asyncio.Queue[list[CheckoutSessionSnapshot]] = asyncio.Queue(
+        maxsize=max(1, concurrency) * 2
+    )
+    limit = max(1, min(page_size, STRIPE_MAX_PAGE_SIZE))
+
+    async def fetch_window(gte: int, lt: int) -> None:
+        starting_after: str | None = None
+        while True:
+            params: dict[str, Any] = {"created": {"gte": gte, "lt": lt}, "limit": limit}
+            if starting_after is not None:
+                params["starting_after"] = starting_after
+            async with semaphore:
+                with span("stripe.checkout.sessions.list", kind=CLIENT):
+                    page = await asyncio.to_thread(client.v1.checkout.sessions.list, params)
+            items = list(page.data)
+            if items:
+                await queue.put([snapshot_from_stripe(item) for item in items])
+            if not page.has_more or not items:
+                return
+            starting_after = items[-1]["id"]
+
+    async def run_all() -> None:
+        async with asyncio.TaskGroup() as tg:
+            for gte, lt in windows:
+                tg.create_task(fetch_window(gte, lt))
+
+    producer = asyncio.create_task(run_all())
+    try:
+        while not (producer.done() and queue.empty()):
+            if producer.done() and producer.exception() is not None:
+                break
+            getter = asyncio.ensure_future(queue.get())
+            await asyncio.wait({getter, producer}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+            else:
+                getter.cancel()
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+
+
+async def apply_checkout_sessions(
+    uow: UnitOfWork,
+    sessions: list[CheckoutSessionSnapshot],
+    report: ReconciliationReport,
+) -> None:
+    """
+    Применить пачку оплаченных сессий к БД (без commit — им управляет вызывающий).
+
+    Сопоставление повторяет webhook: сначала order_id из metadata, затем booking_id,
+    а для сессий без metadata — поиск бронирования по checkout_session_id.
+    """
+    order_payments: dict[int, str | None] = {}
+    booking_payments: dict[int, str | None] = {}
+    by_session_id: dict[str, CheckoutSessionSnapshot] = {}
+
+    for s in sessions:
+        if not s.is_paid:
+            continue
+        report.sessions_paid += 1
+        if s.order_id is not None:
+            order_payments[s.order_id] = s.payment_intent_id
+        elif s.booking_id is not None:
+            booking_payments[s.booking_id] = s.payment_intent_id
+        else:
+            by_session_id[s.id] = s
+
+    if by_session_id:
+        matched = await uow.bookings.map_ids_by_checkout_session_ids(list(by_session_id))
+        for session_id, s in by_session_id.items():
+            booking_id = matched.get(session_id)
+            if booking_id is None:
+                report.unmatched_session_ids.append(session_id)
+                continue
+            booking_payments[booking_id] = s.payment_intent_id
+
+    report.orders_paid += await confirm_orders_after_payment_bulk(uow, order_payments)
+    report.bookings_confirmed += await confirm_bookings_after_payment_bulk(uow, booking_payments)
+
+
+async def reconcile_checkout_sessions(
+    client: Any,
+    uow: UnitOfWork,
+    *,
+    created_from: datetime,
+    created_to: datetime,
+    concurrency: int = 8,
+    slices: int | None = None,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+) -> ReconciliationReport:
+    """
+    Полный прогон сверки за окно времени.
+
+    Сессии копятся до `batch_size` и применяются одной транзакцией на пачку,
+    чтобы не держать долгую транзакцию на весь прогон. При dry_run изменения
+    откатываются — отчёт показывает, что было бы подтверждено.
+    """
+    logger = structlog.get_logger(__name__)
+    report = ReconciliationReport()
+    started = time.perf_counter()
+    pending: list[CheckoutSessionSnapshot] = []
+
+    async def flush_batch() -> None:
+        if not pending:
+            return
+        await apply_checkout_sessions(uow, pending, report)
+        if dry_run:
+            await uow.rollback()
+        else:
+            await uow.commit()
+        pending.clear()
+
+    async for page in iter_checkout_session_pages(
+        client,
+        created_from=created_from,
+        created_to=created_to,
+        concurrency=concurrency,
+        slices=slices,
+    ):
+        report.pages_fetched += 1
+        report.sessions_seen += len(page)
+        pending.extend(page)
+        if len(pending) >= batch_size:
+            await flush_batch()
+    await flush_batch()
+
+    report.elapsed_seconds = time.perf_counter() - started
+    logger.info(
+        "stripe_reconciliation_finished",
+        sessions_seen=report.sessions_seen,
+        sessions_paid=report.sessions_paid,
+        pages_fetched=report.pages_fetched,
+        bookings_confirmed=report.bookings_confirmed,
+        orders_paid=report.orders_paid,
+        unmatched=len(report.unmatched_session_ids),
+        elapsed_seconds=round(report.elapsed_seconds, 3),
+        dry_run=dry_run,
+    )
+    return report
+
+
+traced_module(__name__)
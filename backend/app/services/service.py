@@ -14,6 +14,7 @@ from datetime import UTC, date, datetime, time, timedelta
 
 from app.core.datetime_utils import to_naive_utc
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.tracing import traced_module
 from app.core.uow import UnitOfWork
 from app.models import (
     Booking,
@@ -39,6 +40,7 @@ from app.schemas import (
     ServiceUpdate,
     StudioPublicResponse,
 )
+from app.services.booking import booking_outcomes
 
 
 def _combine_date_time(d: date, t: time) -> datetime:
@@ -378,6 +380,8 @@ async def create_course_booking(
         now=now_utc,
     )
     if not availability.can_book:
+        outcome = "oversell_prevented" if availability.hard_block else "no_seats"
+        booking_outcomes.inc("course", outcome)
         raise ValidationError(
             availability.message or "Not enough seats for the course",
         )
@@ -436,6 +440,7 @@ async def create_course_booking(
     await uow.session.flush()
     for b in bookings:
         await uow.session.refresh(b)
+    booking_outcomes.inc("course", "created")
 
     order_schema = OrderResponse.model_validate(order)
     # Отложим полноценный маппинг BookingResponse, пока основной поток остаётся single-slot
@@ -639,3 +644,6 @@ async def get_service_availability(
         warning_message=availability.message,
         schedule_details=details,
     )
+
+
+traced_module(__name__)
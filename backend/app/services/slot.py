@@ -9,8 +9,11 @@
 
 from datetime import datetime
 
+from sqlalchemy import Row
+
 from app.core.datetime_utils import to_naive_utc
 from app.core.exceptions import NotFoundError, ValidationError
+from app.core.tracing import traced_module
 from app.core.uow import UnitOfWork
 from app.models.slot import Slot
 from app.schemas.slot import SlotCreate, SlotUpdate
@@ -38,9 +41,9 @@ async def get_slots(
     start_from: datetime | None = None,
     start_to: datetime | None = None,
     is_active: bool | None = None,
-) -> list[Slot]:
-    """Список слотов с фильтрами."""
-    return await uow.slots.list_(
+) -> list[Row]:
+    """Список слотов с фильтрами (строки SLOT_COLUMNS, без ORM-объектов)."""
+    return await uow.slots.list_rows(
         skip=skip,
         limit=limit,
         studio_id=studio_id,
@@ -119,3 +122,6 @@ async def delete_slot(uow: UnitOfWork, slot: Slot) -> None:
     """Удалить слот. Cascade удалит бронирования."""
     await uow.session.delete(slot)
     await uow.session.flush()
+
+
+traced_module(__name__)
@@ -7,7 +7,10 @@
 - Переиспользование в разных эндпоинтах (API, webhooks, CLI)
 """
 
+from sqlalchemy import Row
+
 from app.core.exceptions import ForbiddenError, NotFoundError, ValidationError
+from app.core.tracing import traced_module
 from app.core.uow import UnitOfWork
 from app.models.studio import Studio
 from app.schemas.studio import StudioCreate, StudioUpdate
@@ -29,9 +32,9 @@ async def get_studios(
     category: str | None = None,
     query: str | None = None,
     amenities: list[str] | None = None,
-) -> list[Studio]:
-    """Список студий с пагинацией и фильтрами."""
-    return await uow.studios.list_(
+) -> list[Row]:
+    """Список студий с пагинацией и фильтрами (строки STUDIO_COLUMNS, без ORM-объектов)."""
+    return await uow.studios.list_rows(
         skip=skip,
         limit=limit,
         owner_id=owner_id,
@@ -118,3 +121,6 @@ async def delete_studio(uow: UnitOfWork, studio: Studio) -> None:
     """Удалить студию. Cascade удалит связанные слоты."""
     await uow.session.delete(studio)
     await uow.session.flush()
+
+
+traced_module(__name__)
@@ -1,16 +1,69 @@
 """
 Бизнес-логика для пользователей.
+
+UserPrincipal — лёгкий снимок пользователя для авторизации (id, email, ...).
+Большинству защищённых эндпоинтов нужен только user.id (ensure_studio_owner),
+поэтому принципал кэшируется по user_id (TagCache с тегом "user:<id>") и не
+требует SELECT users на каждый запрос. Commit, изменивший строку users,
+инвалидирует запись во всех воркерах (app.core.cache_invalidation); logout
+сбрасывает её в своём воркере после commit.
 """
 
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from app.core.cache import TagCache, entity_tag, invalidate_tags
+from app.core.config import settings
+from app.core.tracing import traced_module
 from app.core.uow import UnitOfWork
 from app.models.user import User
 
 
+@dataclass(frozen=True, slots=True)
+class UserPrincipal:
+    """Аутентифицированный пользователь без ORM-объекта (безопасно кэшировать)."""
+
+    id: int
+    email: str
+    is_active: bool = True
+
+    @classmethod
+    def from_user(cls, user: User) -> UserPrincipal:
+        # is_active=None у ещё не сохранённого User — значит default (True)
+        return cls(id=user.id, email=user.email, is_active=user.is_active is not False)
+
+
+principal_cache: TagCache[int, UserPrincipal] = TagCache(
+    "user_principal",
+    max_size=settings.USER_CACHE_MAX_SIZE,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    entities=(User,),
+    shared=True,
+    value_type=UserPrincipal,
+)
+
+
 async def get_user_by_id(uow: UnitOfWork, user_id: int) -> User | None:
     """Получить пользователя по ID."""
     return await uow.users.get_by_id(user_id)
 
 
+async def get_user_principal(uow: UnitOfWork, user_id: int) -> UserPrincipal | None:
+    """Принципал из кэша; при промахе — SELECT users и запись в кэш."""
+
+    async def load() -> UserPrincipal | None:
+        user = await uow.users.get_by_id(user_id)
+        return UserPrincipal.from_user(user) if user is not None else None
+
+    return await principal_cache.get_or_load(user_id, load, tags=(entity_tag(User, user_id),))
+
+
+def invalidate_user_principal(user_id: int) -> None:
+    """Сбросить закэшированного пользователя сразу (logout), не дожидаясь commit."""
+    invalidate_tags((entity_tag(User, user_id),))
+
+
 async def get_user_by_email(uow: UnitOfWork, email: str) -> User | None:
     """Получить пользователя по email."""
     return await uow.users.get_by_email(email)
@@ -35,3 +88,6 @@ async def get_or_create_user(
     await uow.session.flush()
     await uow.session.refresh(user)
     return user
+
+
+traced_module(__name__)
@@ -34,7 +34,7 @@ async def app_with_rollback_uow():
     Все запросы в рамках одного теста видят одну транзакцию (данные из первого
     запроса доступны во втором). После теста транзакция откатывается — БД не засоряется.
     """
-    from app.api.deps import get_uow
+    from app.api.deps import get_read_uow, get_uow
     from app.core.database import async_session_maker
     from app.core.uow import create_uow
     from app.main import app
@@ -47,6 +47,8 @@ async def app_with_rollback_uow():
             # Не коммитим — в конце теста делаем rollback
 
         app.dependency_overrides[get_uow] = get_uow_override
+        # Чтение — в той же транзакции, иначе GET не увидит данные теста
+        app.dependency_overrides[get_read_uow] = get_uow_override
         # Для интеграционных тестов webhook: одна и та же сессия на весь тест
         app.state._integration_session = session
         try:
@@ -54,6 +56,7 @@ async def app_with_rollback_uow():
         finally:
             await session.rollback()
             app.dependency_overrides.pop(get_uow, None)
+            app.dependency_overrides.pop(get_read_uow, None)
             if hasattr(app.state, "_integration_session"):
                 del app.state._integration_session
 
@@ -73,3 +76,36 @@ async def client(app_with_rollback_uow):
         base_url="http://test",
     ) as ac:
         yield ac
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Контекстный менеджер: блок выполняет не больше `max_queries` SQL-запросов.
+
+    Считает все statements основного engine (в т.ч. с сессии get_uow-override),
+    при превышении падает со списком запросов — так N+1 ловится в тесте, а не в проде.
+    """
+    from contextlib import contextmanager
+
+    from sqlalchemy import event
+
+    from app.core.database import engine
+
+    @contextmanager
+    def check(max_queries: int):
+        statements: list[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} queries (max {max_queries}):\n" + "\n".join(statements)
+        )
+
+    return check
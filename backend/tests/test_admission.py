@@ -0,0 +1,110 @@
+"""
+Тесты admission control: классы маршрутов, быстрый 503 с Retry-After при
+исчерпанном бюджете класса, statement_timeout класса внутри запроса,
+503 при таймауте пула соединений.
+"""
+
+import asyncio
+import json
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.database import statement_timeout_var
+from app.core.middleware.admission import (
+    AUTH,
+    BOOKING_WRITES,
+    PUBLIC_READS,
+    WEBHOOKS,
+    AdmissionControlMiddleware,
+    RouteClass,
+    classify,
+)
+
+release_search = asyncio.Event()
+
+
+async def search(request: Request) -> PlainTextResponse:
+    await release_search.wait()
+    return PlainTextResponse("found")
+
+
+async def timeout(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(str(statement_timeout_var.get()))
+
+
+def _client() -> httpx.AsyncClient:
+    app = Starlette(
+        routes=[
+            Route("/api/v1/search", search),
+            Route("/api/v1/bookings", timeout, methods=["GET", "POST"]),
+            Route("/health", timeout),
+        ]
+    )
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        classes={
+            PUBLIC_READS: RouteClass(max_concurrency=1, statement_timeout_ms=3000),
+            BOOKING_WRITES: RouteClass(max_concurrency=1, statement_timeout_ms=10000),
+        },
+        queue_timeout=0.05,
+        retry_after_seconds=2,
+    )
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_classify_route_classes():
+    assert classify("GET", "/api/v1/search") == PUBLIC_READS
+    assert classify("GET", "/api/v1/studios/3") == PUBLIC_READS
+    assert classify("POST", "/api/v1/bookings") == BOOKING_WRITES
+    assert classify("POST", "/api/v1/payments/checkout") == BOOKING_WRITES
+    assert classify("POST", "/webhooks/stripe") == WEBHOOKS
+    assert classify("POST", "/api/v1/auth/magic-link") == AUTH
+    assert classify("GET", "/health/ready") is None
+    assert classify("GET", "/metrics") is None
+
+
+async def test_full_read_budget_fails_fast_without_blocking_writes():
+    release_search.clear()
+    async with _client() as client:
+        first = asyncio.create_task(client.get("/api/v1/search"))
+        await asyncio.sleep(0.01)
+
+        rejected = await client.get("/api/v1/search")
+        write = await client.post("/api/v1/bookings")
+
+        release_search.set()
+        assert (await first).status_code == 200
+
+    assert rejected.status_code == 503
+    assert rejected.headers["retry-after"] == "2"
+    assert json.loads(rejected.content)["status"] == 503
+    assert write.status_code == 200
+
+
+async def test_statement_timeout_follows_route_class():
+    async with _client() as client:
+        read = await client.get("/api/v1/bookings")
+        write = await client.post("/api/v1/bookings")
+        exempt = await client.get("/health")
+
+    assert read.text == "3000"
+    assert write.text == "10000"
+    assert exempt.text == "None"
+    assert statement_timeout_var.get() is None
+
+
+async def test_pool_timeout_is_a_fast_503():
+    from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+    from app.main import pool_timeout_handler
+
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    response = await pool_timeout_handler(request, PoolTimeoutError("QueuePool limit"))
+
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+    assert json.loads(response.body)["type"] == "overloaded"
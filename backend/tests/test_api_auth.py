@@ -48,7 +48,7 @@ async def test_health_ready():
 @pytest.mark.asyncio
 async def test_magic_link_request_returns_200(client):
     """POST /auth/magic-link/request returns 200."""
-    with patch("app.services.auth.send_magic_link_email", new_callable=AsyncMock):
+    with patch("app.services.auth.enqueue_magic_link_email", new_callable=AsyncMock):
         r = await client.post(
             "/api/v1/auth/magic-link/request",
             json={"email": "test-auth@example.com", "name": "Test User"},
@@ -77,10 +77,10 @@ async def test_full_auth_flow_refresh_logout_me(client):
     """
     captured_url = []
 
-    async def capture_email(to: str, url: str) -> None:
+    async def capture_email(uow, to: str, url: str) -> None:
         captured_url.append(url)
 
-    with patch("app.services.auth.send_magic_link_email", side_effect=capture_email):
+    with patch("app.services.auth.enqueue_magic_link_email", side_effect=capture_email):
         r1 = await client.post(
             "/api/v1/auth/magic-link/request",
             json={"email": "flow@example.com", "name": "Flow User"},
@@ -166,10 +166,10 @@ async def test_refresh_missing_csrf_header_returns_403(client):
     # Bootstrap cookies via verify
     captured_url = []
 
-    async def capture_email(to: str, url: str) -> None:
+    async def capture_email(uow, to: str, url: str) -> None:
         captured_url.append(url)
 
-    with patch("app.services.auth.send_magic_link_email", side_effect=capture_email):
+    with patch("app.services.auth.enqueue_magic_link_email", side_effect=capture_email):
         r1 = await client.post(
             "/api/v1/auth/magic-link/request",
             json={"email": "csrf@example.com", "name": "CSRF User"},
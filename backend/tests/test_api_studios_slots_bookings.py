@@ -19,10 +19,10 @@ async def _authenticate_user(client: AsyncClient, email: str = "owner@example.co
     """
     captured_url: list[str] = []
 
-    async def capture_email(to: str, url: str) -> None:
+    async def capture_email(uow, to: str, url: str) -> None:
         captured_url.append(url)
 
-    with patch("app.services.auth.send_magic_link_email", new_callable=AsyncMock) as mock_send:
+    with patch("app.services.auth.enqueue_magic_link_email", new_callable=AsyncMock) as mock_send:
         mock_send.side_effect = capture_email
         r1 = await client.post(
             "/api/v1/auth/magic-link/request",
@@ -174,3 +174,58 @@ async def test_slot_and_booking_flow(client: AsyncClient):
     # Слот больше не существует
     r_get_slot = await client.get(f"/api/v1/slots/{slot_id}")
     assert r_get_slot.status_code == 404
+
+
+@pytest.mark.integration
+@pytest.mark.asyncio
+async def test_my_bookings_query_count_does_not_grow_with_bookings(
+    client: AsyncClient, assert_max_queries
+):
+    """
+    /bookings/my отдаёт Booking + Slot + Studio фиксированным числом запросов,
+    сколько бы бронирований ни было (регрессия N+1).
+    """
+    email = "my-bookings@example.com"
+    access, _ = await _authenticate_user(client, email=email)
+    headers = {"Authorization": f"Bearer {access}"}
+
+    r_studio = await client.post(
+        "/api/v1/studios",
+        json={"name": "Query Count Studio", "email": "qc-studio@example.com"},
+        headers=headers,
+    )
+    assert r_studio.status_code == 201
+    studio_id = r_studio.json()["id"]
+
+    start = datetime.now(UTC) + timedelta(days=1)
+    for i in range(6):
+        slot_start = start + timedelta(hours=i)
+        r_slot = await client.post(
+            "/api/v1/slots",
+            json={
+                "start_time": slot_start.isoformat(),
+                "end_time": (slot_start + timedelta(hours=1)).isoformat(),
+                "title": f"Class {i}",
+                "max_capacity": 5,
+                "price_cents": 1000,
+                "studio_id": studio_id,
+            },
+            headers=headers,
+        )
+        assert r_slot.status_code == 201
+        r_booking = await client.post(
+            "/api/v1/bookings",
+            json={
+                "slot_id": r_slot.json()["id"],
+                "guest_name": "Me",
+                "guest_email": email,
+            },
+        )
+        assert r_booking.status_code == 201
+
+    with assert_max_queries(4):
+        r_my = await client.get("/api/v1/bookings/my", headers=headers)
+
+    assert r_my.status_code == 200
+    assert len(r_my.json()) == 6
+    assert all(item["studio"]["id"] == studio_id for item in r_my.json())
@@ -0,0 +1,132 @@
+"""
+Тесты архивации прошедших слотов: окно ARCHIVE_AFTER_DAYS, перенос одним
+DELETE ... RETURNING → INSERT, подсчёт по пачкам и API истории.
+"""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.dialects import postgresql
+
+from app.core.repositories.archive_repo import ArchiveRepository
+from app.services import archive as archive_module
+from app.services.archive import archive_past_slots, run_slot_archive
+
+
+async def test_archive_batch_uses_retention_window():
+    uow = MagicMock()
+    uow.archive.archive_slots_ended_before = AsyncMock(return_value=(3, 7))
+    now = datetime(2026, 5, 10, tzinfo=UTC)
+
+    with patch.object(archive_module.settings, "ARCHIVE_AFTER_DAYS", 30):
+        moved = await archive_past_slots(uow, batch_size=100, now=now)
+
+    assert moved == (3, 7)
+    uow.archive.archive_slots_ended_before.assert_awaited_once_with(
+        now - timedelta(days=30), limit=100
+    )
+
+
+async def test_archive_moves_bookings_then_slots_in_single_statements():
+    session = AsyncMock(info={})
+    session.execute.side_effect = [
+        MagicMock(scalars=lambda: MagicMock(all=lambda: [11, 12])),
+        MagicMock(rowcount=5),
+        MagicMock(rowcount=2),
+    ]
+
+    moved = await ArchiveRepository(session).archive_slots_ended_before(
+        datetime.now(UTC), limit=500
+    )
+
+    assert moved == (2, 5)
+    select_sql, bookings_sql, slots_sql = (
+        str(call.args[0].compile(dialect=postgresql.dialect()))
+        for call in session.execute.call_args_list
+    )
+    assert "FOR UPDATE SKIP LOCKED" in select_sql
+    assert "slots.start_time <" in select_sql
+    assert "ORDER BY slots.start_time" in select_sql
+    assert "DELETE FROM bookings" in bookings_sql
+    assert "INSERT INTO bookings_archive" in bookings_sql
+    assert "RETURNING bookings.id, bookings.slot_id" in bookings_sql
+    assert "DELETE FROM slots" in slots_sql
+    assert "INSERT INTO slots_archive" in slots_sql
+    assert session.info["cache_tags"] == {"slot", "booking"}
+
+
+async def test_archive_with_nothing_to_move_runs_one_query():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(scalars=lambda: MagicMock(all=lambda: []))
+
+    assert await ArchiveRepository(session).archive_slots_ended_before(
+        datetime.now(UTC), limit=500
+    ) == (0, 0)
+    assert session.execute.await_count == 1
+
+
+async def test_run_slot_archive_counts_slots_and_bookings_across_batches():
+    batches = iter([(2, 5), (1, 1)])
+    slots_before = archive_module.slots_archived.value
+    bookings_before = archive_module.bookings_archived.value
+
+    async def fake_archive(uow, *, batch_size):
+        return next(batches)
+
+    async def two_batches(session_factory, batch, *, batch_size, max_batches):
+        return await batch(MagicMock(), batch_size) + await batch(MagicMock(), batch_size)
+
+    with (
+        patch.object(archive_module, "archive_past_slots", fake_archive),
+        patch.object(archive_module, "run_in_batches", two_batches),
+    ):
+        await run_slot_archive(MagicMock())
+
+    assert archive_module.slots_archived.value == slots_before + 3
+    assert archive_module.bookings_archived.value == bookings_before + 6
+
+
+@pytest.fixture
+async def history_client():
+    from app.api.deps import get_read_principal_required, get_read_uow
+    from app.main import app
+
+    async def no_uow():
+        yield MagicMock()
+
+    app.dependency_overrides[get_read_uow] = no_uow
+    app.dependency_overrides[get_read_principal_required] = lambda: SimpleNamespace(
+        id=1, email="me@example.com"
+    )
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+    finally:
+        app.dependency_overrides.pop(get_read_uow, None)
+        app.dependency_overrides.pop(get_read_principal_required, None)
+
+
+async def test_booking_history_route_is_not_shadowed_by_booking_id(history_client):
+    history = AsyncMock(return_value=[])
+    with patch("app.api.v1.bookings.get_my_booking_history", history):
+        response = await history_client.get("/api/v1/bookings/history?limit=10")
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert history.await_args.kwargs["limit"] == 10
+
+
+async def test_history_rows_join_archived_slot_and_studio():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(all=lambda: [])
+
+    await ArchiveRepository(session).list_my_rows(user_id=1, user_email="me@example.com")
+
+    statement = session.execute.await_args.args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "FROM bookings_archive JOIN slots_archive" in sql
+    assert "JOIN studios ON studios.id = slots_archive.studio_id" in sql
+    assert [c["name"] for c in statement.column_descriptions][-2:] == ["slot", "studio"]
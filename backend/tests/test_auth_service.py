@@ -2,27 +2,34 @@
 Юнит-тесты для app.services.auth с моками БД/UoW.
 """
 
-from datetime import UTC
-from unittest.mock import AsyncMock, patch
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.exceptions import ValidationError
+from app.core.security import hash_magic_link_token
 from app.core.uow import UnitOfWork
+from app.models.magic_link_token import MagicLinkToken
 from app.models.user import User
 from app.services import auth as auth_module
 from app.services.auth import (
+    get_current_principal_from_token,
     get_current_user_from_token,
+    get_principal_from_token_claims,
     logout_current_session,
+    purge_magic_link_tokens,
+    purge_refresh_tokens,
+    request_magic_link,
+    verify_magic_link,
 )
+from app.services.user import UserPrincipal, principal_cache
 
 
 @pytest.fixture
 def mock_user():
-    u = User(id=1, email="user@example.com", name="Test User")
-    u.magic_link_token = None
-    u.magic_link_expires_at = None
-    return u
+    return User(id=1, email="user@example.com", name="Test User")
 
 
 @pytest.fixture
@@ -61,12 +68,59 @@ class TestGetCurrentUserFromToken:
         assert user is None
 
 
+class TestGetCurrentPrincipalFromToken:
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        principal_cache.clear()
+        yield
+        principal_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_second_request_served_from_cache(self, mock_uow, mock_user):
+        mock_uow.users = AsyncMock()
+        mock_uow.users.get_by_id = AsyncMock(return_value=mock_user)
+        with patch.object(auth_module, "get_user_id_from_access_token", return_value=1):
+            first = await get_current_principal_from_token(mock_uow, "token")
+            second = await get_current_principal_from_token(mock_uow, "token")
+        assert first == second == UserPrincipal(id=1, email="user@example.com", is_active=True)
+        mock_uow.users.get_by_id.assert_awaited_once_with(1)
+
+    @pytest.mark.asyncio
+    async def test_logout_invalidates_cached_principal_after_commit(self, mock_uow, mock_user):
+        from starlette.requests import Request
+        from starlette.responses import Response
+
+        from app.api.v1.auth import logout
+
+        principal = UserPrincipal(id=1, email="user@example.com")
+        principal_cache.set(1, principal, tags=["user:1"])
+        cached_during_commit = []
+        mock_uow.commit = AsyncMock(
+            side_effect=lambda: cached_during_commit.append(principal_cache.get(1))
+        )
+        request = Request(
+            {"type": "http", "method": "POST", "headers": [(b"cookie", b"refresh_token=t")]}
+        )
+        with patch.object(auth_module, "parse_refresh_token", return_value=None):
+            await logout(request, Response(), mock_uow, principal)
+
+        assert cached_during_commit == [principal]
+        assert principal_cache.get(1) is None
+
+    def test_principal_from_claims_needs_no_db(self):
+        from app.core.security import create_access_token
+
+        principal = get_principal_from_token_claims(create_access_token(7, "owner@example.com"))
+        assert principal == UserPrincipal(id=7, email="owner@example.com")
+        assert get_principal_from_token_claims("garbage") is None
+
+
 class TestLogoutCurrentSession:
     @pytest.mark.asyncio
     async def test_invalid_token_no_op(self, mock_uow, mock_user):
         with patch.object(auth_module, "parse_refresh_token", return_value=None):
             await logout_current_session(mock_uow, mock_user, "invalid")
-        mock_uow.refresh_tokens.get_by_user_and_jti.assert_not_called()
+        mock_uow.refresh_tokens.get_active_by_user_and_jti.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_wrong_user_token_no_op(self, mock_uow, mock_user):
@@ -77,4 +131,104 @@ class TestLogoutCurrentSession:
         data = RefreshTokenData(user_id=999, jti="jti", expires_at=datetime.now(UTC))
         with patch.object(auth_module, "parse_refresh_token", return_value=data):
             await logout_current_session(mock_uow, mock_user, "token")
-        mock_uow.refresh_tokens.get_by_user_and_jti.assert_not_called()
+        mock_uow.refresh_tokens.get_active_by_user_and_jti.assert_not_called()
+
+
+class TestPurgeRefreshTokens:
+    @pytest.mark.asyncio
+    async def test_purges_one_batch_older_than_retention(self, mock_uow):
+        mock_uow.refresh_tokens.purge_stale = AsyncMock(return_value=500)
+        now = datetime(2026, 5, 10, tzinfo=UTC)
+        with patch.object(auth_module.settings, "REFRESH_TOKEN_RETENTION_DAYS", 7):
+            deleted = await purge_refresh_tokens(mock_uow, batch_size=500, now=now)
+        assert deleted == 500
+        mock_uow.refresh_tokens.purge_stale.assert_awaited_once_with(
+            older_than=now - timedelta(days=7), limit=500
+        )
+
+    @pytest.mark.asyncio
+    async def test_purge_statement_is_bounded_and_skips_locked_rows(self):
+        from sqlalchemy.dialects import postgresql
+
+        from app.core.repositories.refresh_token_repo import RefreshTokenRepository
+
+        session = AsyncMock()
+        await RefreshTokenRepository(session).purge_stale(older_than=datetime.now(UTC), limit=10)
+        stmt = session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "DELETE FROM refresh_tokens" in sql
+        assert "LIMIT" in sql
+        assert "FOR UPDATE SKIP LOCKED" in sql
+
+    def test_purge_predicate_columns_are_indexed(self):
+        from app.models.refresh_token import RefreshToken
+
+        indexes = {ix.name: ix for ix in RefreshToken.__table__.indexes}
+        assert [c.name for c in indexes["ix_refresh_tokens_expires_at"].columns] == ["expires_at"]
+        revoked = indexes["ix_refresh_tokens_revoked_at_not_null"]
+        assert [c.name for c in revoked.columns] == ["revoked_at"]
+        assert str(revoked.dialect_options["postgresql"]["where"]) == "revoked_at IS NOT NULL"
+
+
+class TestMagicLinkTokens:
+    @pytest.mark.asyncio
+    async def test_request_adds_token_row_and_keeps_previous_links(self, mock_uow, mock_user):
+        mock_uow.session.add = MagicMock()
+        with (
+            patch.object(auth_module, "get_or_create_user", AsyncMock(return_value=mock_user)),
+            patch.object(auth_module, "enqueue_magic_link_email", AsyncMock()) as enqueue,
+        ):
+            await request_magic_link(mock_uow, "user@example.com", "Test User")
+            await request_magic_link(mock_uow, "user@example.com", "Test User")
+
+        rows = [c.args[0] for c in mock_uow.session.add.call_args_list]
+        assert all(isinstance(r, MagicLinkToken) and r.user_id == 1 for r in rows)
+        assert rows[0].token_hash != rows[1].token_hash
+        token = enqueue.await_args_list[0].args[2].split("token=")[1]
+        assert rows[0].token_hash == hash_magic_link_token(token)
+
+    @pytest.mark.asyncio
+    async def test_verify_consumes_token_by_hash(self, mock_uow, mock_user):
+        mock_uow.magic_links = AsyncMock()
+        mock_uow.magic_links.consume = AsyncMock(return_value=1)
+        mock_uow.session.add = MagicMock()
+        with patch.object(auth_module, "get_user_by_id", AsyncMock(return_value=mock_user)):
+            user, access, refresh, csrf = await verify_magic_link(mock_uow, "tok")
+        assert user is mock_user and access and refresh and csrf
+        assert mock_uow.magic_links.consume.await_args.args[0] == hash_magic_link_token("tok")
+
+    @pytest.mark.asyncio
+    async def test_verify_unknown_or_used_token_raises(self, mock_uow):
+        mock_uow.magic_links = AsyncMock()
+        mock_uow.magic_links.consume = AsyncMock(return_value=None)
+        with pytest.raises(ValidationError):
+            await verify_magic_link(mock_uow, "tok")
+
+    @pytest.mark.asyncio
+    async def test_purge_deletes_expired_batch(self, mock_uow):
+        mock_uow.magic_links = AsyncMock()
+        mock_uow.magic_links.purge_expired = AsyncMock(return_value=3)
+        now = datetime(2026, 5, 10, tzinfo=UTC)
+        assert await purge_magic_link_tokens(mock_uow, batch_size=100, now=now) == 3
+        mock_uow.magic_links.purge_expired.assert_awaited_once_with(now=now, limit=100)
+
+    @pytest.mark.asyncio
+    async def test_consume_is_single_delete_returning_by_hash(self):
+        from sqlalchemy.dialects import postgresql
+
+        from app.core.repositories.magic_link_token_repo import MagicLinkTokenRepository
+
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = 42
+        session = AsyncMock()
+        session.execute = AsyncMock(return_value=result)
+
+        user_id = await MagicLinkTokenRepository(session).consume("h", datetime.now(UTC))
+
+        assert user_id == 42
+        result.scalar_one_or_none.assert_called_once_with()
+        stmt = session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        assert "DELETE FROM magic_link_tokens" in sql
+        assert "magic_link_tokens.token_hash =" in sql
+        assert "RETURNING magic_link_tokens.user_id" in sql
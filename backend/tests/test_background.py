@@ -0,0 +1,62 @@
+"""
+Тесты фоновых задач (app.core.background).
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.background import PeriodicTask, run_in_batches
+
+
+def _session_factory() -> tuple[MagicMock, list[MagicMock]]:
+    sessions: list[MagicMock] = []
+
+    @asynccontextmanager
+    async def factory():
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session.rollback = AsyncMock()
+        session.new = session.dirty = session.deleted = ()
+        session.info = {"uow_has_writes": True}
+        sessions.append(session)
+        yield session
+
+    return factory, sessions
+
+
+async def test_run_in_batches_stops_on_partial_batch():
+    factory, sessions = _session_factory()
+    results = iter([100, 100, 40, 100])
+
+    total = await run_in_batches(
+        factory, AsyncMock(side_effect=lambda uow, n: next(results)), batch_size=100, max_batches=10
+    )
+
+    assert total == 240
+    assert len(sessions) == 3
+    assert all(s.commit.await_count == 1 for s in sessions)
+
+
+async def test_run_in_batches_respects_max_batches():
+    factory, sessions = _session_factory()
+    total = await run_in_batches(factory, AsyncMock(return_value=10), batch_size=10, max_batches=2)
+    assert total == 20
+    assert len(sessions) == 2
+
+
+async def test_periodic_task_survives_job_errors_and_stops():
+    calls = 0
+
+    async def job() -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("boom")
+
+    task = PeriodicTask("test", job, interval=0.01)
+    task.start()
+    await asyncio.sleep(0.05)
+    await task.stop()
+    assert calls >= 2
+    assert not task.running
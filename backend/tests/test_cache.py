@@ -0,0 +1,369 @@
+"""
+Тесты кэша приложения (app.core.cache) и инвалидации после commit
+(app.core.cache_invalidation): теги, гонка загрузки с инвалидацией, общий
+уровень в SQLite, сбор тегов сессией и уведомления других воркеров.
+"""
+
+import pytest
+from sqlalchemy import ForeignKey, create_engine, update
+from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column
+
+from app.core import cache as cache_module
+from app.core import metrics
+from app.core.cache import (
+    TagCache,
+    cached_tags,
+    configure_shared_backend,
+    entity_tag,
+    invalidate_tags,
+    invalidation_stamp,
+)
+from app.core.cache_invalidation import (
+    CacheInvalidationListener,
+    _payloads,
+    add_cache_tags,
+    track_cache_tags,
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_registry(monkeypatch):
+    monkeypatch.setattr(cache_module, "_caches", {})
+    monkeypatch.setattr(metrics, "_caches", {})
+
+
+def test_entity_tags():
+    class MagicLinkToken:
+        pass
+
+    assert entity_tag(MagicLinkToken, 5) == "magic_link_token:5"
+    assert entity_tag("studio", 42) == "studio:42"
+
+
+def test_invalidated_tag_makes_entries_stale():
+    cache = TagCache("t_tags", max_size=10, ttl_seconds=60, entities=("t_studio",))
+    cache.set("page", "v1", tags=["t_studio:1"])
+    cache.set("other", "v2", tags=["t_studio:2"])
+
+    invalidate_tags(["t_studio:1"])
+
+    assert cache.get("page") is None
+    assert cache.get("other") == "v2"
+    cache.set("page", "v3", tags=["t_studio:1"])
+    assert cache.get("page") == "v3"
+    assert metrics.cache_stats()["t_tags"]["hits"] == 2
+
+
+def test_type_tag_invalidates_every_entity_of_type():
+    cache = TagCache("t_type", max_size=10, ttl_seconds=60, entities=("t_slot",))
+    cache.set(1, "a", tags=["t_slot:1"])
+    cache.set(2, "b", tags=["t_slot:2"])
+
+    invalidate_tags(["t_slot"])
+
+    assert cache.get(1) is None
+    assert cache.get(2) is None
+
+
+async def test_value_loaded_before_invalidation_is_not_cached():
+    cache = TagCache("t_race", max_size=10, ttl_seconds=60, entities=("t_user",))
+    loads = []
+
+    async def load():
+        loads.append(1)
+        # Запись закоммичена, пока значение читалось.
+        invalidate_tags(["t_user:1"])
+        return "old"
+
+    assert await cache.get_or_load(1, load, tags=["t_user:1"]) == "old"
+    assert cache.get(1) is None
+
+    async def load_fresh():
+        return "new"
+
+    assert await cache.get_or_load(1, load_fresh, tags=["t_user:1"]) == "new"
+    assert cache.get(1) == "new"
+    assert len(loads) == 1
+
+
+def test_disabled_cache_stores_nothing():
+    cache = TagCache("t_off", max_size=10, ttl_seconds=0, entities=("t_x",))
+    cache.set(1, "v", tags=["t_x:1"])
+    assert cache.get(1) is None
+
+
+@pytest.fixture
+def shared_backend(tmp_path):
+    backend = configure_shared_backend(f"sqlite:///{tmp_path / 'cache.db'}")
+    try:
+        yield backend
+    finally:
+        configure_shared_backend("")
+        backend.close()
+
+
+def test_shared_level_serves_other_workers_and_honours_invalidation(shared_backend):
+    cache = TagCache(
+        "t_shared",
+        max_size=10,
+        ttl_seconds=60,
+        entities=("t_studio",),
+        shared=True,
+        value_type=dict[str, str],
+    )
+    since = invalidation_stamp()
+    cache.set(7, {"name": "Yoga"}, tags=["t_studio:7"], since=since)
+
+    cache.clear()  # другой воркер: пустой in-process уровень
+    assert cache.get(7) == {"name": "Yoga"}
+
+    invalidate_tags(["t_studio:7"])
+    cache.clear()
+    assert cache.get(7) is None
+    assert shared_backend.get("t_shared:7") is None
+
+    # Загружено до инвалидации — в общий уровень не попадает.
+    shared_backend.set(
+        "t_shared:7", b"stale", tags=("t_studio:7",), ttl_seconds=60, since=since.wall
+    )
+    assert shared_backend.get("t_shared:7") is None
+
+
+def test_shared_level_stores_json_and_ignores_foreign_bytes(shared_backend):
+    import pickle
+
+    from app.services.user import UserPrincipal
+
+    cache = TagCache(
+        "t_principal",
+        max_size=10,
+        ttl_seconds=60,
+        entities=("t_user",),
+        shared=True,
+        value_type=UserPrincipal,
+    )
+    cache.set(1, UserPrincipal(id=1, email="a@example.com"), tags=["t_user:1"])
+    assert shared_backend.get("t_principal:1")[0] == (
+        b'{"id":1,"email":"a@example.com","is_active":true}'
+    )
+    cache.clear()
+    assert cache.get(1) == UserPrincipal(id=1, email="a@example.com")
+
+    # Подложенный в файл pickle не исполняется: это просто промах.
+    shared_backend.set(
+        "t_principal:2", pickle.dumps(object()), tags=("t_user:2",), ttl_seconds=60, since=0.0
+    )
+    assert cache.get(2) is None
+
+    with pytest.raises(ValueError):
+        TagCache("t_untyped", max_size=1, ttl_seconds=1, shared=True)
+
+
+def test_locked_shared_file_does_not_block_and_keeps_invalidations(shared_backend, tmp_path):
+    import sqlite3
+    import time
+
+    shared_backend.set("k", b"v", tags=("t_a:1",), ttl_seconds=60, since=0.0)
+    other_worker = sqlite3.connect(tmp_path / "cache.db", isolation_level=None)
+    other_worker.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.perf_counter()
+        shared_backend.invalidate(("t_a:1",))
+        shared_backend.set("k2", b"v2", tags=("t_b:1",), ttl_seconds=60, since=0.0)
+        assert shared_backend.get("k") is None  # отложенная инвалидация уже действует
+        assert time.perf_counter() - started < 0.2
+    finally:
+        other_worker.execute("ROLLBACK")
+        other_worker.close()
+
+    assert shared_backend.get("k2") is None  # set при занятом файле пропущен
+    assert shared_backend.get("k") is None  # инвалидация дописана
+    shared_backend.set("k", b"old", tags=("t_a:1",), ttl_seconds=60, since=0.0)
+    assert shared_backend.get("k") is None  # загружено до инвалидации
+
+
+def test_shared_entries_expire(shared_backend):
+    shared_backend.set("k", b"v", tags=("t_a:1",), ttl_seconds=-1, since=0.0)
+    assert shared_backend.get("k") is None
+    shared_backend.purge()
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+class Venue(Base):
+    __tablename__ = "venues"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str]
+
+
+class Lesson(Base):
+    __tablename__ = "lessons"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    venue_id: Mapped[int] = mapped_column(ForeignKey("venues.id"), info={"cache_parent_tag": True})
+    title: Mapped[str]
+
+
+class Visit(Base):
+    __tablename__ = "visits"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    venue_id: Mapped[int] = mapped_column(ForeignKey("venues.id"))
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine, expire_on_commit=False) as session:
+        track_cache_tags(session)
+        session.add_all([Venue(id=1, name="A"), Venue(id=2, name="B")])
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+@pytest.fixture
+def lessons_cache():
+    cache = TagCache("t_lessons", max_size=10, ttl_seconds=60, entities=(Venue,))
+    for venue_id in (1, 2):
+        cache.set(venue_id, f"venue {venue_id}", tags=[entity_tag(Venue, venue_id)])
+    return cache
+
+
+def test_commit_invalidates_entity_and_referenced_parent(session, lessons_cache):
+    lesson = Lesson(id=10, venue_id=1, title="Ceili")
+    session.add(lesson)
+    session.flush()
+    assert lessons_cache.get(1) == "venue 1"  # до commit — старое значение
+
+    session.commit()
+
+    assert lessons_cache.get(1) is None
+    assert lessons_cache.get(2) == "venue 2"
+
+    lessons_cache.set(1, "venue 1", tags=["venue:1"])
+    lessons_cache.set(2, "venue 2", tags=["venue:2"])
+    lesson.venue_id = 2  # перенос: старая и новая студия
+    session.commit()
+    assert lessons_cache.get(1) is None
+    assert lessons_cache.get(2) is None
+
+
+def test_parent_tag_only_for_opted_in_foreign_keys(session, lessons_cache):
+    session.add(Visit(id=1, venue_id=1))
+    session.commit()
+
+    assert lessons_cache.get(1) == "venue 1"
+
+
+def test_only_declared_entities_are_invalidated_and_broadcast(lessons_cache):
+    assert cached_tags(["lesson:10", "venue:1", "venue", "visit:1"]) == ["venue:1", "venue"]
+    with pytest.raises(ValueError):
+        lessons_cache.set(3, "lesson", tags=["lesson:3"])
+
+
+def test_rollback_discards_collected_tags(session, lessons_cache):
+    session.get(Venue, 1).name = "renamed"
+    session.flush()
+    session.rollback()
+    session.commit()
+
+    assert lessons_cache.get(1) == "venue 1"
+
+
+def test_bulk_update_invalidates_type_tag(session, lessons_cache):
+    session.execute(update(Venue).values(name="bulk"))
+    session.commit()
+
+    assert lessons_cache.get(1) is None
+    assert lessons_cache.get(2) is None
+
+
+def test_explicit_tags_are_invalidated_after_commit(session, lessons_cache):
+    add_cache_tags(session, ["venue:1"])
+    session.rollback()
+    assert lessons_cache.get(1) == "venue 1"
+
+    add_cache_tags(session, ["venue:1"])
+    assert lessons_cache.get(1) == "venue 1"
+    session.commit()
+    assert lessons_cache.get(1) is None
+
+
+async def test_archive_run_invalidates_slots_and_bookings(session):
+    from datetime import UTC, datetime
+    from types import SimpleNamespace
+    from unittest.mock import AsyncMock, MagicMock
+
+    from app.core.repositories.archive_repo import ArchiveRepository
+    from app.models.booking import Booking
+    from app.models.slot import Slot
+
+    cache = TagCache("t_archive", max_size=10, ttl_seconds=60, entities=(Slot, Booking))
+    cache.set("slot", "s", tags=[entity_tag(Slot, 11)])
+    cache.set("booking", "b", tags=[entity_tag(Booking, 5)])
+    # Core DELETE ... RETURNING идёт мимо ORM: теги добавляет сам репозиторий.
+    db = SimpleNamespace(
+        info=session.info,
+        execute=AsyncMock(
+            side_effect=[
+                MagicMock(scalars=lambda: MagicMock(all=lambda: [11])),
+                MagicMock(rowcount=1),
+                MagicMock(rowcount=1),
+            ]
+        ),
+    )
+
+    await ArchiveRepository(db).archive_slots_ended_before(datetime.now(UTC), limit=10)
+    assert cache.get("slot") == "s"
+    session.commit()
+
+    assert cache.get("slot") is None
+    assert cache.get("booking") is None
+
+
+def test_notifications_from_other_processes_are_applied():
+    cache = TagCache("t_notify", max_size=10, ttl_seconds=60, entities=("t_service",))
+    cache.set(1, "v", tags=["t_service:3"])
+    listener = CacheInvalidationListener("postgresql://unused", "cache_invalidation")
+
+    [own] = _payloads(["t_service:3"])
+    listener._on_notify(None, 1, "cache_invalidation", own)
+    assert cache.get(1) == "v"  # свои уже применены в after_commit
+
+    listener._on_notify(None, 1, "cache_invalidation", "other-worker t_service:3")
+    assert cache.get(1) is None
+
+
+async def test_listener_connect_is_bounded_and_failures_are_logged(monkeypatch):
+    from unittest.mock import AsyncMock, MagicMock
+
+    from app.core import cache_invalidation
+
+    conn = MagicMock(add_listener=AsyncMock(side_effect=OSError("listen failed")))
+    connect = AsyncMock(return_value=conn)
+    monkeypatch.setattr(cache_invalidation.asyncpg, "connect", connect)
+    listener = CacheInvalidationListener("postgresql://db", "ch", connect_timeout=2.0)
+
+    await listener.ensure_listening()
+
+    assert not listener.listening
+    assert connect.await_args.kwargs["timeout"] == 2.0
+    conn.terminate.assert_called_once_with()
+
+    connect.side_effect = TimeoutError()
+    await listener.ensure_listening()
+    assert not listener.listening
+
+
+def test_payloads_fit_notify_limit():
+    tags = [f"t_booking:{i}" for i in range(2000)]
+    payloads = list(_payloads(tags))
+
+    assert len(payloads) > 1
+    assert all(len(p) < 8000 for p in payloads)
+    assert [t for p in payloads for t in p.split()[1:]] == tags
@@ -0,0 +1,157 @@
+"""
+Тесты email outbox (app.services.email).
+
+Доставка проверяется против локального заменителя Resend (app.scripts.fake_email_provider):
+реальный httpx.AsyncClient, реальные HTTP-запросы. Outbox — на mock UoW.
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.scripts.fake_email_provider import FakeEmailProvider
+from app.services.email import (
+    ResendEmailClient,
+    deliver_outbox_batch,
+    enqueue_magic_link_email,
+    retry_delay,
+)
+
+BATCH_DEFAULTS = {
+    "max_attempts": 3,
+    "backoff_base_seconds": 10,
+    "backoff_max_seconds": 60,
+    "sender": "ZaFrame <test@example.com>",
+}
+
+
+@pytest.fixture
+def provider():
+    server = FakeEmailProvider().start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+def _message(i: int, *, attempts: int = 0) -> EmailOutbox:
+    return EmailOutbox(
+        id=i,
+        to_email=f"user{i}@example.com",
+        subject="Sign in to ZaFrame",
+        html=f"<p>{i}</p>",
+        kind="magic_link",
+        status=EmailOutboxStatus.PENDING,
+        attempts=attempts,
+    )
+
+
+def _mock_uow(messages: list[EmailOutbox]) -> MagicMock:
+    uow = MagicMock()
+    uow.email_outbox.claim_due = AsyncMock(return_value=messages)
+    uow.session.flush = AsyncMock()
+    return uow
+
+
+async def test_enqueue_magic_link_only_adds_row():
+    uow = MagicMock()
+    uow.session.flush = AsyncMock()
+
+    message = await enqueue_magic_link_email(uow, "a@example.com", "http://x/verify?token=t")
+
+    uow.session.add.assert_called_once_with(message)
+    assert message.status == EmailOutboxStatus.PENDING
+    assert message.to_email == "a@example.com"
+    assert "token=t" in message.html
+
+
+def test_retry_delay_is_exponential_and_capped():
+    delays = [retry_delay(n, base_seconds=10, max_seconds=60) for n in range(1, 6)]
+    assert delays == [timedelta(seconds=s) for s in (10, 20, 40, 60, 60)]
+
+
+async def test_batch_is_sent_with_bounded_concurrency():
+    server = FakeEmailProvider(latency=0.05).start()
+    client = ResendEmailClient("re_test", base_url=server.url, max_connections=4)
+    messages = [_message(i) for i in range(20)]
+    try:
+        processed = await deliver_outbox_batch(
+            _mock_uow(messages), client, batch_size=20, concurrency=4, **BATCH_DEFAULTS
+        )
+    finally:
+        await client.aclose()
+        server.stop()
+
+    assert processed == 20
+    assert len(server.received) == 20
+    assert server.peak_in_flight <= 4
+    assert all(m.status == EmailOutboxStatus.SENT for m in messages)
+    assert all(m.provider_message_id and m.html == "" for m in messages)
+
+
+async def test_transient_errors_are_retried_with_backoff():
+    server = FakeEmailProvider(fail_every=1, fail_status=429).start()
+    client = ResendEmailClient("re_test", base_url=server.url)
+    message = _message(1)
+    before = datetime.now(UTC)
+    try:
+        await deliver_outbox_batch(
+            _mock_uow([message]), client, batch_size=10, concurrency=2, **BATCH_DEFAULTS
+        )
+    finally:
+        await client.aclose()
+        server.stop()
+
+    assert message.status == EmailOutboxStatus.PENDING
+    assert message.attempts == 1
+    assert message.next_attempt_at >= before + timedelta(seconds=10)
+    assert message.html  # письмо ещё будет отправлено
+
+
+async def test_permanent_error_and_exhausted_attempts_fail(provider):
+    provider.statuses = {"user1@example.com": 422}
+    provider.fail_every = 0
+    rejected = _message(1)
+    exhausted = _message(2, attempts=2)
+    provider.statuses["user2@example.com"] = 503
+    client = ResendEmailClient("re_test", base_url=provider.url)
+    try:
+        await deliver_outbox_batch(
+            _mock_uow([rejected, exhausted]),
+            client,
+            batch_size=10,
+            concurrency=2,
+            **BATCH_DEFAULTS,
+        )
+    finally:
+        await client.aclose()
+
+    assert rejected.status == EmailOutboxStatus.FAILED
+    assert rejected.attempts == 1
+    assert exhausted.status == EmailOutboxStatus.FAILED
+    assert exhausted.attempts == 3
+    assert rejected.html == "" and exhausted.html == ""
+
+
+async def test_unreachable_provider_is_retryable():
+    client = ResendEmailClient("re_test", base_url="http://127.0.0.1:9", timeout=1)
+    message = _message(1)
+    try:
+        await deliver_outbox_batch(
+            _mock_uow([message]), client, batch_size=10, concurrency=1, **BATCH_DEFAULTS
+        )
+    finally:
+        await client.aclose()
+    assert message.status == EmailOutboxStatus.PENDING
+    assert message.last_error
+
+
+async def test_dev_mode_marks_sent_without_provider():
+    message = _message(1)
+    processed = await deliver_outbox_batch(
+        _mock_uow([message]), None, batch_size=10, concurrency=1, **BATCH_DEFAULTS
+    )
+    assert processed == 1
+    assert message.status == EmailOutboxStatus.SENT
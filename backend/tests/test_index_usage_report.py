@@ -0,0 +1,45 @@
+"""
+Тесты отчёта об индексах: неиспользуемые и избыточные (префиксные) индексы.
+"""
+
+from app.scripts.index_usage_report import IndexStats, redundant_indexes, unused_indexes
+
+
+def _index(name: str, columns: tuple[int, ...], *, scans: int = 0, **flags) -> IndexStats:
+    return IndexStats(
+        table_name="slots",
+        index_name=name,
+        idx_scan=scans,
+        idx_tup_read=0,
+        idx_tup_fetch=0,
+        size_bytes=8192,
+        is_unique=flags.get("is_unique", False),
+        is_primary=flags.get("is_primary", False),
+        is_valid=flags.get("is_valid", True),
+        columns=columns,
+        has_expressions=flags.get("has_expressions", False),
+        is_partial=flags.get("is_partial", False),
+    )
+
+
+def test_unused_skips_constraints_and_invalid_indexes():
+    stats = [
+        _index("slots_pkey", (1,), is_primary=True),
+        _index("ix_slots_title_unique", (5,), is_unique=True),
+        _index("ix_slots_broken", (6,), is_valid=False),
+        _index("ix_slots_schedule_id", (4,)),
+        _index("ix_slots_studio_start", (2, 3), scans=120),
+    ]
+
+    assert [s.index_name for s in unused_indexes(stats)] == ["ix_slots_schedule_id"]
+
+
+def test_prefix_index_is_redundant_to_the_wider_one():
+    narrow = _index("ix_slots_studio_id", (2,), scans=40)
+    wide = _index("ix_slots_studio_start", (2, 3), scans=900)
+    other_order = _index("ix_slots_start_time", (3,))
+    partial = _index("ix_slots_active_studio", (2,), is_partial=True)
+
+    pairs = redundant_indexes([narrow, wide, other_order, partial])
+
+    assert pairs == [(narrow, wide)]
@@ -0,0 +1,206 @@
+"""
+Тесты read-path списков без ORM (app.core.repositories.columns, list_rows).
+
+Наборы колонок должны совпадать с полями схем ответа, а строки — валидироваться
+в них напрямую; SQL выбирает только эти колонки.
+"""
+
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine.result import result_tuple
+
+from app.core.repositories.booking_repo import BookingRepository
+from app.core.repositories.columns import (
+    BOOKING_COLUMNS,
+    SERVICE_COLUMNS,
+    SLOT_COLUMNS,
+    STUDIO_COLUMNS,
+)
+from app.core.repositories.slot_repo import SlotRepository
+from app.core.repositories.studio_repo import StudioRepository
+from app.schemas import (
+    BookingListItem,
+    BookingResponse,
+    ServiceResponse,
+    SlotResponse,
+    StudioListItem,
+    StudioResponse,
+)
+
+NOW = datetime(2026, 5, 10, 18, 0, tzinfo=UTC)
+
+
+def _keys(columns) -> set[str]:
+    return {c.key for c in columns}
+
+
+def _row(columns, **values):
+    keys = [c.key for c in columns]
+    return result_tuple(keys)(tuple(values[k] for k in keys))
+
+
+def _slot_row():
+    return _row(
+        SLOT_COLUMNS,
+        id=1,
+        studio_id=2,
+        start_time=NOW,
+        end_time=NOW,
+        title="Yoga",
+        description=None,
+        max_capacity=10,
+        price_cents=1500,
+        course_price_cents=None,
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def _studio_row():
+    return _row(
+        STUDIO_COLUMNS,
+        id=2,
+        owner_id=3,
+        name="Studio",
+        description=None,
+        email=None,
+        phone=None,
+        address=None,
+        city="Dublin",
+        latitude=None,
+        longitude=None,
+        amenities=["shower"],
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def _sql(session: AsyncMock) -> str:
+    statement = session.execute.await_args.args[0]
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_columns_match_response_schemas():
+    assert _keys(SLOT_COLUMNS) == set(SlotResponse.model_fields)
+    assert _keys(STUDIO_COLUMNS) == set(StudioResponse.model_fields)
+    assert _keys(SERVICE_COLUMNS) == set(ServiceResponse.model_fields)
+    assert _keys(BOOKING_COLUMNS) == set(BookingResponse.model_fields)
+
+
+async def test_slot_rows_select_only_listed_columns():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(all=lambda: [_slot_row()])
+
+    rows = await SlotRepository(session).list_rows(studio_id=2, limit=100)
+
+    sql = _sql(session)
+    assert "slots.service_id" not in sql
+    assert "slots.studio_id = " in sql
+    assert SlotResponse.model_validate(rows[0]).title == "Yoga"
+
+
+async def test_studio_rows_keep_explore_filters():
+    session = AsyncMock()
+    session.execute.return_value = MagicMock(all=lambda: [_studio_row()])
+
+    rows = await StudioRepository(session).list_rows(city="Dublin", category="yoga")
+
+    sql = _sql(session)
+    assert "studios.slug" not in sql
+    assert "studios.id IN (SELECT DISTINCT studios.id" in sql
+    assert StudioResponse.model_validate(rows[0]).amenities == ["shower"]
+
+
+async def test_my_booking_rows_join_slot_and_studio_and_validate():
+    session = AsyncMock()
+    booking = dict(
+        id=5,
+        slot_id=1,
+        user_id=3,
+        guest_session_id=None,
+        guest_name="Me",
+        guest_email="me@example.com",
+        guest_phone=None,
+        status="confirmed",
+        checkout_session_id=None,
+        payment_intent_id=None,
+        payment_status=None,
+        created_at=NOW,
+        updated_at=NOW,
+        cancelled_at=None,
+    )
+    keys = [*booking, "slot", "studio"]
+    row = result_tuple(keys)((*booking.values(), _slot_row(), _studio_row()))
+    session.execute.return_value = MagicMock(all=lambda: [row])
+
+    rows = await BookingRepository(session).list_my_rows(user_id=3, user_email="me@example.com")
+
+    sql = _sql(session)
+    assert "JOIN slots ON slots.id = bookings.slot_id" in sql
+    assert "JOIN studios ON studios.id = slots.studio_id" in sql
+    item = BookingListItem.model_validate(rows[0])
+    assert item.slot.title == "Yoga"
+    assert item.studio.city == "Dublin"
+
+
+async def test_search_reads_rows_and_validates_once():
+    import json
+
+    from app.api.v1.endpoints.search import search_endpoint
+    from app.models.service import ServiceCategory
+
+    service = _row(
+        SERVICE_COLUMNS,
+        id=9,
+        studio_id=2,
+        name="Vinyasa",
+        description=None,
+        type="single_class",
+        category="yoga",
+        duration_minutes=60,
+        max_capacity=12,
+        price_single_cents=1500,
+        price_course_cents=None,
+        soft_limit_ratio=1.0,
+        hard_limit_ratio=1.5,
+        max_overbooked_ratio=0.2,
+        tags=[],
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    uow = MagicMock()
+    uow.session = AsyncMock()
+    uow.session.execute.return_value = MagicMock(all=lambda: [_studio_row()])
+    uow.services.list_active_rows_by_studio_ids = AsyncMock(return_value=[service])
+
+    response = await search_endpoint(
+        uow,
+        query=None,
+        category=ServiceCategory.YOGA,
+        city=None,
+        lat=None,
+        lng=None,
+        radius_km=10,
+        amenities=None,
+    )
+
+    sql = _sql(uow.session)
+    assert sql.startswith("SELECT DISTINCT ON (studios.id) studios.id, studios.owner_id")
+    assert "studios.slug" not in sql
+    uow.services.list_active_rows_by_studio_ids.assert_awaited_once_with([2], category="yoga")
+    [card] = json.loads(response.body)
+    assert card["studio"]["city"] == "Dublin"
+    assert card["matched_services"][0]["name"] == "Vinyasa"
+
+
+def test_only_list_schema_skips_email_validation():
+    detail = StudioResponse.model_json_schema()["properties"]["email"]
+    listed = StudioListItem.model_json_schema()["properties"]["email"]
+
+    assert {"type": "string", "format": "email"} in detail["anyOf"]
+    assert {"type": "string"} in listed["anyOf"]
@@ -0,0 +1,51 @@
+"""
+Тесты app.core.logging_config: запись логов в фоновом потоке через очередь.
+"""
+
+import logging
+import queue
+
+import pytest
+import structlog
+
+from app.core import logging_config
+from app.core.logging_config import (
+    _NonBlockingQueueHandler,
+    log_records_dropped,
+    setup_logging,
+    shutdown_logging,
+)
+
+
+@pytest.fixture
+def restore_logging():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    shutdown_logging()
+    root.handlers, root.level = handlers, level
+    structlog.reset_defaults()
+
+
+def test_records_are_rendered_by_listener_thread(restore_logging, capsys, monkeypatch):
+    monkeypatch.setattr(logging_config.settings, "DEBUG", False)
+    setup_logging()
+    (handler,) = logging.getLogger().handlers
+    assert isinstance(handler, _NonBlockingQueueHandler)
+
+    structlog.get_logger("test").info("hello", request_id="r1", answer=42)
+    logging.getLogger("stdlib").warning("plain %s", "record")
+    shutdown_logging()  # дождаться, пока поток допишет очередь
+
+    out = capsys.readouterr().out
+    assert '"event": "hello"' in out and '"answer": 42' in out and '"request_id": "r1"' in out
+    assert '"event": "plain record"' in out and '"level": "warning"' in out
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = _NonBlockingQueueHandler(queue.Queue(maxsize=1))
+    record = logging.makeLogRecord({"msg": "x"})
+    before = log_records_dropped.value
+    handler.emit(record)
+    handler.emit(record)
+    assert log_records_dropped.value == before + 1
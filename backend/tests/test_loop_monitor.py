@@ -0,0 +1,53 @@
+"""
+Тесты монитора event loop: лаг попадает в гистограмму, блокирующий вызов
+логируется со стеком и request_id запроса, один раз за эпизод.
+"""
+
+import asyncio
+import time
+
+from structlog.testing import capture_logs
+
+from app.core.loop_monitor import LoopMonitor, event_loop_blocked
+from app.core.metrics import render_prometheus
+from app.core.middleware.logging_middleware import request_id_var
+
+
+def _blocking_sdk_call(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+async def _handler(seconds: float) -> None:
+    request_id_var.set("req-blocking")
+    _blocking_sdk_call(seconds)
+
+
+async def test_blocking_call_is_logged_with_stack_and_request_id():
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.05)
+    blocked_before = event_loop_blocked.value
+    with capture_logs() as logs:
+        monitor.start()
+        await asyncio.sleep(0.03)
+        await asyncio.create_task(_handler(0.3))
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+
+    blocked = [e for e in logs if e["event"] == "event_loop_blocked"]
+    assert len(blocked) == 1
+    assert blocked[0]["request_id"] == "req-blocking"
+    assert blocked[0]["blocked_ms"] >= 50
+    assert "_blocking_sdk_call" in blocked[0]["stack"]
+    assert event_loop_blocked.value == blocked_before + 1
+    assert "event_loop_lag_seconds_bucket" in render_prometheus()
+
+
+async def test_non_blocking_awaits_are_not_reported():
+    monitor = LoopMonitor(interval=0.01, block_threshold=0.1)
+    with capture_logs() as logs:
+        monitor.start()
+        for _ in range(5):
+            await asyncio.sleep(0.02)
+        await monitor.stop()
+
+    assert not [e for e in logs if e["event"] == "event_loop_blocked"]
+    assert monitor.last_lag is not None and monitor.last_lag < 0.1
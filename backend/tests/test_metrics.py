@@ -0,0 +1,155 @@
+"""
+Тесты метрик: гистограммы, экспорт в формате Prometheus, GET /metrics,
+исходы бронирований.
+"""
+
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from app.core.exceptions import ValidationError
+from app.core.metrics import (
+    Histogram,
+    QueryStats,
+    histogram,
+    labeled_counter,
+    record_statement,
+    record_statement_time,
+    render_prometheus,
+)
+from app.schemas.booking import BookingCreate
+from app.services.booking import booking_outcomes, create_booking
+
+
+@pytest.fixture
+async def app_client():
+    from app.main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+def test_histogram_buckets_are_inclusive_and_cumulative():
+    h = histogram("test_latency_seconds", "test", buckets=(0.1, 1.0), labelnames=("route",))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        h.observe(value, "/x")
+
+    text = render_prometheus()
+    assert 'test_latency_seconds_bucket{route="/x",le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{route="/x",le="1.0"} 3' in text
+    assert 'test_latency_seconds_bucket{route="/x",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_count{route="/x"} 4' in text
+    assert 'test_latency_seconds_sum{route="/x"} 3.65' in text
+
+
+def test_label_values_are_escaped():
+    c = labeled_counter("test_escaped_total", "test", ("path",))
+    c.inc('a"b\\c')
+    assert 'test_escaped_total{path="a\\"b\\\\c"} 1' in render_prometheus()
+
+
+def test_record_statement_outside_request_is_noop():
+    record_statement("SELECT 1")
+    record_statement_time(0.01)
+
+
+def test_query_stats_repeated_statements():
+    stats = QueryStats(count=8, statements={"SELECT a": 6, "SELECT b": 1, "SELECT c": 1})
+
+    assert stats.repeated(5) == [("SELECT a", 6)]
+    assert stats.repeated(10) == []
+    assert stats.repeated(0) == []
+
+
+async def test_metrics_endpoint_reports_route_templates_and_pool(app_client):
+    await app_client.get("/api/v1/studios/not-a-number")
+    await app_client.get("/api/v1/studios/v1")  # значение совпадает с сегментом префикса
+    await app_client.get("/no-such-path")
+
+    response = await app_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/api/v1/studios/{studio_id}",status="422"}'
+    ) in text
+    assert "/api/{studio_id}" not in text
+    assert 'route="unmatched",status="404"' in text
+    assert "/no-such-path" not in text
+    assert 'db_pool_checked_out{pool="primary"} 0' in text
+    assert 'http_request_db_queries_bucket{method="GET",route="/api/v1/studios/{studio_id}"' in text
+
+
+def test_route_template_adds_router_prefix_to_route_path():
+    from types import SimpleNamespace
+
+    from app.core.middleware.logging_middleware import route_template
+
+    def scope(path_format, path, **params):
+        return {
+            "route": SimpleNamespace(path_format=path_format),
+            "path": path,
+            "path_params": params,
+        }
+
+    assert route_template(scope("/studios/{studio_id}", "/api/v1/studios/v1", studio_id="v1")) == (
+        "/api/v1/studios/{studio_id}"
+    )
+    assert route_template(scope("/files/{rest}", "/api/files/a/b", rest="a/b")) == (
+        "/api/files/{rest}"
+    )
+    assert route_template(scope("/", "/api/v1/")) == "/api/v1/"
+    assert route_template({"path": "/nowhere"}) == "unmatched"
+
+
+async def test_metrics_token(app_client):
+    with patch("app.api.metrics.settings.METRICS_TOKEN", "s3cret"):
+        assert (await app_client.get("/metrics")).status_code == 401
+        ok = await app_client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+    assert ok.status_code == 200
+
+
+def test_request_histogram_type():
+    from app.core.metrics import http_request_duration
+
+    assert isinstance(http_request_duration, Histogram)
+    assert http_request_duration.labelnames == ("method", "route", "status")
+
+
+def _booking_uow(*, capacity: int, confirmed: int, pending: int) -> MagicMock:
+    slot = SimpleNamespace(
+        id=1,
+        is_active=True,
+        max_capacity=capacity,
+        start_time=datetime.now(UTC) + timedelta(days=1),
+    )
+    uow = MagicMock()
+    uow.slots.get_by_id_for_update = AsyncMock(return_value=slot)
+    uow.bookings.count_confirmed_by_slot = AsyncMock(return_value=confirmed)
+    uow.bookings.count_pending_by_slot = AsyncMock(return_value=pending)
+    uow.session.flush = AsyncMock()
+    uow.session.refresh = AsyncMock()
+    return uow
+
+
+@pytest.mark.parametrize(
+    ("confirmed", "pending", "outcome"),
+    [(2, 0, "no_seats"), (1, 1, "oversell_prevented"), (0, 1, "created")],
+)
+async def test_booking_outcomes_are_counted(confirmed, pending, outcome):
+    schema = BookingCreate(slot_id=1, guest_name="Guest", guest_email="g@example.com")
+    before = booking_outcomes.values.get(("single", outcome), 0)
+    uow = _booking_uow(capacity=2, confirmed=confirmed, pending=pending)
+
+    if outcome == "created":
+        await create_booking(uow, schema)
+    else:
+        with pytest.raises(ValidationError):
+            await create_booking(uow, schema)
+
+    assert booking_outcomes.values[("single", outcome)] == before + 1
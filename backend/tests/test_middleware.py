@@ -0,0 +1,178 @@
+"""
+Тесты RequestLoggingMiddleware (pure ASGI): request id, security headers,
+логирование, потоковые ответы без буферизации и счётчик SQL-запросов.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from structlog.testing import capture_logs
+
+from app.core.metrics import record_statement, record_statement_time
+from app.core.middleware.logging_middleware import (
+    DB_QUERIES_HEADER,
+    DB_TIME_HEADER,
+    REQUEST_ID_HEADER,
+    RequestLoggingMiddleware,
+    current_request_id,
+)
+
+chunks_sent: list[str] = []
+
+
+async def plain(request: Request) -> PlainTextResponse:
+    request.state.user_id = 7
+    return PlainTextResponse(f"{request.state.request_id}|{current_request_id()}")
+
+
+async def framed(request: Request) -> PlainTextResponse:
+    return PlainTextResponse("x", headers={"X-Frame-Options": "SAMEORIGIN"})
+
+
+async def stream(request: Request) -> StreamingResponse:
+    async def body():
+        for chunk in ("a", "b", "c"):
+            chunks_sent.append(chunk)
+            yield chunk
+            await asyncio.sleep(0)
+
+    return StreamingResponse(body())
+
+
+async def boom(request: Request) -> PlainTextResponse:
+    raise RuntimeError("boom")
+
+
+async def n_plus_one(request: Request) -> PlainTextResponse:
+    record_statement("SELECT bookings")
+    for _ in range(6):
+        record_statement("SELECT slots WHERE id = $1")
+        record_statement_time(0.002)
+    return PlainTextResponse("ok")
+
+
+def _client(**middleware_options) -> httpx.AsyncClient:
+    app = Starlette(
+        routes=[
+            Route("/plain", plain),
+            Route("/framed", framed),
+            Route("/stream", stream),
+            Route("/boom", boom),
+            Route("/n-plus-one", n_plus_one),
+        ]
+    )
+    app.add_middleware(RequestLoggingMiddleware, **middleware_options)
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+@pytest.fixture
+def client():
+    return _client()
+
+
+async def test_request_id_is_propagated_and_security_headers_added(client):
+    async with client:
+        response = await client.get("/plain", headers={REQUEST_ID_HEADER: "req-1"})
+    assert response.text == "req-1|req-1"
+    assert response.headers[REQUEST_ID_HEADER] == "req-1"
+    assert response.headers["X-Content-Type-Options"] == "nosniff"
+    assert response.headers["X-Frame-Options"] == "DENY"
+    assert current_request_id() is None
+
+
+async def test_generated_request_id_and_existing_headers_kept(client):
+    async with client:
+        response = await client.get("/framed")
+    assert len(response.headers[REQUEST_ID_HEADER]) == 36
+    assert response.headers["X-Frame-Options"] == "SAMEORIGIN"
+
+
+async def test_request_is_logged_with_user_and_status(client):
+    with capture_logs() as logs:
+        async with client:
+            await client.get("/plain")
+    (event,) = [e for e in logs if e["event"] == "request_finished"]
+    assert event["status"] == 200
+    assert event["user_id"] == 7
+    assert event["path"] == "/plain"
+
+
+async def test_streaming_response_passes_through(client):
+    chunks_sent.clear()
+    async with client:
+        async with client.stream("GET", "/stream") as response:
+            assert response.headers[REQUEST_ID_HEADER]
+            body = "".join([c async for c in response.aiter_text()])
+    assert body == "abc"
+    assert chunks_sent == ["a", "b", "c"]
+
+
+async def test_unhandled_exception_logged_as_500(client):
+    with capture_logs() as logs:
+        async with client:
+            response = await client.get("/boom")
+    assert response.status_code == 500
+    (event,) = [e for e in logs if e["event"] == "request_finished"]
+    assert event["status"] == 500 and event["log_level"] == "error"
+
+
+async def _finished_events(client: httpx.AsyncClient, path: str, times: int) -> list[dict]:
+    with capture_logs() as logs:
+        async with client:
+            for _ in range(times):
+                await client.get(path)
+    return [e for e in logs if e["event"] == "request_finished"]
+
+
+async def test_fast_2xx_requests_are_sampled():
+    events = await _finished_events(_client(sample_rate=0.0), "/plain", 20)
+    assert events == []
+
+    events = await _finished_events(_client(sample_rate=0.5), "/plain", 200)
+    assert 40 < len(events) < 160
+    assert all(e["sample_rate"] == 0.5 for e in events)
+
+
+async def test_errors_and_slow_requests_are_always_logged():
+    events = await _finished_events(_client(sample_rate=0.0), "/boom", 3)
+    assert len(events) == 3
+
+    events = await _finished_events(_client(sample_rate=0.0, slow_request_ms=0.0), "/plain", 3)
+    assert len(events) == 3
+    assert all(e["slow"] and e["log_level"] == "warning" for e in events)
+
+
+async def test_db_statements_counted_in_log_and_debug_headers():
+    with capture_logs() as logs:
+        async with _client(db_debug_headers=True) as client:
+            response = await client.get("/n-plus-one")
+    assert response.headers[DB_QUERIES_HEADER] == "7"
+    assert response.headers[DB_TIME_HEADER] == "12.0"
+    (event,) = [e for e in logs if e["event"] == "request_finished"]
+    assert event["db_queries"] == 7
+
+    async with _client() as client:
+        response = await client.get("/n-plus-one")
+    assert DB_QUERIES_HEADER not in response.headers
+
+
+async def test_repeated_statement_is_reported():
+    with capture_logs() as logs:
+        async with _client(repeated_statement_threshold=5) as client:
+            await client.get("/n-plus-one")
+            await client.get("/plain")
+    (warning,) = [e for e in logs if e["event"] == "db_repeated_statement"]
+    assert warning["statement"] == "SELECT slots WHERE id = $1"
+    assert warning["count"] == 6
+    assert warning["route"] == "/n-plus-one"
+
+    with capture_logs() as logs:
+        async with _client(repeated_statement_threshold=0) as client:
+            await client.get("/n-plus-one")
+    assert not [e for e in logs if e["event"] == "db_repeated_statement"]
@@ -134,7 +134,7 @@ async def test_create_checkout_session_success(mock_uow):
         mock_settings.STRIPE_SECRET_KEY = "sk_test"
         mock_settings.STRIPE_CURRENCY = "usd"
         with patch(
-            "app.services.payment.stripe.StripeClient",
+            "stripe.StripeClient",
             return_value=mock_client,
         ):
             result = await create_checkout_session(
@@ -207,7 +207,7 @@ async def test_create_order_checkout_session_success(mock_uow):
         mock_settings.STRIPE_SECRET_KEY = "sk_test"
         mock_settings.STRIPE_CURRENCY = "usd"
         with patch(
-            "app.services.payment.stripe.StripeClient",
+            "stripe.StripeClient",
             return_value=mock_client,
         ):
             result = await create_order_checkout_session(
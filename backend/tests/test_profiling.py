@@ -0,0 +1,77 @@
+"""
+Тесты профилирования отдельных запросов: токен в X-Profile, файлы профилей
+с request_id, один профилируемый запрос за раз.
+"""
+
+import tracemalloc
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core.middleware.logging_middleware import REQUEST_ID_HEADER, RequestLoggingMiddleware
+from app.core.middleware.profiling_middleware import PROFILE_HEADER, ProfilingMiddleware
+
+
+def busy_loop(n: int) -> int:
+    return sum(str(i).count("7") for i in range(n))
+
+
+async def work(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(str(busy_loop(50_000)))
+
+
+def _client(tmp_path) -> httpx.AsyncClient:
+    app = Starlette(routes=[Route("/work", work)])
+    app.add_middleware(
+        ProfilingMiddleware, token="s3cret", output_dir=tmp_path, sample_interval=0.001
+    )
+    app.add_middleware(RequestLoggingMiddleware)
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://test")
+
+
+async def test_request_without_valid_token_is_not_profiled(tmp_path):
+    async with _client(tmp_path) as client:
+        plain = await client.get("/work")
+        wrong = await client.get("/work", headers={PROFILE_HEADER: "guess"})
+    assert PROFILE_HEADER not in plain.headers
+    assert PROFILE_HEADER not in wrong.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+async def test_profiled_request_writes_cpu_and_allocation_profiles(tmp_path):
+    async with _client(tmp_path) as client:
+        response = await client.get(
+            "/work", headers={PROFILE_HEADER: "s3cret", REQUEST_ID_HEADER: "req-prof"}
+        )
+    assert response.status_code == 200
+    assert response.headers[PROFILE_HEADER] == "req-prof"
+    assert not tracemalloc.is_tracing()
+
+    names = sorted(p.name for p in tmp_path.iterdir())
+    assert [n.split("-", 1)[1] for n in names] == [
+        "req-prof.folded",
+        "req-prof.tracemalloc",
+        "req-prof.tracemalloc.txt",
+    ]
+    folded = next(tmp_path.glob("*.folded")).read_text()
+    assert "busy_loop (test_profiling.py:" in folded
+    line = folded.splitlines()[0]
+    assert int(line.rsplit(" ", 1)[1]) >= 1
+    summary = next(tmp_path.glob("*.tracemalloc.txt")).read_text()
+    assert summary.startswith("request_id=req-prof")
+    snapshot = tracemalloc.Snapshot.load(str(next(tmp_path.glob("*.tracemalloc"))))
+    assert snapshot.traces
+
+
+async def test_concurrent_profiled_request_runs_unprofiled(tmp_path):
+    middleware = ProfilingMiddleware(PlainTextResponse("ok"), token="s3cret", output_dir=tmp_path)
+    middleware._busy = True
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/", headers={PROFILE_HEADER: "s3cret"})
+    assert response.headers[PROFILE_HEADER] == "busy"
+    assert list(tmp_path.iterdir()) == []
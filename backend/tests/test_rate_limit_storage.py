@@ -0,0 +1,58 @@
+"""
+Тесты SQLite-хранилища rate limit (app.core.rate_limit_storage).
+
+Два экземпляра на одном файле моделируют два воркера одного хоста.
+"""
+
+import time
+
+import pytest
+from limits import RateLimitItemPerMinute
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+from app.core.rate_limit_storage import SQLiteStorage
+
+
+@pytest.fixture
+def uri(tmp_path):
+    return f"sqlite:///{tmp_path / 'ratelimit.db'}"
+
+
+def test_scheme_is_registered(uri):
+    assert isinstance(storage_from_string(uri), SQLiteStorage)
+
+
+def test_workers_share_one_limit(uri):
+    limit = RateLimitItemPerMinute(5)
+    worker_a = FixedWindowRateLimiter(storage_from_string(uri))
+    worker_b = FixedWindowRateLimiter(storage_from_string(uri))
+
+    results = [(worker_a if i % 2 else worker_b).hit(limit, "1.2.3.4") for i in range(6)]
+
+    assert results == [True] * 5 + [False]
+    assert worker_a.get_window_stats(limit, "1.2.3.4").remaining == 0
+
+
+def test_counter_resets_after_window(uri):
+    storage = SQLiteStorage(uri)
+    assert storage.incr("k", 1) == 1
+    assert storage.incr("k", 1) == 2
+    time.sleep(1.05)
+    assert storage.get("k") == 0
+    assert storage.incr("k", 1) == 1
+
+
+def test_clear_and_reset(uri):
+    storage = SQLiteStorage(uri)
+    storage.incr("a", 60)
+    storage.incr("b", 60)
+    storage.clear("a")
+    assert storage.get("a") == 0
+    assert storage.reset() == 1
+    assert storage.check()
+
+
+def test_requires_path():
+    with pytest.raises(ValueError):
+        SQLiteStorage("sqlite://")
@@ -0,0 +1,65 @@
+"""
+Тесты маршрутизации чтения (app.core.database: ReplicaMonitor, get_read_session_maker).
+
+Реплика подменяется объектом с connect(); реальная проверка — на втором
+локальном Postgres (docker compose --profile replica).
+"""
+
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core import database
+from app.core.database import ReplicaMonitor
+
+
+def _replica_with_lag(lag: float | None, *, fail: bool = False) -> MagicMock:
+    conn = MagicMock()
+    result = MagicMock()
+    result.scalar_one.return_value = lag
+    conn.execute = AsyncMock(return_value=result)
+
+    @asynccontextmanager
+    async def connect():
+        if fail:
+            raise OSError("connection refused")
+        yield conn
+
+    replica = MagicMock()
+    replica.connect = connect
+    return replica
+
+
+async def test_monitor_marks_caught_up_replica_healthy():
+    monitor = ReplicaMonitor(_replica_with_lag(0.2), max_lag_seconds=5)
+    await monitor.check()
+    assert monitor.healthy
+    assert monitor.lag_seconds == 0.2
+
+
+async def test_monitor_falls_back_when_lagging_or_down():
+    lagging = ReplicaMonitor(_replica_with_lag(30.0), max_lag_seconds=5)
+    await lagging.check()
+    assert not lagging.healthy
+
+    down = ReplicaMonitor(_replica_with_lag(None, fail=True), max_lag_seconds=5)
+    down.healthy = True
+    await down.check()
+    assert not down.healthy
+    assert down.lag_seconds is None
+
+
+async def test_read_session_maker_routes_by_replica_health():
+    replica_maker = MagicMock()
+    monitor = ReplicaMonitor(_replica_with_lag(0), max_lag_seconds=5)
+    with (
+        patch.object(database, "replica_session_maker", replica_maker),
+        patch.object(database, "replica_monitor", monitor),
+    ):
+        assert database.get_read_session_maker() is database.read_session_maker
+        await monitor.check()
+        assert database.get_read_session_maker() is replica_maker
+
+
+def test_read_sessions_are_read_only():
+    options = database.read_session_maker.kw["bind"].get_execution_options()
+    assert options["postgresql_readonly"] is True
@@ -0,0 +1,195 @@
+"""
+Тесты сверки оплат со Stripe (app.services.reconciliation).
+
+Выборка проверяется против локального fake Stripe API (app.scripts.fake_stripe):
+реальный StripeClient, реальные HTTP-запросы, пагинация starting_after.
+Применение к БД — на mock UoW (сопоставление и пакетные вызовы репозиториев).
+"""
+
+import threading
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import stripe
+
+from app.scripts.fake_stripe import FakeStripeServer, build_sessions
+from app.services.reconciliation import (
+    CheckoutSessionSnapshot,
+    ReconciliationReport,
+    apply_checkout_sessions,
+    iter_checkout_session_pages,
+    reconcile_checkout_sessions,
+    split_window,
+)
+
+WINDOW_END = datetime(2026, 4, 2, tzinfo=UTC)
+WINDOW_START = WINDOW_END - timedelta(hours=24)
+
+
+@pytest.fixture
+def fake_stripe():
+    sessions = build_sessions(
+        1234,
+        created_from=int(WINDOW_START.timestamp()),
+        span_seconds=24 * 3600,
+    )
+    server = FakeStripeServer(sessions).start()
+    try:
+        yield server
+    finally:
+        server.stop()
+
+
+def _client(server: FakeStripeServer) -> stripe.StripeClient:
+    return stripe.StripeClient(api_key="sk_test_fake", base_addresses={"api": server.url})
+
+
+def _snapshot(session_id: str, **kwargs) -> CheckoutSessionSnapshot:
+    defaults = {
+        "created": 0,
+        "status": "complete",
+        "payment_status": "paid",
+        "booking_id": None,
+        "order_id": None,
+        "payment_intent_id": f"pi_{session_id}",
+    }
+    defaults.update(kwargs)
+    return CheckoutSessionSnapshot(id=session_id, **defaults)
+
+
+def _mock_uow() -> MagicMock:
+    uow = MagicMock()
+    uow.bookings.map_ids_by_checkout_session_ids = AsyncMock(return_value={})
+    uow.bookings.confirm_paid_bulk = AsyncMock(side_effect=lambda p: list(p))
+    uow.bookings.confirm_paid_by_order_ids = AsyncMock(return_value=0)
+    uow.orders.mark_paid_bulk = AsyncMock(side_effect=lambda ids: list(ids))
+    uow.commit = AsyncMock()
+    uow.rollback = AsyncMock()
+    return uow
+
+
+def test_split_window_covers_range_without_overlap():
+    windows = split_window(100, 200, 3)
+    assert windows[0][0] == 100
+    assert windows[-1][1] == 200
+    for (_, end), (start, _) in zip(windows, windows[1:], strict=False):
+        assert end == start
+    assert split_window(10, 10, 4) == []
+    assert split_window(0, 2, 8) == [(0, 1), (1, 2)]
+
+
+async def test_iter_pages_fetches_every_session_once(fake_stripe):
+    seen: list[str] = []
+    async for page in iter_checkout_session_pages(
+        _client(fake_stripe),
+        created_from=WINDOW_START,
+        created_to=WINDOW_END,
+        concurrency=4,
+        slices=7,
+    ):
+        assert len(page) <= 100
+        seen.extend(s.id for s in page)
+    assert len(seen) == 1234
+    assert len(set(seen)) == 1234
+    # 7 срезов, каждый листается до has_more=False
+    assert fake_stripe.requests >= 1234 // 100
+
+
+async def test_iter_pages_respects_concurrency_limit(fake_stripe):
+    client = _client(fake_stripe)
+    in_flight = 0
+    peak = 0
+    original = client.v1.checkout.sessions.list
+    lock = threading.Lock()
+
+    def tracking_list(params):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        try:
+            return original(params)
+        finally:
+            with lock:
+                in_flight -= 1
+
+    client.v1.checkout.sessions.list = tracking_list
+    total = 0
+    async for page in iter_checkout_session_pages(
+        client,
+        created_from=WINDOW_START,
+        created_to=WINDOW_END,
+        concurrency=2,
+        slices=10,
+    ):
+        total += len(page)
+    assert total == 1234
+    assert peak <= 2
+
+
+async def test_apply_matches_by_metadata_and_session_id():
+    uow = _mock_uow()
+    uow.bookings.map_ids_by_checkout_session_ids = AsyncMock(return_value={"cs_nometa": 77})
+    report = ReconciliationReport()
+    sessions = [
+        _snapshot("cs_order", order_id=5, booking_id=9),
+        _snapshot("cs_booking", booking_id=10),
+        _snapshot("cs_nometa"),
+        _snapshot("cs_unknown"),
+        _snapshot("cs_unpaid", booking_id=11, payment_status="unpaid"),
+    ]
+
+    await apply_checkout_sessions(uow, sessions, report)
+
+    uow.orders.mark_paid_bulk.assert_awaited_once_with([5])
+    uow.bookings.confirm_paid_by_order_ids.assert_awaited_once_with({5: "pi_cs_order"})
+    uow.bookings.confirm_paid_bulk.assert_awaited_once_with(
+        {10: "pi_cs_booking", 77: "pi_cs_nometa"}
+    )
+    assert report.sessions_paid == 4
+    assert report.orders_paid == 1
+    assert report.bookings_confirmed == 2
+    assert report.unmatched_session_ids == ["cs_unknown"]
+
+
+async def test_apply_skips_order_bookings_when_order_already_paid():
+    uow = _mock_uow()
+    uow.orders.mark_paid_bulk = AsyncMock(return_value=[])
+    report = ReconciliationReport()
+
+    await apply_checkout_sessions(uow, [_snapshot("cs_o", order_id=1)], report)
+
+    uow.bookings.confirm_paid_by_order_ids.assert_not_awaited()
+    assert report.orders_paid == 0
+
+
+async def test_reconcile_commits_per_batch_against_fake_stripe(fake_stripe):
+    uow = _mock_uow()
+    report = await reconcile_checkout_sessions(
+        _client(fake_stripe),
+        uow,
+        created_from=WINDOW_START,
+        created_to=WINDOW_END,
+        concurrency=4,
+        batch_size=500,
+    )
+    assert report.sessions_seen == 1234
+    paid = [s for s in fake_stripe.sessions if s["payment_status"] == "paid"]
+    assert report.sessions_paid == len(paid)
+    assert uow.commit.await_count == 3  # 500 + 500 + остаток
+    uow.rollback.assert_not_awaited()
+
+
+async def test_reconcile_dry_run_rolls_back(fake_stripe):
+    uow = _mock_uow()
+    await reconcile_checkout_sessions(
+        _client(fake_stripe),
+        uow,
+        created_from=WINDOW_START,
+        created_to=WINDOW_END,
+        batch_size=10_000,
+        dry_run=True,
+    )
+    uow.commit.assert_not_awaited()
+    uow.rollback.assert_awaited_once()
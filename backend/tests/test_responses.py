@@ -0,0 +1,132 @@
+"""
+Тесты typed_json_response (app.core.responses): одна валидация и сериализация
+в байты, тот же JSON, что и у response_model.
+"""
+
+import json
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel, field_validator
+
+from app.core.responses import typed_json_response
+from app.schemas import SearchResult, StudioListItem
+
+NOW = datetime(2026, 5, 10, 18, 0, tzinfo=UTC)
+
+
+def _studio(**overrides) -> SimpleNamespace:
+    values = dict(
+        id=1,
+        owner_id=2,
+        name="Studio",
+        description=None,
+        email="studio@example.com",
+        phone=None,
+        address=None,
+        city="Dublin",
+        latitude=None,
+        longitude=None,
+        amenities=["shower"],
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+async def test_body_matches_response_model_output():
+    studios = [_studio(id=1), _studio(id=2, name="Ünïcode")]
+    app = FastAPI()
+
+    @app.get("/default", response_model=list[StudioListItem])
+    async def default():
+        return studios
+
+    @app.get("/typed", response_model=list[StudioListItem])
+    async def typed():
+        return typed_json_response(list[StudioListItem], studios)
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        default_response = await ac.get("/default")
+        typed_response = await ac.get("/typed")
+
+    assert typed_response.headers["content-type"] == "application/json"
+    assert typed_response.json() == default_response.json()
+    assert typed_response.json()[1]["created_at"] == "2026-05-10T18:00:00Z"
+
+
+def test_payload_is_validated_once_with_status_and_headers():
+    calls = []
+
+    class Item(BaseModel):
+        name: str
+
+        @field_validator("name")
+        @classmethod
+        def count(cls, value: str) -> str:
+            calls.append(value)
+            return value
+
+    response = typed_json_response(
+        list[Item], [{"name": "a"}, {"name": "b"}], status_code=201, headers={"x-total": "2"}
+    )
+
+    assert calls == ["a", "b"]
+    assert response.status_code == 201
+    assert response.headers["x-total"] == "2"
+    assert json.loads(response.body) == [{"name": "a"}, {"name": "b"}]
+
+
+@pytest.fixture
+async def explore_client():
+    from app.api.deps import get_read_uow
+    from app.main import app
+
+    uow = MagicMock()
+    uow.studios.list_rows = AsyncMock(return_value=[_studio(id=1), _studio(id=2)])
+    service = SimpleNamespace(
+        id=10,
+        studio_id=1,
+        name="Yoga",
+        description=None,
+        type="single_class",
+        category="yoga",
+        duration_minutes=60,
+        max_capacity=12,
+        price_single_cents=1500,
+        price_course_cents=None,
+        soft_limit_ratio=1.0,
+        hard_limit_ratio=1.5,
+        max_overbooked_ratio=0.3,
+        tags=[],
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    uow.services.list_active_rows_by_studio_ids = AsyncMock(return_value=[service])
+
+    async def stub_uow():
+        yield uow
+
+    app.dependency_overrides[get_read_uow] = stub_uow
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+    finally:
+        app.dependency_overrides.pop(get_read_uow, None)
+
+
+async def test_explore_cards_validate_rows_once(explore_client):
+    response = await explore_client.get("/api/v1/studios?include_services=true")
+
+    assert response.status_code == 200
+    cards = [SearchResult.model_validate(card) for card in response.json()]
+    assert [c.studio.id for c in cards] == [1, 2]
+    assert [s.name for s in cards[0].matched_services] == ["Yoga"]
+    assert cards[1].matched_services == []
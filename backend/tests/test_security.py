@@ -6,7 +6,9 @@ from datetime import UTC, datetime
 from unittest.mock import patch
 
 from app.core.security import (
+    AccessTokenData,
     RefreshTokenData,
+    access_token_cache,
     create_access_token,
     create_refresh_token,
     decode_token,
@@ -14,6 +16,7 @@ from app.core.security import (
     get_user_id_from_access_token,
     get_user_id_from_refresh_token,
     hash_magic_link_token,
+    parse_access_token,
     parse_refresh_token,
 )
 
@@ -50,6 +53,35 @@ class TestGetUserIdFromAccessToken:
         assert get_user_id_from_access_token("eyJhbGciOiJIUzI1NiJ9.eyJzdWIiOiIxIn0.x") is None
 
 
+class TestAccessTokenCache:
+    def setup_method(self):
+        access_token_cache.clear()
+        access_token_cache.reset_stats()
+
+    def test_repeat_parse_skips_verification(self):
+        token = create_access_token(user_id=3, email="c@d.com")
+        first = parse_access_token(token)
+        with patch("app.core.security.decode_token") as decode:
+            second = parse_access_token(token)
+        decode.assert_not_called()
+        assert second == first
+        assert access_token_cache.stats.hits == 1
+
+    def test_invalid_tokens_are_not_cached(self):
+        assert parse_access_token("garbage") is None
+        assert len(access_token_cache) == 0
+
+    def test_expired_cached_entry_is_reverified(self):
+        token = create_access_token(user_id=3, email="c@d.com")
+        parse_access_token(token)
+        ((key, (deadline, _)),) = access_token_cache._data.items()
+        expired = AccessTokenData(user_id=3, email="c@d.com", expires_at=0.0)
+        access_token_cache._data[key] = (deadline, expired)
+        with patch("app.core.security.decode_token", return_value=None) as decode:
+            assert parse_access_token(token) is None
+        decode.assert_called_once()
+
+
 class TestCreateAndParseRefreshToken:
     def test_creates_valid_refresh_token(self):
         token = create_refresh_token(user_id=10)
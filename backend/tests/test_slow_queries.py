@@ -0,0 +1,105 @@
+"""
+Тесты журнала медленных SQL: нормализация, форма параметров, выбор
+statements для EXPLAIN и сэмплирование захвата плана.
+"""
+
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from structlog.testing import capture_logs
+
+from app.core.middleware.logging_middleware import request_id_var
+from app.core.slow_queries import (
+    SlowStatementLog,
+    is_explainable,
+    normalize_sql,
+    parameters_shape,
+    plan_scans,
+)
+
+
+def test_normalize_sql_collapses_literals_and_param_lists():
+    sql = "SELECT *\n  FROM studios\n WHERE city = 'Dublin' AND id IN ($1, $2, $3) LIMIT 20"
+    assert normalize_sql(sql) == (
+        "SELECT * FROM studios WHERE city = ? AND id IN ($n, ...) LIMIT ?"
+    )
+
+
+def test_parameters_shape_has_types_not_values():
+    assert parameters_shape((1, "secret@example.com", datetime.now(UTC))) == (
+        "(int, str, datetime)"
+    )
+    assert parameters_shape({"email": "x"}) == "(email: str)"
+    assert parameters_shape([(1, "a"), (2, "b")], executemany=True) == "2 x (int, str)"
+    assert "secret" not in parameters_shape(("secret",))
+
+
+def test_only_plain_selects_are_explained():
+    assert is_explainable("SELECT id FROM studios WHERE city = $1")
+    assert not is_explainable("SELECT id FROM slots WHERE id = $1 FOR UPDATE")
+    assert not is_explainable("UPDATE slots SET booked = booked + 1")
+    assert not is_explainable("WITH d AS (DELETE FROM t RETURNING id) SELECT * FROM d")
+    assert not is_explainable("SELECT id FROM t; DELETE FROM t")
+
+
+def test_plan_scans_walks_nested_nodes():
+    plan = {
+        "Node Type": "Nested Loop",
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "bookings"},
+            {"Node Type": "Index Scan", "Relation Name": "slots"},
+        ],
+    }
+    assert plan_scans(plan) == ["Seq Scan on bookings", "Index Scan on slots"]
+
+
+def test_slow_statement_logged_with_request_id():
+    log = SlowStatementLog(MagicMock(), threshold_ms=100)
+    token = request_id_var.set("req-slow")
+    try:
+        with capture_logs() as logs:
+            log.observe("SELECT 1 FROM studios WHERE id = $1", (5,), 0.05)
+            log.observe("SELECT 1 FROM studios WHERE id = $1", (5,), 0.25)
+    finally:
+        request_id_var.reset(token)
+
+    (event,) = logs
+    assert event["event"] == "db_slow_statement"
+    assert event["statement"] == "SELECT ? FROM studios WHERE id = $1"
+    assert event["parameters"] == "(int)"
+    assert event["duration_ms"] == 250.0
+    assert event["request_id"] == "req-slow"
+
+
+def test_threshold_zero_disables_log():
+    log = SlowStatementLog(MagicMock(), threshold_ms=0)
+    with capture_logs() as logs:
+        log.observe("SELECT 1", (), 10.0)
+    assert logs == []
+
+
+async def test_sampled_select_is_explained_in_background():
+    log = SlowStatementLog(MagicMock(), threshold_ms=1, explain_sample_rate=1.0)
+    with (
+        patch.object(log, "explain", new_callable=AsyncMock) as explain,
+        capture_logs(),
+    ):
+        log.observe("SELECT * FROM bookings WHERE guest_email = $1", ("a@b.c",), 0.5)
+        log.observe("UPDATE slots SET booked = 1", (), 0.5)
+        await asyncio.sleep(0)
+
+    explain.assert_awaited_once_with(
+        "SELECT * FROM bookings WHERE guest_email = $1", ("a@b.c",), request_id=None
+    )
+
+
+async def test_explain_not_sampled_when_rate_is_zero():
+    log = SlowStatementLog(MagicMock(), threshold_ms=1, explain_sample_rate=0.0)
+    with (
+        patch.object(log, "explain", new_callable=AsyncMock) as explain,
+        capture_logs(),
+    ):
+        log.observe("SELECT 1", (), 0.5)
+        await asyncio.sleep(0)
+    explain.assert_not_awaited()
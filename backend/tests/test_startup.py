@@ -0,0 +1,40 @@
+"""
+Тесты холодного старта (app.scripts.profile_startup): тяжёлые SDK не
+импортируются при старте, импорт app.main и первый запрос укладываются в бюджет.
+
+Время старта зависит от машины, поэтому проверка бюджета включается только
+явно: STARTUP_BUDGET_SECONDS=1.5 pytest tests/test_startup.py.
+"""
+
+import os
+
+import pytest
+
+from app.scripts.profile_startup import measure_startup
+
+STARTUP_BUDGET_SECONDS = os.environ.get("STARTUP_BUDGET_SECONDS")
+DEFERRED_MODULES = ("stripe", "httpx")
+
+
+@pytest.fixture(scope="module")
+def startup_profiles():
+    # Для бюджета берётся лучший из трёх замеров; без него хватит одного.
+    return [measure_startup() for _ in range(3 if STARTUP_BUDGET_SECONDS else 1)]
+
+
+def test_heavy_sdks_are_imported_on_first_use(startup_profiles):
+    profile = startup_profiles[0]
+    assert profile.status == 200
+    loaded = [m for m in DEFERRED_MODULES if m in profile.modules]
+    assert loaded == [], f"imported at startup, defer to first use: {loaded}"
+
+
+@pytest.mark.skipif(STARTUP_BUDGET_SECONDS is None, reason="set STARTUP_BUDGET_SECONDS")
+def test_cold_start_within_budget(startup_profiles):
+    budget = float(STARTUP_BUDGET_SECONDS)
+    best = min(startup_profiles, key=lambda p: p.total_seconds)
+    assert best.total_seconds < budget, (
+        f"cold start {best.total_seconds:.2f}s "
+        f"(import {best.import_seconds:.2f}s) exceeds {budget}s budget; "
+        "see `python -m app.scripts.profile_startup`"
+    )
@@ -0,0 +1,170 @@
+"""
+Тесты трассировки: вложенные span, сэмплирование, TracedRoute, экспорт OTLP/JSON.
+"""
+
+import json
+
+import httpx
+import pytest
+from fastapi import APIRouter, FastAPI
+
+from app.core.middleware.logging_middleware import REQUEST_ID_HEADER, RequestLoggingMiddleware
+from app.core.tracing import (
+    CLIENT,
+    OtlpJsonFileExporter,
+    TracedRoute,
+    configure_tracing,
+    current_span,
+    shutdown_tracing,
+    span,
+    traced,
+    traced_class,
+)
+
+
+class ListExporter:
+    def __init__(self) -> None:
+        self.spans = []
+
+    def export(self, spans) -> None:
+        self.spans.extend(spans)
+
+    def shutdown(self) -> None:
+        pass
+
+
+@pytest.fixture
+def exporter():
+    exporter = ListExporter()
+    configure_tracing(sample_rate=1.0, exporter=exporter)
+    yield exporter
+    shutdown_tracing()
+
+
+@traced
+async def load_studio(studio_id: int) -> int:
+    with span("stripe.call", kind=CLIENT):
+        pass
+    return studio_id
+
+
+@traced
+async def service_call() -> int:
+    return await load_studio(5) + await load_studio(6)
+
+
+@traced_class
+class FakeRepository:
+    async def get(self) -> str:
+        return "row"
+
+    async def _private(self) -> str:
+        return "hidden"
+
+
+def _finished(exporter: ListExporter) -> dict[str, list]:
+    shutdown_tracing()  # exporter thread flushes everything queued
+    by_name: dict[str, list] = {}
+    for s in exporter.spans:
+        by_name.setdefault(s.name, []).append(s)
+    return by_name
+
+
+async def test_nested_spans_share_trace_and_link_parents(exporter):
+    assert await service_call() == 11
+    spans = _finished(exporter)
+
+    (root,) = spans["test_tracing.service_call"]
+    children = spans["test_tracing.load_studio"]
+    assert root.parent_id is None
+    assert [c.parent_id for c in children] == [root.span_id, root.span_id]
+    assert {s.trace_id for group in spans.values() for s in group} == {root.trace_id}
+    assert all(s.kind == CLIENT for s in spans["stripe.call"])
+    assert len(spans["stripe.call"]) == 2
+
+
+async def test_traced_class_wraps_public_coroutines_only(exporter):
+    repo = FakeRepository()
+    assert await repo.get() == "row"
+    assert await repo._private() == "hidden"
+    assert list(_finished(exporter)) == ["test_tracing.FakeRepository.get"]
+
+
+async def test_error_type_recorded_and_reraised(exporter):
+    @traced
+    async def failing() -> None:
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await failing()
+    ((failed,),) = _finished(exporter).values()
+    assert failed.name.endswith("<locals>.failing")
+    assert failed.error == "ValueError"
+
+
+async def test_unsampled_trace_records_nothing():
+    exporter = ListExporter()
+    configure_tracing(sample_rate=1e-12, exporter=exporter)
+    with span("root") as root:
+        assert root is None
+        assert await service_call() == 11
+        assert current_span() is None
+    assert _finished(exporter) == {}
+
+
+async def test_disabled_tracing_is_a_plain_call():
+    shutdown_tracing()
+    with span("anything") as current:
+        assert current is None
+    assert await service_call() == 11
+
+
+async def test_traced_route_span_has_template_status_and_request_id(exporter):
+    router = APIRouter(prefix="/studios", route_class=TracedRoute)
+
+    @router.get("/{studio_id}")
+    async def get_studio(studio_id: int) -> dict:
+        return {"id": await load_studio(studio_id)}
+
+    app = FastAPI()
+    app.include_router(router, prefix="/api/v1")
+    app.add_middleware(RequestLoggingMiddleware)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/v1/studios/7", headers={REQUEST_ID_HEADER: "req-7"})
+    assert response.json() == {"id": 7}
+
+    spans = _finished(exporter)
+    (route_span,) = spans["GET /api/v1/studios/{studio_id}"]
+    (child,) = spans["test_tracing.load_studio"]
+    assert route_span.attributes["http.response.status_code"] == 200
+    assert route_span.attributes["request.id"] == "req-7"
+    assert child.attributes["request.id"] == "req-7"
+    assert child.parent_id == route_span.span_id
+
+
+async def test_otlp_file_exporter_writes_one_request_per_batch(tmp_path):
+    path = tmp_path / "traces.jsonl"
+    configure_tracing(sample_rate=1.0, exporter=OtlpJsonFileExporter(path, service_name="zf"))
+    await service_call()
+    shutdown_tracing()
+
+    lines = path.read_text().splitlines()
+    assert lines
+    spans = [
+        s
+        for line in lines
+        for rs in json.loads(line)["resourceSpans"]
+        for ss in rs["scopeSpans"]
+        for s in ss["spans"]
+    ]
+    assert {s["name"] for s in spans} == {
+        "test_tracing.service_call",
+        "test_tracing.load_studio",
+        "stripe.call",
+    }
+    root = next(s for s in spans if s["name"] == "test_tracing.service_call")
+    assert len(root["traceId"]) == 32 and root["parentSpanId"] == ""
+    assert int(root["endTimeUnixNano"]) >= int(root["startTimeUnixNano"])
+    resource = json.loads(lines[0])["resourceSpans"][0]["resource"]
+    assert resource["attributes"] == [{"key": "service.name", "value": {"stringValue": "zf"}}]
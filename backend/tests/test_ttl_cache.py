@@ -0,0 +1,49 @@
+"""
+Тесты ограниченного TTL-кэша (app.core.ttl_cache).
+"""
+
+from app.core.ttl_cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_entry_expires_after_ttl():
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_least_recently_used_is_evicted():
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+
+
+def test_pop_and_disabled_cache():
+    cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.pop("a")
+    cache.pop("missing")
+    assert cache.get("a") is None
+
+    disabled: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=0)
+    disabled.set("a", 1)
+    assert disabled.get("a") is None
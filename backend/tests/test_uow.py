@@ -0,0 +1,57 @@
+"""
+Тесты UnitOfWork: соединение берётся лениво, commit только при записях.
+
+Engine указывает на закрытый порт: любая попытка взять соединение из пула
+упадёт, поэтому отсутствие ошибки = к пулу не обращались.
+"""
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.uow import create_uow
+from app.models.user import User
+
+
+@pytest.fixture
+async def unreachable_engine():
+    engine = create_async_engine("postgresql+asyncpg://u:p@127.0.0.1:1/db")
+    attempts: list[object] = []
+    # do_connect срабатывает до попытки соединения (в отличие от pool "connect").
+    event.listen(engine.sync_engine, "do_connect", lambda *args: attempts.append(args))
+    try:
+        yield engine, attempts
+    finally:
+        await engine.dispose()
+
+
+async def test_read_only_uow_never_touches_pool(unreachable_engine):
+    engine, attempts = unreachable_engine
+    async with AsyncSession(engine) as session:
+        uow = create_uow(session)
+        assert not uow.has_writes
+        await uow.commit()
+    assert attempts == []
+
+
+async def test_pending_objects_are_committed(unreachable_engine):
+    engine, attempts = unreachable_engine
+    async with AsyncSession(engine) as session:
+        uow = create_uow(session)
+        session.add(User(email="w@example.com", name="Writer"))
+        assert uow.has_writes
+        with pytest.raises(OSError):
+            await uow.commit()
+    assert len(attempts) == 1
+
+
+async def test_uows_sharing_session_track_writes_once(unreachable_engine):
+    engine, _ = unreachable_engine
+    async with AsyncSession(engine) as session:
+        create_uow(session)
+        create_uow(session)
+        session.sync_session.info["uow_has_writes"] = True
+        uow = create_uow(session)
+        assert uow.has_writes
+        await uow.rollback()
+        assert not uow.has_writes
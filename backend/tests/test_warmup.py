@@ -0,0 +1,175 @@
+"""
+Тесты стартового прогрева (app.core.warmup): /health/ready отвечает 503, пока
+прогрев идёт, ошибки шагов не блокируют готовность (но видны в checks),
+сериализаторы строятся для всех response_model.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from pydantic import BaseModel
+
+from app.core.warmup import Warmup, open_connections, response_types
+
+
+def _session_factory(session):
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return factory
+
+
+def _engine(fail: int = 0):
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    conn.close = AsyncMock()
+    results = [OSError("refused")] * fail
+    engine = MagicMock()
+
+    def connect():
+        ctx = MagicMock()
+        ctx.start = AsyncMock(side_effect=results.pop() if results else None, return_value=conn)
+        return ctx
+
+    engine.connect.side_effect = connect
+    return engine, conn
+
+
+async def test_pending_until_hot_reads_finish():
+    release = asyncio.Event()
+    seen = []
+
+    async def hot_reads(uow):
+        seen.append(uow)
+        await release.wait()
+
+    session = MagicMock(rollback=AsyncMock())
+    engine, conn = _engine()
+    warmup = Warmup()
+    warmup.start(
+        FastAPI(),
+        engines=[engine],
+        session_factories=[_session_factory(session)],
+        pool_connections=3,
+        timeout=5,
+        hot_reads=hot_reads,
+    )
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert warmup.pending
+
+    release.set()
+    await warmup._task
+
+    assert not warmup.pending
+    assert warmup.outcome == "ok"
+    assert warmup.duration_seconds is not None
+    assert engine.connect.call_count == 3
+    assert conn.close.await_count == 3
+    assert len(seen) == 1
+    session.rollback.assert_awaited_once()
+
+
+async def test_failures_and_timeout_do_not_block_readiness():
+    async def hot_reads(uow):
+        await asyncio.sleep(10)
+
+    failing = _session_factory(None)
+    failing.return_value.__aenter__ = AsyncMock(side_effect=OSError("down"))
+    warmup = Warmup()
+    warmup.start(
+        FastAPI(),
+        engines=[],
+        session_factories=[failing, _session_factory(MagicMock(rollback=AsyncMock()))],
+        pool_connections=0,
+        timeout=0.05,
+        hot_reads=hot_reads,
+    )
+    await warmup._task
+
+    assert not warmup.pending
+    assert warmup.outcome == "timeout"
+
+    broken = MagicMock()
+    broken.connect.side_effect = RuntimeError("bad engine")
+    warmup.start(
+        FastAPI(),
+        engines=[broken],
+        session_factories=[],
+        pool_connections=1,
+        timeout=5,
+    )
+    await warmup._task
+
+    assert not warmup.pending
+    assert warmup.outcome == "failed"
+
+
+async def test_open_connections_counts_only_opened():
+    engine, conn = _engine(fail=2)
+
+    assert await open_connections(engine, 5) == 3
+    assert conn.close.await_count == 3
+    assert await open_connections(engine, 0) == 0
+
+
+def test_response_types_split_unions_and_nested_routers():
+    class A(BaseModel):
+        x: int
+
+    class B(BaseModel):
+        y: int
+
+    from fastapi import APIRouter
+
+    router = APIRouter()
+
+    @router.get("/ab", response_model=list[A] | list[B])
+    async def ab():
+        return []
+
+    app = FastAPI()
+    app.include_router(router, prefix="/v1")
+
+    @app.get("/b", response_model=B)
+    async def b():
+        return B(y=1)
+
+    assert set(map(str, response_types(app))) == {str(list[A]), str(list[B]), str(B)}
+
+
+@pytest.fixture
+def pending_warmup():
+    from app.core.warmup import warmup
+
+    warmup.pending = True
+    try:
+        yield
+    finally:
+        warmup.pending = False
+
+
+async def test_readiness_is_503_while_warming_up(pending_warmup):
+    from app.main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        ready = await ac.get("/api/v1/health/ready")
+        root = await ac.get("/api/v1/")
+
+    assert ready.status_code == 503
+    assert ready.json()["status"] == "warming_up"
+    assert root.status_code == 200
+
+
+async def test_readiness_reports_warmup_outcome(monkeypatch):
+    from app.core.warmup import warmup
+    from app.main import app
+
+    monkeypatch.setattr(warmup, "outcome", "timeout")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        ready = await ac.get("/api/v1/health/ready")
+
+    assert ready.json()["checks"]["warmup"] == "timeout"
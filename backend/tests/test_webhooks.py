@@ -63,10 +63,10 @@ async def _authenticate_and_create_booking(client: AsyncClient) -> int:
     """Создаёт пользователя, студию, слот и гостевое бронирование. Возвращает booking_id."""
     captured_url: list[str] = []
 
-    async def capture_email(to: str, url: str) -> None:
+    async def capture_email(uow, to: str, url: str) -> None:
         captured_url.append(url)
 
-    with patch("app.services.auth.send_magic_link_email", new_callable=AsyncMock) as mock_send:
+    with patch("app.services.auth.enqueue_magic_link_email", new_callable=AsyncMock) as mock_send:
         mock_send.side_effect = capture_email
         await client.post(
             "/api/v1/auth/magic-link/request",